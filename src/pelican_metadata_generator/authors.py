@@ -0,0 +1,184 @@
+import re
+import unicodedata
+
+# letters that are not decomposed into base letter and diacritic mark
+EXTRA_LETTERS = str.maketrans("łŁøØđĐħĦı", "lLoOdDhHi")
+
+TOKEN_SEPARATOR_RE = re.compile(r"[\s.\-]+")
+
+
+def name_tokens(name):
+    """Returns normalized parts of person name
+
+    Name is converted into given names followed by family name order
+    ("Doe, John" becomes "John Doe"), letters are case-folded and stripped
+    of diacritics, and dots and hyphens are treated as spaces, so initials
+    ("J. Doe") become single-letter parts.
+
+    Returns
+    -------
+    Tuple of strings.
+    """
+    if name.count(",") == 1:
+        family, given = name.split(",")
+        name = "{} {}".format(given, family)
+
+    name = unicodedata.normalize("NFKD", name.translate(EXTRA_LETTERS))
+    name = "".join(char for char in name if not unicodedata.combining(char)).casefold()
+    return tuple(token for token in TOKEN_SEPARATOR_RE.split(name) if token)
+
+
+def _initials_count(tokens):
+    return sum(1 for token in tokens[:-1] if len(token) == 1)
+
+
+def _compatible(tokens, other_tokens):
+    """True if names are equal, taking initials into account ("J. Doe" and "John Doe")"""
+    if len(tokens) != len(other_tokens) or tokens[-1] != other_tokens[-1]:
+        return False
+    for token, other_token in zip(tokens, other_tokens):
+        if token == other_token:
+            continue
+        if len(token) == 1 and other_token.startswith(token):
+            continue
+        if len(other_token) == 1 and token.startswith(other_token):
+            continue
+        return False
+    return True
+
+
+class AuthorIndex:
+    """Groups different ways of writing the same author name
+
+    Names are equal when their normalized parts (see ``name_tokens``) are
+    the same, regardless of order. Name with initials is also merged with
+    single more complete name it matches, if there is exactly one; "J. Doe"
+    is left alone when both "John Doe" and "Jane Doe" are known.
+    Names are compared only with names sharing the same family name, so
+    grouping takes time close to linear in number of names.
+
+    Attributes
+    ----------
+    files
+        Dictionary mapping every known name, as written, to list of paths
+        of files that use it
+    """
+
+    def __init__(self):
+        self.files = {}
+        self._canonical = None
+
+    def __len__(self):
+        return len(self.files)
+
+    def add(self, name, path=None):
+        """Adds author name, optionally used by file at path"""
+        paths = self.files.setdefault(name, [])
+        if path is not None:
+            paths.append(path)
+        self._canonical = None
+
+    def discard(self, name, path):
+        """Forgets that file at path uses author name
+
+        Name itself stays known, even when no file uses it anymore.
+        """
+        paths = self.files.get(name)
+        if paths and path in paths:
+            paths.remove(path)
+            self._canonical = None
+
+    def canonical(self, name):
+        """Returns preferred way of writing name (name itself if it is unknown)"""
+        return self._get_canonical().get(name, name)
+
+    def canonical_names(self):
+        """Returns list of preferred names of all known authors"""
+        canonical = self._get_canonical()
+        names = []
+        for name in self.files:
+            if canonical[name] == name:
+                names.append(name)
+        return names
+
+    def variants(self):
+        """Returns authors whose name is written in more than one way
+
+        Returns
+        -------
+        Dictionary mapping preferred name to dictionary mapping every way
+        of writing that name to list of files that use it.
+        """
+        groups = {}
+        for name, canonical_name in self._get_canonical().items():
+            groups.setdefault(canonical_name, {})[name] = self.files[name]
+        return {name: group for name, group in groups.items() if len(group) > 1}
+
+    def report(self):
+        """Returns variants of author names as human-readable text"""
+        lines = []
+        for canonical_name, group in sorted(self.variants().items()):
+            lines.append(canonical_name)
+            for name, paths in group.items():
+                lines.append("    {}: {} file(s)".format(name, len(paths)))
+                lines.extend("        {}".format(path) for path in sorted(paths))
+        return "\n".join(lines)
+
+    def _get_canonical(self):
+        if self._canonical is None:
+            self._canonical = self._build_canonical()
+        return self._canonical
+
+    def _build_canonical(self):
+        # names with the same parts, in any order, are always the same author
+        groups = {}
+        for name in self.files:
+            tokens = name_tokens(name) or (name,)
+            groups.setdefault(tuple(sorted(tokens)), (tokens, []))[1].append(name)
+
+        blocks = {}
+        for key, (tokens, _) in groups.items():
+            blocks.setdefault(tokens[-1], []).append(key)
+
+        parents = {key: key for key in groups}
+
+        def find(key):
+            while parents[key] != key:
+                parents[key] = parents[parents[key]]
+                key = parents[key]
+            return key
+
+        for block in blocks.values():
+            for key in block:
+                tokens = groups[key][0]
+                initials = _initials_count(tokens)
+                if not initials:
+                    continue
+                candidates = [
+                    other_key
+                    for other_key in block
+                    if _initials_count(groups[other_key][0]) < initials
+                    and _compatible(tokens, groups[other_key][0])
+                ]
+                fewest = min((_initials_count(groups[c][0]) for c in candidates), default=None)
+                candidates = [c for c in candidates if _initials_count(groups[c][0]) == fewest]
+                if len(candidates) == 1:
+                    parents[find(key)] = find(candidates[0])
+
+        merged = {}
+        for key, (_, names) in groups.items():
+            merged.setdefault(find(key), []).extend(names)
+
+        canonical = {}
+        for names in merged.values():
+            preferred = min(names, key=self._preference)
+            for name in names:
+                canonical[name] = preferred
+        return canonical
+
+    def _preference(self, name):
+        # complete names first, then most used, then names with diacritics,
+        # then names written in natural order
+        tokens = name_tokens(name) or (name,)
+        non_ascii = sum(1 for char in name if not char.isascii())
+        return (_initials_count(tokens), -len(self.files[name]), -non_ascii, "," in name, name)
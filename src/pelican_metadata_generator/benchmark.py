@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""Headless benchmark of main window
+
+Runs main window and controller without display (Qt "offscreen" platform),
+reads directory of generated posts and scripts typical interactions,
+reporting latency of every kind of event. Use ``--max-p99-ms`` (for
+interactions) and ``--max-load-ms`` (for reading directory) to make it
+fail when interface gets slower.
+"""
+
+import os
+import sys
+import time
+import random
+import logging
+import argparse
+import tempfile
+import tracemalloc
+
+TITLE_TEXT = "Lorem ipsum dolor sit amet, consectetur adipiscing elit "
+# single event, not checked against --max-p99-ms
+LOAD_EVENT = "load directory"
+
+
+def write_posts(path, posts, tags, categories, seed=0):
+    """Writes Markdown posts with random metadata into directory
+
+    Parameters
+    ----------
+    path
+        Directory that posts are written to.
+    posts
+        Number of posts.
+    tags
+        Number of distinct tags; every post has up to three of them.
+    categories
+        Number of distinct categories.
+    seed
+        Seed of random generator, so the same arguments give the same posts.
+    """
+    rng = random.Random(seed)
+    tag_names = ["Tag {}".format(i) for i in range(tags)]
+    start = time.mktime((2010, 1, 1, 12, 0, 0, 0, 0, 0))
+    for i in range(posts):
+        date = time.strftime("%Y-%m-%d %H:%M", time.localtime(start + i * 6 * 3600))
+        headers = [
+            "Title: Post number {}".format(i),
+            "Date: {}".format(date),
+            "Category: Category {}".format(rng.randrange(categories)),
+            "Tags: {}".format(", ".join(rng.sample(tag_names, min(3, tags)))),
+            "Author: Author {}".format(rng.randrange(10)),
+        ]
+        filename = os.path.join(path, "post-{:06d}.md".format(i))
+        with open(filename, "w", encoding="utf-8") as fh:
+            fh.write("\n".join(headers))
+            fh.write("\n\nContent of post number {}.\n".format(i))
+
+
+def _synthetic_headers(posts, seed=0):
+    """Yields (path, headers) of synthetic posts, creating new strings every time"""
+    rng = random.Random(seed)
+    for i in range(posts):
+        tags = ["tag number {}".format(rng.randrange(2000)) for _ in range(rng.randint(3, 5))]
+        headers = {
+            "title": "Post title number {:012d}".format(i),
+            "slug": "post-slug-number-{:013d}".format(i),
+            "date": "2017-02-01 12:{:02d}".format(i % 60),
+            "category": "Category {}".format(rng.randrange(20)),
+            "tags": ", ".join(tags),
+            "author": "Author {}".format(rng.randrange(50)),
+        }
+        yield "/home/user/website/content/posts/{:035d}.md".format(i), headers
+
+
+def measure_record_memory(posts=10000):
+    """Measures memory taken by metadata of synthetic posts
+
+    Posts have unique 65-character paths, unique 30-character titles and
+    slugs, date, one of 20 categories, 3 to 5 tags out of 2000 and one of
+    50 authors. They are kept in dictionary keyed by path, either as
+    ``PostRecord`` objects or as header dictionaries.
+
+    Returns
+    -------
+    Tuple of (bytes per post kept as records, bytes per post kept as
+    dictionaries), measured with ``tracemalloc``.
+    """
+    import pelican_metadata_generator.model
+
+    def build_records():
+        symbols = pelican_metadata_generator.model.SymbolTable()
+        return {
+            path: pelican_metadata_generator.model.PostRecord.from_headers(path, headers, symbols)
+            for path, headers in _synthetic_headers(posts)
+        }
+
+    def build_dictionaries():
+        return dict(_synthetic_headers(posts))
+
+    results = []
+    for build in [build_records, build_dictionaries]:
+        tracemalloc.start()
+        try:
+            kept = build()
+            results.append(tracemalloc.get_traced_memory()[0] / posts)
+            del kept
+        finally:
+            tracemalloc.stop()
+    return tuple(results)
+
+
+def run(args):
+    """Runs benchmark
+
+    Returns
+    -------
+    Tuple of ``LatencyRecorder`` with scripted events, ``LatencyRecorder``
+    measured by controller, and total wall time in seconds.
+    """
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    from PyQt5 import QtCore, QtWidgets
+    from PyQt5.QtTest import QTest
+
+    import pelican_metadata_generator.controller
+    import pelican_metadata_generator.latency
+    import pelican_metadata_generator.model
+    import pelican_metadata_generator.view
+
+    start_time = time.perf_counter()
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    events = pelican_metadata_generator.latency.LatencyRecorder()
+    controller_latency = pelican_metadata_generator.latency.LatencyRecorder()
+
+    known_metadata_model = pelican_metadata_generator.model.MetadataDatabase()
+    known_metadata_model.use_git = False
+    post_model = pelican_metadata_generator.model.NewPostMetadata(filename_template="{slug}.{ext}")
+    post_model.file_format = "markdown"
+    window = pelican_metadata_generator.view.MainWindow()
+    controller = pelican_metadata_generator.controller.Controller(  # noqa: F841
+        known_metadata_model, post_model, window, latency=controller_latency
+    )
+    window.show()
+    app.processEvents()
+
+    def event(name, action, *args):
+        # pending events (layout, painting) are part of interaction
+        with events.measure(name):
+            action(*args)
+            app.processEvents()
+
+    with tempfile.TemporaryDirectory() as path:
+        write_posts(path, args.posts, args.tags, args.categories)
+        event(LOAD_EVENT, known_metadata_model.read_directory, path)
+
+    title_field = window.setupTab.titleField
+    for i in range(args.title_length):
+        event("title keystroke", QTest.keyClicks, title_field, TITLE_TEXT[i % len(TITLE_TEXT)])
+
+    for i in range(args.tag_toggles):
+        buttons = window.setupTab.tagButtonsGroup.buttons()
+        if not buttons:
+            break
+        event("tag toggle", buttons[i % len(buttons)].click)
+
+    tag_field = window.setupTab.tagField
+    for i in range(args.new_tags):
+        tag_field.setText("New tag {}".format(i))
+        event("tag entry", QTest.keyClick, tag_field, QtCore.Qt.Key_Return)
+
+    window.close()
+    return events, controller_latency, time.perf_counter() - start_time
+
+
+def report(recorder):
+    """Returns latency statistics as human-readable table"""
+    lines = []
+    for name, stats in recorder.summary().items():
+        lines.append(
+            "{name:<16} {count:>6} events  p50 {p50_ms:8.2f}  p95 {p95_ms:8.2f}  "
+            "p99 {p99_ms:8.2f}  max {max_ms:8.2f} ms".format(name=name, **stats)
+        )
+    return "\n".join(lines)
+
+
+def process_args(argv=None):
+    description = "Measure latency of main window interactions without display"
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--posts", help="Number of generated posts", type=int, default=1000)
+    parser.add_argument("--tags", help="Number of distinct tags", type=int, default=100)
+    parser.add_argument("--categories", help="Number of categories", type=int, default=10)
+    parser.add_argument(
+        "--title-length", help="Number of characters typed into title", type=int, default=500
+    )
+    parser.add_argument("--tag-toggles", help="Number of tag toggles", type=int, default=100)
+    parser.add_argument(
+        "--new-tags", help="Number of tags added through tag field", type=int, default=10
+    )
+    parser.add_argument("--json", help="Save statistics as JSON file", metavar="PATH")
+    parser.add_argument(
+        "--record-memory",
+        help="Only measure memory taken by metadata of that many posts and exit",
+        type=int,
+        metavar="POSTS",
+    )
+    parser.add_argument(
+        "--max-p99-ms",
+        help="Fail if 99th percentile latency of any scripted interaction is higher",
+        type=float,
+        metavar="MS",
+    )
+    parser.add_argument(
+        "--max-load-ms",
+        help="Fail if reading directory takes longer",
+        type=float,
+        metavar="MS",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = process_args(argv)
+    logging.basicConfig(format="%(asctime)s %(message)s", level=logging.ERROR)
+
+    if args.record_memory:
+        records, dictionaries = measure_record_memory(args.record_memory)
+        print("Post records: {:.0f} bytes per post".format(records))
+        print("Header dictionaries: {:.0f} bytes per post".format(dictionaries))
+        return 0
+
+    events, controller_latency, wall_time = run(args)
+
+    print("Scripted events:")
+    print(report(events))
+    print("Controller slots:")
+    print(report(controller_latency))
+    print("Total wall time: {:.2f} s".format(wall_time))
+
+    if args.json:
+        events.dump(args.json)
+
+    summary = events.summary()
+    exit_code = 0
+    if args.max_p99_ms is not None:
+        slow = [
+            name
+            for name, stats in summary.items()
+            if name != LOAD_EVENT and stats["p99_ms"] > args.max_p99_ms
+        ]
+        if slow:
+            print("p99 latency over {} ms: {}".format(args.max_p99_ms, ", ".join(slow)))
+            exit_code = 1
+    if args.max_load_ms is not None and summary[LOAD_EVENT]["max_ms"] > args.max_load_ms:
+        print("Reading directory took over {} ms".format(args.max_load_ms))
+        exit_code = 1
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,23 +1,52 @@
 #!/usr/bin/env python3
 
 import sys
+import time
 import logging
 import argparse
-from PyQt5 import QtCore, QtWidgets
 
-import pelican_metadata_generator.controller
-import pelican_metadata_generator.model
-import pelican_metadata_generator.view
+import pelican_metadata_generator.stdio_filter
+import pelican_metadata_generator.templates
 
+# Qt and modules that depend on it are imported only when they are needed,
+# so --filter mode starts without loading Qt
 
-def process_args():
+DEFAULT_FILENAME_TEMPLATE = "{slug}.{ext}"
+
+
+def filename_template(value):
+    try:
+        return pelican_metadata_generator.templates.FilenameTemplate(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def metadata_value(value):
+    if "=" not in value:
+        raise argparse.ArgumentTypeError("Expected KEY=VALUE, got {!r}".format(value))
+    return value
+
+
+def positive_int(value):
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError("Expected positive integer, got {!r}".format(value))
+    return number
+
+
+def process_args(argv=None):
     description = "Generate Pelican post metadata based on previous content"
     parser = argparse.ArgumentParser(description=description)
     parser.add_argument(
         "--filename-template",
         "-t",
-        help="Output filename template",
-        default="{slug}.{ext}"
+        help="Output filename template (default: {})".format(
+            DEFAULT_FILENAME_TEMPLATE.replace("{", "{{").replace("}", "}}")
+        ),
+        type=filename_template,
     )
     parser.add_argument(
         "--format",
@@ -30,10 +59,129 @@ def process_args():
         "--debug", "-v", help="Be more verbose; may be passed up to 5 times", action="count"
     )
     parser.add_argument(
-        "--directory", "-d", help="Directories to read metadata from", nargs="*", default=[]
+        "--directory",
+        "-d",
+        help="Directories (or zip and tar archives) to read metadata from",
+        nargs="*",
+        default=[],
+    )
+    parser.add_argument(
+        "--scan-concurrency",
+        help="Read directories with that many concurrent filesystem operations",
+        type=positive_int,
+        metavar="N",
+    )
+    parser.add_argument(
+        "--git",
+        help=(
+            "Read only files listed by git (skipping ignored files) if directory is in git "
+            "work tree, and only changed files when it is read again"
+        ),
+        action="store_true",
+    )
+    parser.add_argument(
+        "--fallback-encoding",
+        help="Encoding used to read files that are not valid UTF-8",
+        metavar="ENCODING",
+    )
+    parser.add_argument(
+        "--pelicanconf",
+        help="Pelican configuration file with slug settings (SLUG_REGEX_SUBSTITUTIONS)",
+        metavar="PATH",
+    )
+    parser.add_argument(
+        "--metadata-db",
+        help="Metadata snapshot to load before reading directories",
+        metavar="PATH",
+    )
+    parser.add_argument(
+        "--write-metadata-db",
+        help="Read directories, save metadata snapshot and exit",
+        metavar="PATH",
+    )
+    parser.add_argument(
+        "--author-report",
+        help="Read directories, list authors whose names are written in different ways and exit",
+        action="store_true",
     )
+    parser.add_argument(
+        "--tag-report",
+        help="Read directories, list groups of tags that look like duplicates and exit",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--filter",
+        help="Read post from standard input, update its metadata and write it to standard output",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--set",
+        help="Metadata value to set in --filter mode; may be passed multiple times",
+        type=metadata_value,
+        action="append",
+        metavar="KEY=VALUE",
+    )
+    parser.add_argument(
+        "--tag",
+        help="Tag to add in --filter mode; may be passed multiple times",
+        action="append",
+    )
+    parser.add_argument(
+        "--latency-report",
+        help="Measure latency of interactions, show it in status bar and save it as JSON on exit",
+        metavar="PATH",
+    )
+    parser.add_argument(
+        "--lsp",
+        help="Run Language Server Protocol server on standard input and output",
+        action="store_true",
+    )
+
+    args, unparsed_args = parser.parse_known_args(argv)
+    if args.write_metadata_db and not args.directory:
+        parser.error("--write-metadata-db requires --directory")
+    # only Qt application takes arguments of its own
+    gui = not (
+        args.filter or args.lsp or args.write_metadata_db or args.author_report or args.tag_report
+    )
+    if unparsed_args and not gui:
+        parser.error("unrecognized arguments: {}".format(" ".join(unparsed_args)))
+    return args, unparsed_args
+
+
+def create_metadata_database(args):
+    import pelican_metadata_generator.model
+    import pelican_metadata_generator.slugs
 
-    return parser.parse_known_args()
+    known_metadata_model = pelican_metadata_generator.model.MetadataDatabase()
+    known_metadata_model.scan_concurrency = args.scan_concurrency
+    known_metadata_model.fallback_encoding = args.fallback_encoding
+    known_metadata_model.use_git = args.git
+    if args.pelicanconf:
+        try:
+            known_metadata_model.slug_engine = (
+                pelican_metadata_generator.slugs.SlugEngine.from_pelicanconf(args.pelicanconf)
+            )
+        except Exception as e:
+            msg = "Can't read slug settings from {path}: {error}"
+            logging.error(msg.format(path=args.pelicanconf, error=e))
+    return known_metadata_model
+
+
+def load_metadata(known_metadata_model, args):
+    """Fills metadata database with data from snapshot and source directories"""
+    import pelican_metadata_generator.snapshot
+
+    if args.metadata_db:
+        try:
+            pelican_metadata_generator.snapshot.read_snapshot(
+                known_metadata_model, args.metadata_db
+            )
+        except pelican_metadata_generator.snapshot.SnapshotError as e:
+            logging.error(str(e))
+
+    for directory in args.directory:
+        known_metadata_model.read_directory(directory)
 
 
 def main():
@@ -50,37 +198,146 @@ def main():
 
     logging.basicConfig(format="%(asctime)s %(message)s", level=debug_level)
 
-    filename_template = args.filename_template
+    if args.filter:
+        sys.exit(pelican_metadata_generator.stdio_filter.run(args))
+
+    if args.lsp:
+        sys.exit(run_lsp(args))
+
+    if args.write_metadata_db:
+        sys.exit(write_metadata_db(args))
+
+    if args.author_report:
+        sys.exit(author_report(args))
+
+    if args.tag_report:
+        sys.exit(tag_report(args))
+
+    sys.exit(run_gui(args, unparsed_args))
+
+
+def write_metadata_db(args):
+    import pelican_metadata_generator.snapshot
+
+    known_metadata_model = create_metadata_database(args)
+    for directory in args.directory:
+        known_metadata_model.read_directory(directory)
+    pelican_metadata_generator.snapshot.write_snapshot(known_metadata_model, args.write_metadata_db)
+    return 0
+
+
+def author_report(args):
+    known_metadata_model = create_metadata_database(args)
+    load_metadata(known_metadata_model, args)
+    report = known_metadata_model.author_index.report()
+    print(report or "All authors are written consistently")
+    return 0
+
+
+def tag_report(args):
+    import pelican_metadata_generator.tag_clusters
+
+    known_metadata_model = create_metadata_database(args)
+    load_metadata(known_metadata_model, args)
+    usage = pelican_metadata_generator.tag_clusters.tag_usage(known_metadata_model)
+    report = pelican_metadata_generator.tag_clusters.report(usage)
+    print(report or "No similar tags found")
+    return 0
+
+
+def run_lsp(args):
+    import pelican_metadata_generator.lsp
+
+    known_metadata_model = create_metadata_database(args)
+    load_metadata(known_metadata_model, args)
+    server = pelican_metadata_generator.lsp.LanguageServer(
+        known_metadata_model, sys.stdin.buffer, sys.stdout.buffer
+    )
+    return server.serve()
+
+
+def run_gui(args, unparsed_args):
+    start_time = time.perf_counter()
+
+    from PyQt5 import QtWidgets
+
+    app = QtWidgets.QApplication(unparsed_args)
+    controller = show_main_window(args, start_time)
+
+    exit_code = app.exec_()
+    if controller.latency is not None:
+        controller.latency.dump(args.latency_report)
+    return exit_code
+
+
+def show_main_window(args, start_time=None):
+    """Shows main window and schedules reading of metadata
+
+    Metadata is read from snapshot and source directories only when window
+    is already painted, and pending events are processed while files are
+    read, so big content tree neither delays window nor freezes it.
+
+    Returns
+    -------
+    ``Controller`` connecting window with models.
+    """
+    if start_time is None:
+        start_time = time.perf_counter()
+
+    from PyQt5 import QtCore, QtWidgets
+
+    import pelican_metadata_generator.controller
+    import pelican_metadata_generator.latency
+    import pelican_metadata_generator.model
+    import pelican_metadata_generator.view
+
+    filename_template = args.filename_template or DEFAULT_FILENAME_TEMPLATE
 
     # File format
     file_format = args.format
 
     # Initialize main objects
-    app = QtWidgets.QApplication(unparsed_args)
-    known_metadata_model = pelican_metadata_generator.model.MetadataDatabase()
+    known_metadata_model = create_metadata_database(args)
     post_model = pelican_metadata_generator.model.NewPostMetadata(
         filename_template=filename_template
     )
+    post_model.fallback_encoding = known_metadata_model.fallback_encoding
     window = pelican_metadata_generator.view.MainWindow()
-    controller = pelican_metadata_generator.controller.Controller(  # noqa: F841
-        known_metadata_model, post_model, window
+    latency = None
+    if args.latency_report:
+        latency = pelican_metadata_generator.latency.LatencyRecorder()
+    controller = pelican_metadata_generator.controller.Controller(
+        known_metadata_model, post_model, window, latency=latency
     )
 
-    # Load data from source directories
-    for directory in args.directory:
-        known_metadata_model.read_directory(directory)
-
     # Set model and view in expected state
     post_model.file_format = file_format
     for file_format_action in window.choose_file_format_group.actions():
         if file_format_action.text().lower() == file_format:
             file_format_action.setChecked(True)
     window.setupTab.dateField.setDateTime(QtCore.QDateTime.currentDateTime())
-    if len(known_metadata_model.category) == 1:
-        window.setupTab.categoryList.setCurrentIndex(1)
     window.show()
 
-    sys.exit(app.exec_())
+    def load_deferred_metadata():
+        elapsed = (time.perf_counter() - start_time) * 1000
+        logging.info("Window shown {:.0f} ms after start".format(elapsed))
+
+        # reading another directory would start while this one is read
+        window.read_metadata_act.setEnabled(False)
+        known_metadata_model.read_progress = QtWidgets.QApplication.processEvents
+        try:
+            load_metadata(known_metadata_model, args)
+        finally:
+            known_metadata_model.read_progress = None
+            window.read_metadata_act.setEnabled(True)
+        if len(known_metadata_model.category) == 1:
+            window.setupTab.categoryList.setCurrentIndex(0)
+
+        elapsed = (time.perf_counter() - start_time) * 1000
+        logging.info("Metadata loaded {:.0f} ms after start".format(elapsed))
+
+    QtCore.QTimer.singleShot(0, load_deferred_metadata)
+    return controller
 
 
 if __name__ == "__main__":
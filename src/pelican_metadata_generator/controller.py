@@ -1,22 +1,38 @@
-from slugify import slugify
-
 from PyQt5 import QtCore
 
+import pelican_metadata_generator.model
+
 
 class Controller(QtCore.QObject):
-    def __init__(self, known_metadata_model=None, post_model=None, view=None):
+    """Connects views with models
+
+    Parameters
+    ----------
+    latency
+        Optional ``LatencyRecorder``. If given, time from user interaction
+        (or database change) until views are updated is measured and shown
+        in status bar. Signals are delivered synchronously, so measured
+        slots include updates of generated headers and tag buttons.
+    """
+
+    def __init__(self, known_metadata_model=None, post_model=None, view=None, latency=None):
         super(Controller, self).__init__(None)
         self.known_metadata_model = known_metadata_model
         self.post_model = post_model
         self.view = view
+        self.latency = latency
+        self.posts_table_model = pelican_metadata_generator.model.PostTableModel(
+            known_metadata_model, parent=self
+        )
         self.setup_connections()
 
     def setup_connections(self):
-        self.view.readMetadataDialog.fileSelected.connect(self.known_metadata_model.read_directory)
+        self.view.setupTab.setKnownValuesModels(self.known_metadata_model.value_models)
+        self.view.directorySelected.connect(self.known_metadata_model.read_directory)
         self.view.choose_file_format_group.triggered.connect(self._set_file_format)
-        self.view.setupTab.titleField.textChanged.connect(self._set_title)
+        self.view.setupTab.titleField.textChanged.connect(self._measured("title", self._set_title))
         self.view.setupTab.slugActive.stateChanged.connect(self._set_slug_based_on_title)
-        self.view.setupTab.slugField.textEdited.connect(self.post_model.set_slug)
+        self.view.setupTab.slugField.textEdited.connect(self._set_slug)
         self.view.setupTab.dateField.dateTimeChanged.connect(self.post_model.set_created_date)
         self.view.setupTab.modifiedActive.stateChanged.connect(self._modified_date_active_changed)
         self.view.setupTab.modifiedField.dateTimeChanged.connect(self.post_model.set_modified_date)
@@ -24,8 +40,12 @@ class Controller(QtCore.QObject):
             self._category_list_item_selected
         )
         self.view.setupTab.categoryField.textChanged.connect(self.post_model.set_category)
-        self.view.setupTab.tagButtonsGroup.buttonToggled.connect(self._tag_button_toggled)
-        self.view.setupTab.tagField.returnPressed.connect(self._set_tags_group)
+        self.view.setupTab.tagButtonsGroup.buttonToggled.connect(
+            self._measured("tag toggle", self._tag_button_toggled)
+        )
+        self.view.setupTab.tagField.returnPressed.connect(
+            self._measured("tag entry", self._set_tags_group)
+        )
         self.view.setupTab.seriesList.currentIndexChanged.connect(
             self._series_list_item_selected
         )
@@ -35,17 +55,39 @@ class Controller(QtCore.QObject):
         self.view.setupTab.summaryField.textChanged.connect(
             lambda: self.post_model.set_summary(self.view.setupTab.summaryField.toPlainText())
         )
-        self.view.saveAsFileButton.clicked.connect(
-            lambda: self.view.app.showSaveDialog(self.post_model.filename)
-        )
-        self.view.saveFileDialog.fileSelected.connect(self.post_model.to_file)
+        self.view.saveAsFileButton.clicked.connect(self._show_save_dialog)
+        self.view.saveFileSelected.connect(self.post_model.to_file)
         self.view.prependHeaders.connect(self.post_model.to_file_prepend_headers)
         self.view.overwriteHeaders.connect(self.post_model.to_file_overwrite_headers)
         self.post_model.fileHasHeaders.connect(self.view.show_file_exists_dialog)
+        self.post_model.fileChanged.connect(self.view.show_file_changed_dialog)
         self.post_model.changed.connect(
             lambda: self.view.generatedTab.set_content(self.post_model.as_pelican_header())
         )
-        self.known_metadata_model.changed.connect(self._update_view_options_based_on_metadata)
+        # date info depends only on created date, category and slug
+        for signal in [
+            self.view.setupTab.dateField.dateTimeChanged,
+            self.view.setupTab.categoryField.textChanged,
+        ]:
+            signal.connect(lambda *args: self._update_date_info())
+        self.view.postsTab.setModel(self.posts_table_model)
+        self.posts_table_model.dirtyChanged.connect(self.view.postsTab.setDirtyCount)
+        self.view.postsTab.saveButton.clicked.connect(self._save_posts_table)
+        self.known_metadata_model.changed.connect(
+            self._measured("database change", self._update_view_options_based_on_metadata)
+        )
+
+    def _measured(self, name, slot):
+        """Returns slot wrapped so its latency is recorded, if latency is measured"""
+        if self.latency is None:
+            return slot
+
+        def measured_slot(*args):
+            with self.latency.measure(name):
+                slot(*args)
+            self.view.showDebugStatus(self.latency.status(name))
+
+        return measured_slot
 
     def _set_file_format(self, value):
         self.post_model.set_file_format(value.text().lower().replace("&", ""))
@@ -54,31 +96,73 @@ class Controller(QtCore.QObject):
         self.post_model.set_title(value)
         self._set_slug_based_on_title()
 
+    def _set_slug(self, value):
+        self.post_model.set_slug(value)
+        self._check_slug_collision()
+        self._update_date_info()
+
     def _set_slug_based_on_title(self):
         if self.view.setupTab.slugActive.isChecked():
-            self.post_model.set_slug(slugify(self.post_model.title))
+            self.post_model.set_slug(
+                self.known_metadata_model.slug_engine.slugify(self.post_model.title)
+            )
             self.view.setupTab.slugField.setText(self.post_model.slug)
+            self._check_slug_collision()
+            self._update_date_info()
+
+    def _check_slug_collision(self):
+        slug = self.post_model.slug
+        existing_path = self.known_metadata_model.slugs.get(slug)
+        if existing_path:
+            suggestion = self.known_metadata_model.free_slug(slug)
+            self.view.setupTab.setSlugCollision(existing_path, suggestion)
+        else:
+            self.view.setupTab.setSlugCollision(None, None)
+
+    def _update_date_info(self):
+        date = self.post_model.date
+        category = self.post_model.category
+        self.view.setupTab.setDateInfo(
+            self.known_metadata_model.posts_on_day(date),
+            self.known_metadata_model.previous_post(date, category),
+            category,
+            self.known_metadata_model.template_collisions(
+                self.post_model.filename_template, date, category, self.post_model.slug
+            ),
+        )
+
+    def _save_posts_table(self):
+        errors = self.posts_table_model.save()
+        if errors:
+            self.view.postsTab.showSaveErrors(errors)
+
+    def _show_save_dialog(self):
+        filename = self.post_model.filename
+        if self.known_metadata_model.path_exists(filename):
+            suggestion = self.known_metadata_model.free_path(filename)
+            filename = self.view.show_filename_exists_dialog(filename, suggestion)
+        self.view.app.showSaveDialog(filename)
 
     def _modified_date_active_changed(self, state):
         if not state:
             self.post_model.set_modified_date(None)
 
     def _category_list_item_selected(self, value):
-        if value == 0:
+        if value < 0:
             value = ""
         else:
             value = self.view.setupTab.categoryList.itemText(value)
         self.view.setupTab.categoryField.setText(value)
 
     def _series_list_item_selected(self, value):
-        if value == 0:
+        if value < 0:
             value = ""
         else:
             value = self.view.setupTab.seriesList.itemText(value)
         self.view.setupTab.seriesField.setText(value)
 
     def _author_list_item_selected(self, value):
-        if value == 0:
+        if value < 0:
             value = ""
         else:
             value = self.view.setupTab.authorList.itemText(value)
@@ -104,8 +188,7 @@ class Controller(QtCore.QObject):
             tag = tag.strip()
             if not tag:
                 continue
-            if tag not in self.known_metadata_model.tags:
-                self.known_metadata_model.tags.append(tag)
+            self.known_metadata_model.add_known_value("tags", tag)
             self.post_model.add_tag(tag)
 
         self.view.setupTab.tagField.clear()
@@ -113,19 +196,8 @@ class Controller(QtCore.QObject):
         checked_tags = ["&&".join(x.split("&")) for x in self.post_model.tags]
         self.view.setupTab.setTagButtons(known_tags, checked_tags)
 
-    def _set_combobox_values(self, qcombobox, values):
-        new_values = ["Pick value"]
-        new_values.extend(sorted(values, key=str.lower))
-        qcombobox.clear()
-        qcombobox.addItems(new_values)
-
     def _update_view_options_based_on_metadata(self):
-        self.view.saveFileDialog.setDirectory(self.known_metadata_model.path)
+        self.view.app.setSaveDirectory(self.known_metadata_model.path)
         self._set_tags_group()
-        self._set_combobox_values(
-            self.view.setupTab.categoryList, self.known_metadata_model.category
-        )
-        self._set_combobox_values(
-            self.view.setupTab.seriesList, self.known_metadata_model.series
-        )
-        self._set_combobox_values(self.view.setupTab.authorList, self.known_metadata_model.authors)
+        self._check_slug_collision()
+        self._update_date_info()
@@ -1,5 +1,172 @@
+import io
 import os
 import re
+import time
+import shutil
+import hashlib
+import logging
+import importlib
+
+import pelican_metadata_generator.sources
+
+
+_handlers = {}
+_extensions = {}
+
+# well-known metadata keys, in order they are written to file
+HEADERS_ORDER = [
+    "title", "slug", "date", "modified", "category", "tags", "authors", "series", "summary",
+]
+
+HASH_CHUNK_SIZE = 64 * 1024
+# files modified that close to the moment they were read might be changed
+# again without changing modification time, so their content is compared
+RACY_MTIME_MARGIN_NS = 2 * 10**9
+
+
+class FileChangedError(Exception):
+    """Raised when file is about to be written, but it was changed since it was read"""
+
+
+class _HashingStream(io.RawIOBase):
+    """Binary stream that passes data to or from another stream, computing SHA-256 on the way
+
+    Attributes
+    ----------
+    digest
+        ``hashlib`` object with all bytes passed so far
+    size
+        Number of bytes passed so far
+    """
+
+    def __init__(self, stream):
+        super(_HashingStream, self).__init__()
+        self._stream = stream
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def readable(self):
+        return self._stream.readable()
+
+    def writable(self):
+        return self._stream.writable()
+
+    def readinto(self, buffer):
+        size = self._stream.readinto(buffer)
+        if size:
+            self.digest.update(memoryview(buffer)[:size])
+            self.size += size
+        return size
+
+    def write(self, data):
+        size = self._stream.write(data)
+        self.digest.update(memoryview(data)[:size])
+        self.size += size
+        return size
+
+    def close(self):
+        if not self.closed:
+            self._stream.close()
+        super(_HashingStream, self).close()
+
+
+class FileFingerprint:
+    """Size, modification time and SHA-256 of file content, used to find out
+    if file was changed by another program
+
+    Parameters
+    ----------
+    stat
+        ``os.stat_result`` of file, taken before file was read.
+    hashed_size
+        Number of bytes at the beginning of file that were hashed.
+    sha256
+        Hex digest of these bytes.
+    """
+
+    def __init__(self, stat, hashed_size, sha256):
+        self.size = stat.st_size
+        self.mtime_ns = stat.st_mtime_ns
+        self.hashed_size = hashed_size
+        self.sha256 = sha256
+        self.taken_ns = time.time_ns()
+
+    def matches(self, path):
+        """True if file at path still has the same content
+
+        File with the same size and modification time is assumed to be
+        unchanged, unless it was modified shortly before it was read.
+        Otherwise content is hashed again, in chunks, so files that were
+        only touched are not reported.
+        """
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return False
+
+        if stat.st_size != self.size:
+            return False
+        racy = self.mtime_ns >= self.taken_ns - RACY_MTIME_MARGIN_NS
+        if stat.st_mtime_ns == self.mtime_ns and not racy:
+            return True
+
+        digest = hashlib.sha256()
+        remaining = self.hashed_size
+        with open(path, "rb") as fh:
+            while remaining:
+                chunk = fh.read(min(remaining, HASH_CHUNK_SIZE))
+                if not chunk:
+                    return False
+                digest.update(chunk)
+                remaining -= len(chunk)
+        return digest.hexdigest() == self.sha256
+
+
+def split_values(values):
+    """Splits metadata value into list of stripped items
+
+    Items are separated by semicolon or, if there is no semicolon in value,
+    by comma.
+    """
+    if ";" in values:
+        values = values.split(";")
+    else:
+        values = values.split(",")
+
+    return [v.strip() for v in values]
+
+
+def register_handler(file_format, handler, extensions=()):
+    """Makes FileHandler class available to Factory
+
+    Parameters
+    ----------
+    file_format
+        Name of file format.
+    handler
+        FileHandler class, or its import path in "module:ClassName" form.
+        Import paths are resolved when handler is needed for the first time.
+    extensions
+        File extensions (with leading dot) that are handled by this format.
+    """
+    _handlers[file_format] = handler
+    for ext in extensions:
+        _extensions[ext] = file_format
+
+
+def get_handler(file_format):
+    """Returns FileHandler class registered for file format"""
+    try:
+        handler = _handlers[file_format]
+    except KeyError:
+        raise NotImplementedError("File format not supported: {}".format(file_format))
+
+    if isinstance(handler, str):
+        module_name, _, class_name = handler.partition(":")
+        handler = getattr(importlib.import_module(module_name), class_name)
+        _handlers[file_format] = handler
+
+    return handler
 
 
 class Factory:
@@ -16,32 +183,46 @@ class Factory:
         Path to file (FileHandler will be chosen based on extension).
     file_format
         Required format of FileHandler.
+    source
+        Source that file is read from (see pelican_metadata_generator.sources);
+        local disk by default.
+
+    Attributes
+    ----------
+    detect_front_matter
+        True if format was chosen by Markdown extension, so handler switches
+        to YAML front matter when first line of file opens it.
     """
 
-    def __init__(self, path, file_format=None):
+    def __init__(self, path, file_format=None, source=None):
         self.path = path
         self.file_format = file_format
+        self.source = source
+        self.detect_front_matter = False
         self.handler = self._choose_handler()
 
     def _choose_handler(self):
         """Chooses and returns FileHandler object based on extension or user request"""
         if not self.file_format:
             _, ext = os.path.splitext(self.path)
-            if ext in [".md", ".markdown", ".mdown", ".mkd"]:
-                self.file_format = "markdown"
-            elif ext in [".rst"]:
-                self.file_format = "restructuredtext"
+            self.file_format = _extensions.get(ext.lower())
+            self.detect_front_matter = self.file_format == "markdown"
+
+        return get_handler(self.file_format)
 
-        if self.file_format == "markdown":
-            return MarkdownHandler
-        elif self.file_format == "restructuredtext":
-            return RestructuredtextHandler
-        else:
-            raise NotImplementedError("File format not supported: {}".format(self.file_format))
+    def generate(self, **options):
+        """Returns instantiated FileHandler object
 
-    def generate(self):
-        """Returns instantiated FileHandler object"""
-        return self.handler(self.path)
+        Parameters
+        ----------
+        options
+            Keyword arguments passed to FileHandler class.
+        """
+        if self.source is not None:
+            options.setdefault("source", self.source)
+        if self.detect_front_matter:
+            options.setdefault("detect_front_matter", True)
+        return self.handler(self.path, **options)
 
 
 class AbstractFileHandler:
@@ -54,18 +235,94 @@ class AbstractFileHandler:
     ----------
     path
         Path to file (FileHandler will be chosen based on extension).
+    headers_only
+        Stop reading as soon as metadata is parsed. ``post_content`` and
+        ``raw_content`` are incomplete and object must not be used to
+        write file.
+    max_header_lines
+        Stop reading if metadata is not parsed after that many lines.
+    max_header_size
+        Stop reading if metadata is not parsed after that many characters.
+    encoding
+        Encoding of file.
+    fallback_encoding
+        Encoding used if file can't be decoded using ``encoding``.
+    source
+        Source that file is read from (see pelican_metadata_generator.sources);
+        local disk by default. Files are always written to local disk.
+
+    Attributes
+    ----------
+    headers_complete
+        True if reader encountered end of metadata
+    truncated
+        Reason why file was not read fully (empty string if it was)
+    fingerprint
+        ``FileFingerprint`` of local file that was read (or last written
+        by this object) to be written, None otherwise. File is not written
+        if it doesn't match anymore.
     """
 
-    def __init__(self, path):
-        self.path = os.path.realpath(path)
-        self.exists = os.path.exists(self.path) and os.path.isfile(self.path)
+    def __init__(
+        self,
+        path,
+        headers_only=False,
+        max_header_lines=None,
+        max_header_size=None,
+        encoding="utf-8",
+        fallback_encoding=None,
+        source=None,
+    ):
+        if source is None:
+            source = pelican_metadata_generator.sources.LOCAL_FILES
+            path = os.path.realpath(path)
+        self.path = path
+        self.source = source
+        self.exists = source.isfile(self.path)
         self.default_extension = ""
         self.format = ""
+        self.headers_only = headers_only
+        self.max_header_lines = max_header_lines
+        self.max_header_size = max_header_size
+        self.encoding = encoding
+        self.fallback_encoding = fallback_encoding
+        self.fingerprint = None
+        self._handler_class = type(self)
+        self._reset()
+
+        self.read()
+
+    def _reset(self):
+        """Sets parser into initial state
+
+        Note
+        ----
+        Child classes that keep their own parser state should extend this method
+        """
         self.headers = {}
+        self.headers_complete = False
         self.post_content = ""
         self.raw_content = ""
-
-        self.read()
+        self.truncated = ""
+        self._raw_content = []
+        self._post_content = []
+        self._pending = ""
+        self._header_lines = 0
+        self._header_size = 0
+        # metadata key -> [first, last + 1] indexes of its lines in _raw_content
+        self._header_spans = {}
+        # index of line in _raw_content before which new metadata is written
+        self._header_end = None
+
+    def reset(self):
+        """Forgets content read so far
+
+        Call it before passing content of another file to ``feed``.
+        ``read_stream`` does it by itself.
+        """
+        # handler might have switched class to parse detected format
+        self.__class__ = self._handler_class
+        self._reset()
 
     def has_metadata(self):
         """True if file has metadata"""
@@ -73,25 +330,238 @@ class AbstractFileHandler:
 
     def read(self):
         """Reads file content
-        This method can be used to work with real files.
+        This method can be used to work with files in source (real files
+        by default).
         """
         if not self.exists:
             return
 
-        with open(self.path, "r", encoding="utf-8") as fh:
+        try:
+            self._read_file()
+        except UnicodeDecodeError:
+            if not self.fallback_encoding:
+                raise
+            msg = "Can't decode {file} as {encoding}, trying {fallback}"
+            logging.info(
+                msg.format(file=self.path, encoding=self.encoding, fallback=self.fallback_encoding)
+            )
+            self._reset()
+            self.encoding = self.fallback_encoding
+            self._read_file()
+
+    def _read_file(self):
+        local = isinstance(self.source, pelican_metadata_generator.sources.LocalFiles)
+        if self.headers_only or not local:
+            with self._open() as fh:
+                self.read_stream(fh)
+            return
+
+        # content is hashed while it is decoded, so it is read only once
+        stat = os.stat(self.path)
+        stream = _HashingStream(self.source.open(self.path))
+        with io.TextIOWrapper(io.BufferedReader(stream), encoding=self.encoding) as fh:
             self.read_stream(fh)
+        self.fingerprint = FileFingerprint(stat, stream.size, stream.digest.hexdigest())
+
+    def _open(self):
+        return io.TextIOWrapper(self.source.open(self.path), encoding=self.encoding)
+
+    def check_unchanged(self):
+        """Checks that file was not changed by another program since it was read
+
+        Raises
+        ------
+        FileChangedError
+            If file was changed, removed or (if it didn't exist) created.
+        """
+        if self.fingerprint is None:
+            if not self.exists and os.path.lexists(self.path):
+                raise FileChangedError("{} was created after it was read".format(self.path))
+            return
+        if not self.fingerprint.matches(self.path):
+            raise FileChangedError("{} was changed after it was read".format(self.path))
+
+    def _write_file(self, write_stream):
+        """Writes file using method that writes into stream, if file was not changed"""
+        self.check_unchanged()
+        stream = _HashingStream(open(self.path, "wb"))
+        with io.TextIOWrapper(io.BufferedWriter(stream), encoding=self.encoding) as fh:
+            write_stream(fh)
+        self.exists = True
+        self.fingerprint = FileFingerprint(
+            os.stat(self.path), stream.size, stream.digest.hexdigest()
+        )
 
     def read_stream(self, stream_handle):
         """Reads and parses file format
         This method can be used to work with any object that provides
-        file stream API.
+        file stream API. Content read earlier is forgotten.
+        """
+        self.reset()
+        for line in self._lines(stream_handle):
+            if self.feed_line(line):
+                break
+        self.close()
+
+    def feed(self, chunk):
+        """Parses next part of file content
+        This method can be used when content arrives in parts (from pipe,
+        archive or editor buffer). Parts don't have to end at line boundary.
+        ``close`` must be called after last part, and ``reset`` before
+        first part of another file.
+
+        Returns
+        -------
+        True if there is no need to feed more data - metadata is complete
+        and only headers were requested, or reading was stopped because
+        of limits.
+        """
+        if self._is_done():
+            return True
+
+        lines = (self._pending + chunk).split("\n")
+        self._pending = lines.pop()
+        for line in lines:
+            if self.feed_line(line + "\n"):
+                self._pending = ""
+                return True
+
+        pending_size = self._header_size + len(self._pending)
+        if not self.headers_complete and self.max_header_size and (
+            pending_size > self.max_header_size
+        ):
+            self._pending = ""
+            self._truncate("more than {} characters of metadata".format(self.max_header_size))
+            return True
+
+        return False
+
+    def feed_line(self, line):
+        """Parses single line of file content
+
+        Returns
+        -------
+        True if there is no need to feed more data (see ``feed``).
+        """
+        if self._is_done():
+            return True
+
+        if not self.headers_complete:
+            self._header_lines += 1
+            self._header_size += len(line)
+
+            if self.max_header_lines and self._header_lines > self.max_header_lines:
+                self._truncate("more than {} lines of metadata".format(self.max_header_lines))
+                return True
+
+            if self.max_header_size and self._header_size > self.max_header_size:
+                self._truncate("more than {} characters of metadata".format(self.max_header_size))
+                return True
+
+            if "\x00" in line:
+                self.headers.clear()
+                self._truncate("file looks like binary file")
+                return True
+
+        self._raw_content.append(line)
+        self._parse_line(line)
+        return self._is_done()
+
+    def close(self):
+        """Finishes parsing of content passed to ``feed``
+
+        Returns
+        -------
+        Dictionary of file metadata.
+        """
+        if self._pending:
+            line = self._pending
+            self._pending = ""
+            self.feed_line(line)
+
+        if not self.headers_complete and not self.truncated:
+            self._finish_headers()
+
+        self.raw_content = "".join(self._raw_content)
+        self.post_content = "".join(self._post_content)
+        return self.headers
+
+    def _is_done(self):
+        return bool(self.truncated) or (self.headers_only and self.headers_complete)
+
+    def _parse_line(self, line):
+        """Parses single line of file
 
         Note
         ----
-        Child classes are expected to override this method
+        Child classes are expected to override this method. They should
+        add line to ``_post_content`` if it is not part of metadata, and
+        set ``headers_complete`` as soon as end of metadata is found.
         """
         pass
 
+    def _finish_headers(self):
+        """Called when file ends before end of metadata was found"""
+        pass
+
+    def _lines(self, stream_handle):
+        """Yields lines of stream
+
+        When size of metadata is limited, lines are read with ``readline``
+        and at most one character over limit, so single huge line can't be
+        loaded into memory.
+        """
+        # `yield from` is not used, because it would close stream when
+        # caller stops reading early
+        readline = getattr(stream_handle, "readline", None)
+        if self.max_header_size and readline:
+            while not self.headers_complete:
+                line = readline(self.max_header_size - self._header_size + 1)
+                if not line:
+                    return
+                yield line
+
+        for line in stream_handle:
+            yield line
+
+    def _ordered_keys(self, skip=()):
+        """Returns metadata keys in order they should be written
+
+        Well-known keys come first, followed by remaining keys in order
+        they were read.
+        """
+        keys = [key for key in HEADERS_ORDER if key in self.headers]
+        keys.extend(key for key in self.headers if key not in HEADERS_ORDER)
+        return [key for key in keys if key not in skip]
+
+    def _update_headers(self, changes):
+        """Sets metadata values, removing keys with empty value"""
+        for key, value in changes.items():
+            if value:
+                self.headers[key] = value
+            else:
+                self.headers.pop(key, None)
+
+    def _mark_header(self, key, start=None):
+        """Records that last read line (and lines since ``start``) hold value of key
+
+        Note
+        ----
+        Child classes that support ``edit_headers`` should call it for
+        every line of metadata.
+        """
+        end = len(self._raw_content)
+        if start is None:
+            start = end - 1
+        span = self._header_spans.setdefault(key, [start, end])
+        span[0] = min(span[0], start)
+        span[1] = max(span[1], end)
+        self._header_end = max(self._header_end or 0, end)
+
+    def _truncate(self, reason):
+        self.truncated = reason
+        logging.info("Stopped reading {file}: {reason}".format(file=self.path, reason=reason))
+
     @property
     def formatted_headers(self):
         """Returns file metadata in given format as string
@@ -102,98 +572,226 @@ class AbstractFileHandler:
         """
         pass
 
+    def _formatted_header(self, key):
+        """Returns value of single metadata key in given format as string
+
+        Note
+        ----
+        Child classes that support ``edit_headers`` are expected to override
+        this method
+        """
+        raise NotImplementedError("Editing metadata of {} is not supported".format(self.path))
+
     def prepend_headers(self):
         """Adds file metadata at top of file (leaving existing metadata as-is)
         This method can be used to work with real files.
+
+        Raises
+        ------
+        FileChangedError
+            If file was changed since it was read (see ``check_unchanged``).
         """
-        with open(self.path, "w", encoding="utf-8") as fh:
-            self.prepend_headers_stream(fh)
+        self._write_file(self.prepend_headers_stream)
 
-    def prepend_headers_stream(self, stream_handle):
+    def prepend_headers_stream(self, stream_handle, remaining=None):
         """Adds file metadata at top of file (leaving existing metadata as-is)
         This method can be used to work with any object that provides
         file stream API.
+
+        Parameters
+        ----------
+        stream_handle
+            Stream that file should be written to.
+        remaining
+            Stream with part of file that was not read (when reading
+            stopped after metadata). It is copied after content that was read.
         """
         stream_handle.write(self.formatted_headers)
         stream_handle.write("\n\n")
         stream_handle.write(self.raw_content)
+        if remaining is not None:
+            shutil.copyfileobj(remaining, stream_handle)
 
     def overwrite_headers(self):
         """Adds file metadata at top of file (removing existing metadata)
         This method can be used to work with real files.
+
+        Raises
+        ------
+        FileChangedError
+            If file was changed since it was read (see ``check_unchanged``).
         """
-        with open(self.path, "w", encoding="utf-8") as fh:
-            self.overwrite_headers_stream(fh)
+        self._write_file(self.overwrite_headers_stream)
 
-    def overwrite_headers_stream(self, stream_handle):
+    def overwrite_headers_stream(self, stream_handle, remaining=None):
         """Adds file metadata at top of file (removing existing metadata)
         This method can be used to work with any object that provides
         file stream API.
+
+        Parameters
+        ----------
+        stream_handle
+            Stream that file should be written to.
+        remaining
+            Stream with part of file that was not read (when reading
+            stopped after metadata). It is copied after content that was read.
         """
         stream_handle.write(self.formatted_headers)
         stream_handle.write("\n\n")
         stream_handle.write(self.post_content)
+        if remaining is not None:
+            shutil.copyfileobj(remaining, stream_handle)
+
+    def edit_headers(self, changes):
+        """Changes given metadata values, leaving rest of file as it was read
+        This method can be used to work with real files.
+
+        Raises
+        ------
+        FileChangedError
+            If file was changed since it was read (see ``check_unchanged``).
+        NotImplementedError
+            If metadata of file format can't be edited in place.
+        """
+        self._write_file(lambda stream_handle: self.edit_headers_stream(stream_handle, changes))
+
+    def edit_headers_stream(self, stream_handle, changes, remaining=None):
+        """Changes given metadata values, leaving rest of file as it was read
+        This method can be used to work with any object that provides
+        file stream API.
+
+        Only lines of changed metadata are replaced; new metadata is added
+        after the last line of metadata. Lines of other metadata and
+        content are written without any change.
+
+        Parameters
+        ----------
+        stream_handle
+            Stream that file should be written to.
+        changes
+            Dictionary mapping metadata key to its new value. Keys with
+            empty value are removed.
+        remaining
+            Stream with part of file that was not read (when reading
+            stopped after metadata). It is copied after content that was read.
+        """
+        self._update_headers(changes)
+        edits = []
+        added = []
+        for key, value in changes.items():
+            span = self._header_spans.get(key)
+            if span is None:
+                if value:
+                    added.append(key)
+                continue
+            lines = [self._formatted_header(key) + "\n"] if value else []
+            edits.append((span[0], span[1], lines))
+
+        if added:
+            keys = [key for key in self._ordered_keys() if key in added]
+            lines = [self._formatted_header(key) + "\n" for key in keys]
+            if self._header_end is None:
+                edits.append((0, 0, lines + ["\n"]))
+            else:
+                edits.append((self._header_end, self._header_end, lines))
+
+        content = list(self._raw_content)
+        # edits are applied from the end, so their positions stay valid
+        for start, end, lines in sorted(edits, key=lambda edit: edit[:2], reverse=True):
+            content[start:end] = lines
+        stream_handle.write("".join(content))
+        if remaining is not None:
+            shutil.copyfileobj(remaining, stream_handle)
 
 
 class MarkdownHandler(AbstractFileHandler):
-    """Markdown metadata parser"""
+    """Markdown metadata parser
 
-    def __init__(self, path):
-        super(MarkdownHandler, self).__init__(path)
+    Parameters
+    ----------
+    detect_front_matter
+        If first line of file opens YAML front matter, object becomes
+        ``FrontMatterHandler`` and parses whole file as such. This way
+        file is read only once to find out its format.
+    """
+
+    META_RE = re.compile(r"^[ ]{0,3}(?P<key>[A-Za-z0-9_-]+):\s*(?P<value>.*)")
+    META_MORE_RE = re.compile(r"^[ ]{4,}(?P<value>.*)")
+    BEGIN_RE = re.compile(r"^-{3}(\s.*)?")
+    END_RE = re.compile(r"^(-{3}|\.{3})(\s.*)?")
+
+    def __init__(self, path, detect_front_matter=False, **options):
+        self.detect_front_matter = detect_front_matter
+        super(MarkdownHandler, self).__init__(path, **options)
         self.default_extension = "md"
 
-    def read_stream(self, stream_handle):
-        META_RE = re.compile(r"^[ ]{0,3}(?P<key>[A-Za-z0-9_-]+):\s*(?P<value>.*)")
-        META_MORE_RE = re.compile(r"^[ ]{4,}(?P<value>.*)")
-        BEGIN_RE = re.compile(r"^-{3}(\s.*)?")
-        END_RE = re.compile(r"^(-{3}|\.{3})(\s.*)?")
+    def _reset(self):
+        super(MarkdownHandler, self)._reset()
+        self._key = None
 
-        raw_content = []
-        post_content = []
-        processed_headers = False
-        key = None
+    def _switch_handler(self, handler):
+        """Continues parsing as instance of another handler class
 
-        for line in stream_handle:
-            raw_content.append(line)
+        Lines read so far (and pending part of line) are kept, parser
+        state is initialized by new class.
+        """
+        state = {
+            name: getattr(self, name)
+            for name in ["_raw_content", "_pending", "_header_lines", "_header_size"]
+        }
+        self.__class__ = handler
+        self._reset()
+        self.__dict__.update(state)
+
+    def _parse_line(self, line):
+        if self.headers_complete:
+            self._post_content.append(line)
+            return
 
-            if processed_headers:
-                post_content.append(line)
-                continue
+        if self.detect_front_matter and len(self._raw_content) == 1:
+            handler = get_handler("yaml-front-matter")
+            if handler.starts_front_matter(line):
+                self._switch_handler(handler)
+                self._parse_line(line)
+                return
 
-            if BEGIN_RE.match(line):
-                continue
+        if self.BEGIN_RE.match(line):
+            return
 
-            m1 = META_RE.match(line)
-            if m1:
-                key = m1.group("key").lower().strip()
-                value = m1.group("value").strip()
-                # We have mis-interpreted URL as key-value pair
-                if value.startswith("//"):
-                    processed_headers = True
-                    post_content.append(line)
-                else:
-                    self.headers[key] = value
-                continue
+        m1 = self.META_RE.match(line)
+        if m1:
+            self._key = m1.group("key").lower().strip()
+            value = m1.group("value").strip()
+            # We have mis-interpreted URL as key-value pair
+            if value.startswith("//"):
+                self.headers_complete = True
+                self._post_content.append(line)
+            else:
+                self.headers[self._key] = value
+                self._mark_header(self._key)
+            return
 
-            m2 = META_MORE_RE.match(line)
-            if m2 and key:
-                self.headers[key] = "{}; {}".format(self.headers[key], m2.group("value").strip())
-                continue
+        m2 = self.META_MORE_RE.match(line)
+        if m2 and self._key:
+            self.headers[self._key] = "{}; {}".format(
+                self.headers[self._key], m2.group("value").strip()
+            )
+            self._mark_header(self._key)
+            return
 
-            if line.strip() == "" or END_RE.match(line) or not m1:
-                processed_headers = True
-                if line.strip() != "":
-                    post_content.append(line)
+        if line.strip() == "" or self.END_RE.match(line) or not m1:
+            self.headers_complete = True
+            if line.strip() != "":
+                self._post_content.append(line)
 
-        self.raw_content = "".join(raw_content)
-        self.post_content = "".join(post_content)
+    def _formatted_header(self, key):
+        return "{}: {}".format(key.title(), self.headers[key])
 
     @property
     def formatted_headers(self):
         output = []
-        for key in ["title", "slug", "date", "modified", "category", "tags", "authors", "series", "summary"]:
-            if key in self.headers:
-                output.append("{}: {}".format(key.title(), self.headers[key]))
+        for key in self._ordered_keys():
+            output.append(self._formatted_header(key))
 
         return "\n".join(output)
 
@@ -201,78 +799,87 @@ class MarkdownHandler(AbstractFileHandler):
 class RestructuredtextHandler(AbstractFileHandler):
     """ReStructuredText metadata parser"""
 
-    def __init__(self, path):
-        super(RestructuredtextHandler, self).__init__(path)
-        self.default_extension = "rst"
+    META_RE = re.compile(r"^[ ]{0,3}:(?P<key>[A-Za-z0-9_-]+):\s*(?P<value>.*)")
+    META_MORE_RE = re.compile(r"^[ ]{4,}-?\s*(?P<value>.*)")
+    META_TITLE_RE = re.compile(r"^[=~_*+#-]+")
 
-    def read_stream(self, stream_handle):
-        META_RE = re.compile(r"^[ ]{0,3}:(?P<key>[A-Za-z0-9_-]+):\s*(?P<value>.*)")
-        META_MORE_RE = re.compile(r"^[ ]{4,}-?\s*(?P<value>.*)")
-        META_TITLE_RE = re.compile(r"^[=~_*+#-]+")
+    def __init__(self, path, **options):
+        super(RestructuredtextHandler, self).__init__(path, **options)
+        self.default_extension = "rst"
 
-        raw_content = []
-        post_content = []
-        processed_headers = False
-        key = None
+    def _reset(self):
+        super(RestructuredtextHandler, self)._reset()
+        self._key = None
 
-        for line in stream_handle:
-            raw_content.append(line)
+    def _parse_line(self, line):
+        post_content = self._post_content
 
-            if processed_headers:
-                post_content.append(line)
-                continue
+        if self.headers_complete:
+            post_content.append(line)
+            return
 
-            if len([x for x in post_content if x.strip()]) > 1:
-                processed_headers = True
-                post_content.append(line)
-                continue
+        if len([x for x in post_content if x.strip()]) > 1:
+            self.headers_complete = True
+            post_content.append(line)
+            return
 
-            if META_TITLE_RE.match(line):
-                self.headers["title"] = post_content.pop().strip()
-                continue
+        if self.META_TITLE_RE.match(line):
+            self.headers["title"] = post_content.pop().strip()
+            self._mark_header("title", start=len(self._raw_content) - 2)
+            return
 
-            m1 = META_RE.match(line)
-            if m1:
-                key = m1.group("key").lower().strip()
-                value = m1.group("value").strip()
-                self.headers[key] = value
-                continue
+        m1 = self.META_RE.match(line)
+        if m1:
+            self._key = m1.group("key").lower().strip()
+            self.headers[self._key] = m1.group("value").strip()
+            self._mark_header(self._key)
+            return
 
-            m2 = META_MORE_RE.match(line)
-            if m2 and key:
-                value = m2.group("value").strip()
-                if line.strip().startswith("-"):
-                    self.headers[key] = "{}; {}".format(self.headers[key], value)
-                    self.headers[key] = self.headers[key].lstrip("- ")
-                else:
-                    self.headers[key] = "{} {}".format(self.headers[key], value).strip()
-                continue
+        m2 = self.META_MORE_RE.match(line)
+        if m2 and self._key:
+            key = self._key
+            value = m2.group("value").strip()
+            if line.strip().startswith("-"):
+                self.headers[key] = "{}; {}".format(self.headers[key], value)
+                self.headers[key] = self.headers[key].lstrip("- ")
+            else:
+                self.headers[key] = "{} {}".format(self.headers[key], value).strip()
+            self._mark_header(key)
+            return
 
-            if line.strip() == "":
-                if len(self.headers) > 1:
-                    processed_headers = True
-                continue
+        if line.strip() == "":
+            if len(self.headers) > 1:
+                self.headers_complete = True
+            return
 
-            # `not m1` part of this condition is implicit - we can reach
-            # this point only if line does not match META_RE or META_MORE_RE
-            if "title" in self.headers:
-                processed_headers = True
+        # `not m1` part of this condition is implicit - we can reach
+        # this point only if line does not match META_RE or META_MORE_RE
+        if "title" in self.headers:
+            self.headers_complete = True
 
-            post_content.append(line)
+        post_content.append(line)
 
-        self.raw_content = "".join(raw_content)
-        self.post_content = "".join(post_content)
+    def _formatted_header(self, key):
+        if key == "title":
+            return "{}\n{}".format(self.headers["title"], "#" * len(self.headers["title"]))
+        return ":{}: {}".format(key.lower(), self.headers[key])
 
     @property
     def formatted_headers(self):
         output = []
         if "title" in self.headers:
-            output.append(self.headers["title"])
-            output.append("#" * len(self.headers["title"]))
+            output.append(self._formatted_header("title"))
             output.append("")
 
-        for key in ["slug", "date", "modified", "category", "tags", "authors", "series", "summary"]:
-            if key in self.headers:
-                output.append(":{}: {}".format(key.lower(), self.headers[key]))
+        for key in self._ordered_keys(skip=["title"]):
+            output.append(self._formatted_header(key))
 
         return "\n".join(output)
+
+
+register_handler("markdown", MarkdownHandler, [".md", ".markdown", ".mdown", ".mkd"])
+register_handler("restructuredtext", RestructuredtextHandler, [".rst"])
+register_handler(
+    "yaml-front-matter", "pelican_metadata_generator.front_matter:FrontMatterHandler"
+)
+register_handler("html", "pelican_metadata_generator.html_handler:HTMLHandler", [".html", ".htm"])
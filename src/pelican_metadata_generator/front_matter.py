@@ -0,0 +1,194 @@
+import re
+import json
+
+from pelican_metadata_generator.file_handler import AbstractFileHandler
+
+KEY_RE = re.compile(r"^(?P<key>[A-Za-z0-9_-]+):(?:\s+(?P<value>.*?))?\s*$")
+LIST_ITEM_RE = re.compile(r"^\s*-\s+(?P<value>.*?)\s*$")
+DELIMITER_RE = re.compile(r"^(-{3}|\.{3})\s*$")
+# characters that have special meaning at the beginning of YAML plain scalar
+SPECIAL_START = tuple("-?:,[]{}#&*!|>'\"%@`")
+
+LIST_KEYS = ["tags", "authors"]
+
+
+def _unquote(value):
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value[1:-1]
+    if len(value) >= 2 and value[0] == value[-1] == "'":
+        return value[1:-1].replace("''", "'")
+    return value
+
+
+def _quote(value, in_list=False):
+    needs_quotes = value.startswith(SPECIAL_START) or ": " in value or " #" in value
+    # line breaks are kept only by escapes in double-quoted scalar
+    needs_quotes = needs_quotes or "\n" in value
+    if in_list:
+        needs_quotes = needs_quotes or "," in value or "]" in value
+    if not value or needs_quotes:
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def _split_flow_list(value):
+    """Splits content of YAML flow sequence ("[a, 'b, c']") into items"""
+    items = []
+    current = []
+    quote = None
+    for char in value[1:-1]:
+        if quote:
+            current.append(char)
+            if char == quote:
+                quote = None
+        elif char in "\"'":
+            quote = char
+            current.append(char)
+        elif char == ",":
+            items.append("".join(current).strip())
+            current = []
+        else:
+            current.append(char)
+    items.append("".join(current).strip())
+    return [_unquote(item) for item in items if item]
+
+
+def _join_list(items):
+    separator = "; " if any("," in item for item in items) else ", "
+    return separator.join(items)
+
+
+class FrontMatterHandler(AbstractFileHandler):
+    """YAML front matter metadata parser
+
+    Understands subset of YAML used for post metadata: plain and quoted
+    scalars, plain scalars continued on indented lines, literal (``|``)
+    and folded (``>``) block scalars, and flow (``[a, b]``) and block
+    (``- a``) sequences. Sequences are stored in ``headers`` as strings
+    separated by comma (or semicolon, if any item contains comma), the same
+    way other handlers store them.
+    File is read only up to the closing ``---`` (or ``...``) delimiter when
+    ``headers_only`` is set.
+    """
+
+    def __init__(self, path, **options):
+        super(FrontMatterHandler, self).__init__(path, **options)
+        self.default_extension = "md"
+
+    def _reset(self):
+        super(FrontMatterHandler, self)._reset()
+        self._started = False
+        self._skip_blank_line = False
+        self._key = None
+        self._items = None
+        self._block_style = None
+        self._block_lines = []
+
+    @staticmethod
+    def starts_front_matter(line):
+        """True if line, when it is first line of file, opens front matter"""
+        return line.startswith("---") and DELIMITER_RE.match(line) is not None
+
+    def _parse_line(self, line):
+        if self.headers_complete:
+            if self._skip_blank_line:
+                self._skip_blank_line = False
+                if not line.strip():
+                    return
+            self._post_content.append(line)
+            return
+
+        if not self._started:
+            self._started = True
+            if self.starts_front_matter(line):
+                # new metadata of empty front matter goes after delimiter
+                self._header_end = len(self._raw_content)
+                return
+            # not a front matter - everything is content
+            self.headers_complete = True
+            self._post_content.append(line)
+            return
+
+        if DELIMITER_RE.match(line):
+            self._finish_value()
+            self.headers_complete = True
+            self._skip_blank_line = True
+            return
+
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            if self._block_style:
+                self._block_lines.append("")
+            return
+
+        m1 = KEY_RE.match(line)
+        if m1:
+            self._finish_value()
+            self._key = m1.group("key").lower()
+            self._mark_header(self._key)
+            value = m1.group("value") or ""
+            self._items = None
+            self._block_style = None
+            self._block_lines = []
+            if value.startswith("[") and value.endswith("]"):
+                self._items = _split_flow_list(value)
+            elif value in ["|", ">", "|-", ">-"]:
+                self._block_style = value[0]
+            else:
+                self.headers[self._key] = _unquote(value)
+            return
+
+        key = self._key
+        if key is None:
+            return
+        self._mark_header(key)
+
+        if self._block_style:
+            self._block_lines.append(stripped)
+            return
+
+        m2 = LIST_ITEM_RE.match(line)
+        if m2 and not self.headers.get(key):
+            if self._items is None:
+                self._items = []
+            self._items.append(_unquote(m2.group("value")))
+            return
+
+        # continuation of plain scalar
+        self.headers[key] = "{} {}".format(self.headers.get(key, ""), stripped).strip()
+
+    def _finish_headers(self):
+        self._finish_value()
+
+    def _finish_value(self):
+        if self._key is None:
+            return
+        if self._items is not None:
+            self.headers[self._key] = _join_list(self._items)
+        elif self._block_style:
+            separator = "\n" if self._block_style == "|" else " "
+            self.headers[self._key] = separator.join(self._block_lines).strip()
+
+    def _formatted_header(self, key):
+        value = self.headers[key]
+        if key in LIST_KEYS:
+            separator = ";" if ";" in value else ","
+            items = [
+                _quote(item.strip(), in_list=True)
+                for item in value.split(separator)
+                if item.strip()
+            ]
+            return "{}: [{}]".format(key, ", ".join(items))
+        return "{}: {}".format(key, _quote(value))
+
+    @property
+    def formatted_headers(self):
+        output = ["---"]
+        for key in self._ordered_keys():
+            output.append(self._formatted_header(key))
+        output.append("---")
+
+        return "\n".join(output)
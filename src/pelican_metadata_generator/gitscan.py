@@ -0,0 +1,68 @@
+import os
+import logging
+import subprocess
+
+
+def _git(path, *args):
+    """Runs git command in directory; returns its output, or None if it failed"""
+    try:
+        result = subprocess.run(
+            ["git", "-C", path] + list(args),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError) as e:
+        logging.debug("git {args} failed in {path}: {error}".format(args=args, path=path, error=e))
+        return None
+    return result.stdout
+
+
+def _paths(path, output):
+    """Converts NUL-separated list of paths relative to directory into absolute paths"""
+    return [
+        os.path.normpath(os.path.join(path, name))
+        for name in output.decode("utf-8", "surrogateescape").split("\0")
+        if name
+    ]
+
+
+def is_work_tree(path):
+    """True if directory is inside git work tree"""
+    output = _git(path, "rev-parse", "--is-inside-work-tree")
+    return output is not None and output.strip() == b"true"
+
+
+def head_commit(path):
+    """Returns identifier of commit checked out in directory, or None"""
+    output = _git(path, "rev-parse", "--verify", "--quiet", "HEAD")
+    if not output:
+        return None
+    return output.decode("ascii").strip()
+
+
+def list_files(path):
+    """Returns absolute paths of tracked and untracked, not ignored files in directory
+
+    Returns None if list can't be obtained from git.
+    """
+    output = _git(path, "ls-files", "-z", "--cached", "--others", "--exclude-standard")
+    if output is None:
+        return None
+    # files deleted from work tree but not from index are listed, too
+    return [name for name in _paths(path, output) if os.path.lexists(name)]
+
+
+def changed_files(path, commit):
+    """Returns absolute paths of files in directory that might differ from commit
+
+    These are files changed (or deleted) since commit, either in later
+    commits or in work tree, and all untracked, not ignored files.
+    Returns None if list can't be obtained from git.
+    """
+    diff = _git(path, "diff", "-z", "--name-only", "--relative", "--no-renames", commit, "--")
+    untracked = _git(path, "ls-files", "-z", "--others", "--exclude-standard")
+    if diff is None or untracked is None:
+        return None
+    return sorted(set(_paths(path, diff)) | set(_paths(path, untracked)))
@@ -0,0 +1,305 @@
+import re
+import html
+import shutil
+from html.parser import HTMLParser
+
+from pelican_metadata_generator.file_handler import AbstractFileHandler
+
+# value of content attribute in <meta> start tag
+CONTENT_RE = re.compile(r"""(?<![\w-])content\s*=\s*("[^"]*"|'[^']*'|[^\s"'=<>`]+)""", re.I)
+
+
+class _Element:
+    """Position of metadata element in file
+
+    Attributes
+    ----------
+    start, end
+        Offsets of whole element in file content
+    value_start, value_end
+        Offsets of part of element that holds value (text of <title>,
+        quoted content attribute of <meta>)
+    value
+        Value that was read from element
+    """
+
+    def __init__(self, start, end, value_start, value_end, value):
+        self.start = start
+        self.end = end
+        self.value_start = value_start
+        self.value_end = value_end
+        self.value = value
+
+
+class _HeadParser(HTMLParser):
+    """Collects <title> and <meta> values until </head> is reached
+
+    Parameters
+    ----------
+    headers
+        Dictionary that values are stored in
+    offset
+        Function converting (line number, offset in line) position
+        reported by parser to offset in file content
+
+    Attributes
+    ----------
+    elements
+        Dictionary mapping header name to ``_Element`` it was read from
+    head_start
+        Offset after ``<head>`` start tag, None if there is no such tag
+    html_start
+        Offset after ``<html>`` start tag or doctype, None if there is none
+    insert_position
+        Offset of tag that ends head section (``</head>`` or ``<body>``),
+        None if head section was not ended
+    """
+
+    def __init__(self, headers, offset):
+        super(_HeadParser, self).__init__(convert_charrefs=True)
+        self.headers = headers
+        self.elements = {}
+        self.head_end = None
+        self.head_start = None
+        self.html_start = None
+        self.insert_position = None
+        self._offset = offset
+        self._in_title = False
+        self._title = []
+        self._title_start = None
+
+    def _position(self):
+        return self._offset(*self.getpos())
+
+    def handle_starttag(self, tag, attrs):
+        if self.head_end:
+            return
+        start = self._position()
+        end = start + len(self.get_starttag_text())
+        if tag == "title":
+            self._in_title = True
+            self._title_start = (start, end)
+        elif tag == "meta":
+            attrs = dict(attrs)
+            name = (attrs.get("name") or "").lower().strip()
+            if name and attrs.get("content") is not None:
+                if name == "keywords":
+                    name = "tags"
+                self.headers[name] = attrs["content"].strip()
+                match = CONTENT_RE.search(self.get_starttag_text())
+                if match:
+                    self.elements[name] = _Element(
+                        start,
+                        end,
+                        start + match.start(1),
+                        start + match.end(1),
+                        self.headers[name],
+                    )
+        elif tag == "head":
+            self.head_start = end
+        elif tag == "html":
+            self.html_start = end
+        elif tag == "body":
+            self._finish(before_tag=True)
+
+    def handle_decl(self, decl):
+        if self.html_start is None:
+            self.html_start = self._position() + len("<!{}>".format(decl))
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if self.head_end:
+            return
+        if tag == "title" and self._in_title:
+            self._in_title = False
+            title = " ".join("".join(self._title).split())
+            if title:
+                self.headers["title"] = title
+                start, text_start = self._title_start
+                text_end = self._position()
+                # end of </title> tag is found when file is written
+                self.elements["title"] = _Element(start, None, text_start, text_end, title)
+        elif tag == "head":
+            self._finish(before_tag=False)
+
+    def handle_data(self, data):
+        if self._in_title:
+            self._title.append(data)
+
+    def _finish(self, before_tag):
+        lineno, offset = self.getpos()
+        self.head_end = (lineno, offset, before_tag)
+        self.insert_position = self._position()
+
+
+class HTMLHandler(AbstractFileHandler):
+    """HTML metadata parser
+
+    Metadata is read from ``<title>`` and ``<meta name="..." content="...">``
+    elements, the same way Pelican does. Content is fed to incremental
+    parser line by line, so when ``headers_only`` is set, nothing after
+    ``</head>`` is read.
+
+    When file is written, only values of elements whose metadata changed
+    are replaced, elements of removed metadata are removed and new
+    elements are added at the end of head section. Rest of file (doctype,
+    other head elements, formatting) is written as it was read.
+    """
+
+    def __init__(self, path, **options):
+        super(HTMLHandler, self).__init__(path, **options)
+        self.default_extension = "html"
+
+    def _reset(self):
+        super(HTMLHandler, self)._reset()
+        self._parser = _HeadParser(self.headers, self._offset)
+        self._lineno = 0
+        self._line_starts = [0]
+
+    def _offset(self, lineno, offset):
+        return self._line_starts[lineno - 1] + offset
+
+    def _parse_line(self, line):
+        self._lineno += 1
+
+        if self.headers_complete:
+            self._post_content.append(line)
+            return
+
+        self._line_starts.append(self._line_starts[-1] + len(line))
+        self._parser.feed(line)
+        if self._parser.head_end:
+            self.headers_complete = True
+            start = self._content_start(line, self._lineno, *self._parser.head_end)
+            self._post_content.append(line[start:])
+
+    def _finish_headers(self):
+        self._parser.close()
+
+    @staticmethod
+    def _content_start(line, lineno, tag_lineno, tag_offset, before_tag):
+        """Returns position in line where content after head section starts"""
+        # tag might have started in one of previous lines
+        start = tag_offset if tag_lineno == lineno else 0
+        if before_tag:
+            return start
+        return line.find(">", start) + 1
+
+    def _formatted_elements(self, keys):
+        output = []
+        if "title" in keys:
+            output.append("<title>{}</title>".format(html.escape(self.headers["title"])))
+
+        for key in keys:
+            if key != "title":
+                output.append(
+                    '<meta name="{}" content="{}" />'.format(key, html.escape(self.headers[key]))
+                )
+        return output
+
+    @property
+    def formatted_headers(self):
+        output = ["<html>", "<head>"]
+        output.extend(self._formatted_elements(self._ordered_keys()))
+        output.append("</head>")
+
+        return "\n".join(output)
+
+    def prepend_headers_stream(self, stream_handle, remaining=None):
+        """Adds metadata elements at the end of head section (leaving
+        existing elements as-is). See ``AbstractFileHandler.prepend_headers_stream``.
+        """
+        self._write_stream(stream_handle, remaining, replace=False)
+
+    def overwrite_headers_stream(self, stream_handle, remaining=None):
+        """Updates metadata elements in head section, keeping rest of file
+        unchanged. See ``AbstractFileHandler.overwrite_headers_stream``.
+        """
+        self._write_stream(stream_handle, remaining, replace=True)
+
+    def edit_headers_stream(self, stream_handle, changes, remaining=None):
+        """Changes given metadata values in head section, keeping rest of file
+        unchanged. See ``AbstractFileHandler.edit_headers_stream``.
+        """
+        self._update_headers(changes)
+        self._write_stream(stream_handle, remaining, replace=True)
+
+    def _write_stream(self, stream_handle, remaining, replace):
+        if not self.raw_content and remaining is None:
+            stream_handle.write(self.formatted_headers)
+            stream_handle.write("\n</html>\n")
+            return
+
+        head_size = len(self.raw_content) - len(self.post_content)
+        stream_handle.write(self._edited_head(self.raw_content[:head_size], replace))
+        stream_handle.write(self.post_content)
+        if remaining is not None:
+            shutil.copyfileobj(remaining, stream_handle)
+
+    def _edited_head(self, head, replace):
+        """Returns part of file before content with metadata elements updated"""
+        elements = self._parser.elements if replace else {}
+        edits = []
+        for key, element in elements.items():
+            if key not in self.headers:
+                start, end = self._element_span(head, element)
+                edits.append((start, end, ""))
+            elif self.headers[key] != element.value:
+                value = html.escape(self.headers[key])
+                if key != "title":
+                    value = '"{}"'.format(value)
+                edits.append((element.value_start, element.value_end, value))
+
+        new_keys = [key for key in self._ordered_keys() if key not in elements]
+        if new_keys:
+            edits.append(self._insertion(head, self._formatted_elements(new_keys)))
+
+        for start, end, text in sorted(edits, reverse=True):
+            head = head[:start] + text + head[end:]
+        return head
+
+    @staticmethod
+    def _element_span(head, element):
+        """Returns span of element, including its line if nothing else is there"""
+        start = element.start
+        end = element.end
+        if end is None:
+            end = head.find(">", element.value_end) + 1
+        line_start = head.rfind("\n", 0, start) + 1
+        line_end = head.find("\n", end)
+        if line_end != -1 and not (head[line_start:start] + head[end:line_end]).strip():
+            return line_start, line_end + 1
+        return start, end
+
+    def _insertion(self, head, elements):
+        """Returns (start, end, text) edit that adds elements to head section"""
+        parser = self._parser
+        position = parser.insert_position
+        if position is None:
+            position = len(head)
+        if parser.head_start is None:
+            # there is no head section, it is created before <body>
+            if parser.insert_position is None:
+                position = parser.html_start or 0
+            elements = ["<head>"] + elements + ["</head>"]
+
+        line_start = head.rfind("\n", 0, position) + 1
+        indent = head[line_start:position]
+        if indent.strip():
+            if not head.startswith("\n", position):
+                # tag is not at beginning of line
+                return position, position, "".join(elements)
+            # after tag that ends line, like <html>
+            line_start = position + 1
+            indent = ""
+
+        if parser.elements:
+            last = max(element.start for element in parser.elements.values())
+            last_line_start = head.rfind("\n", 0, last) + 1
+            element_indent = head[last_line_start:last]
+            if not element_indent.strip():
+                indent = element_indent
+        text = "".join(indent + element + "\n" for element in elements)
+        return line_start, line_start, text
@@ -0,0 +1,124 @@
+import json
+import math
+import time
+import array
+import contextlib
+
+PERCENTILES = (50, 95, 99)
+# latencies below that land in the first bucket
+MIN_LATENCY_NS = 1000
+# every bucket is that much wider than previous one, so percentiles are
+# accurate to about 5% no matter how long interactions take
+BUCKET_GROWTH = 1.1
+BUCKETS = 300
+
+_LOG_GROWTH = math.log(BUCKET_GROWTH)
+
+
+class LatencyHistogram:
+    """Counts of latencies in logarithmic buckets
+
+    Memory used by histogram does not depend on number of samples, so it
+    can be kept for whole session.
+
+    Attributes
+    ----------
+    count
+        Number of samples
+    total_ns
+        Sum of all samples, in nanoseconds
+    max_ns
+        Longest sample, in nanoseconds
+    """
+
+    def __init__(self):
+        self.counts = array.array("q", [0]) * BUCKETS
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def add(self, latency_ns):
+        if latency_ns <= MIN_LATENCY_NS:
+            index = 0
+        else:
+            index = int(math.log(latency_ns / MIN_LATENCY_NS) / _LOG_GROWTH) + 1
+        self.counts[min(index, BUCKETS - 1)] += 1
+        self.count += 1
+        self.total_ns += latency_ns
+        self.max_ns = max(self.max_ns, latency_ns)
+
+    def percentile(self, percent):
+        """Returns upper bound of latency (in nanoseconds) of given percent of samples"""
+        if not self.count:
+            return 0
+        rank = math.ceil(self.count * percent / 100)
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(int(MIN_LATENCY_NS * BUCKET_GROWTH**index), self.max_ns)
+        return self.max_ns
+
+
+class LatencyRecorder:
+    """Measures how long named interactions take
+
+    Parameters
+    ----------
+    clock
+        Function returning monotonic time in nanoseconds.
+
+    Attributes
+    ----------
+    histograms
+        Dictionary mapping interaction name to its ``LatencyHistogram``
+    """
+
+    def __init__(self, clock=time.monotonic_ns):
+        self.histograms = {}
+        self._clock = clock
+
+    @contextlib.contextmanager
+    def measure(self, name):
+        """Context manager that records time spent inside it as latency of interaction"""
+        start = self._clock()
+        try:
+            yield
+        finally:
+            self.add(name, self._clock() - start)
+
+    def add(self, name, latency_ns):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = LatencyHistogram()
+        histogram.add(latency_ns)
+
+    def summary(self):
+        """Returns dictionary mapping interaction name to its statistics in milliseconds"""
+        summary = {}
+        for name, histogram in self.histograms.items():
+            stats = {
+                "count": histogram.count,
+                "mean_ms": histogram.total_ns / histogram.count / 10**6,
+                "max_ms": histogram.max_ns / 10**6,
+            }
+            for percent in PERCENTILES:
+                stats["p{}_ms".format(percent)] = histogram.percentile(percent) / 10**6
+            summary[name] = stats
+        return summary
+
+    def status(self, name):
+        """Returns one-line description of latency of interaction"""
+        histogram = self.histograms[name]
+        percentiles = ", ".join(
+            "p{} {:.1f}".format(percent, histogram.percentile(percent) / 10**6)
+            for percent in PERCENTILES
+        )
+        return "{name}: {percentiles} ms ({count} events)".format(
+            name=name, percentiles=percentiles, count=histogram.count
+        )
+
+    def dump(self, path):
+        """Saves ``summary`` as JSON file"""
+        with open(path, "w") as fh:
+            json.dump(self.summary(), fh, indent=2, sort_keys=True)
@@ -0,0 +1,567 @@
+import re
+import json
+import bisect
+import logging
+import pathlib
+import urllib.parse
+import urllib.request
+
+import pelican_metadata_generator.file_handler
+
+# metadata keys that are offered for completion and validated
+VALUE_KEYS = {
+    "category": "category",
+    "series": "series",
+    "tags": "tags",
+    "authors": "authors",
+    "author": "authors",
+}
+LIST_KEYS = ["tags", "authors"]
+KEY_NAMES = {"category": "category", "series": "series", "tags": "tag", "authors": "author"}
+
+SUPPORTED_FORMATS = ["markdown", "restructuredtext", "yaml-front-matter"]
+
+# key line of Markdown ("Tags: a"), reStructuredText (":tags: a") and YAML ("tags: [a")
+KEY_LINE_RE = re.compile(r"^[ ]{0,3}:?(?P<key>[A-Za-z0-9_-]+):(?:\s+|$)")
+# characters that may precede value on YAML lines
+VALUE_START_CHARS = " \t[-\"'"
+
+COMPLETION_LIMIT = 50
+
+# JSON-RPC and LSP constants
+PARSE_ERROR = -32700
+METHOD_NOT_FOUND = -32601
+INTERNAL_ERROR = -32603
+SERVER_NOT_INITIALIZED = -32002
+SYNC_FULL = 1
+COMPLETION_KIND_VALUE = 12
+SEVERITY_WARNING = 2
+SEVERITY_INFORMATION = 3
+
+
+class ValueIndex:
+    """Sorted index of known values of single metadata key
+
+    Values are kept sorted by case-folded form, so values starting with
+    given prefix are found by binary search and completion time depends on
+    number of returned items, not on number of known values.
+    """
+
+    def __init__(self, values=()):
+        self._rebuild(values)
+
+    def _rebuild(self, values):
+        entries = sorted({(value.casefold(), value) for value in values})
+        self._folded = [folded for folded, _ in entries]
+        self._values = [value for _, value in entries]
+        self._known = set(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __contains__(self, value):
+        return value in self._known
+
+    def add(self, value):
+        """Adds value to index; does nothing if value is already known"""
+        if value in self._known:
+            return
+        folded = value.casefold()
+        low = bisect.bisect_left(self._folded, folded)
+        high = bisect.bisect_right(self._folded, folded, low)
+        position = bisect.bisect_left(self._values, value, low, high)
+        self._folded.insert(position, folded)
+        self._values.insert(position, value)
+        self._known.add(value)
+
+    def update(self, values):
+        """Adds values to index
+
+        Few values are inserted in place; many values are merged by sorting
+        index again, which is faster than inserting them one by one.
+        """
+        new_values = [value for value in values if value not in self._known]
+        if len(new_values) <= 16:
+            for value in new_values:
+                self.add(value)
+            return
+        self._rebuild(self._values + new_values)
+
+    def find_similar(self, value):
+        """Returns known value that differs from value only in letter case, or None"""
+        folded = value.casefold()
+        position = bisect.bisect_left(self._folded, folded)
+        if position < len(self._folded) and self._folded[position] == folded:
+            return self._values[position]
+        return None
+
+    def complete(self, prefix, limit=COMPLETION_LIMIT):
+        """Returns list of known values starting with prefix (ignoring case)
+
+        Parameters
+        ----------
+        prefix
+            Beginning of value.
+        limit
+            Maximum number of returned values.
+
+        Returns
+        -------
+        Tuple of list of values and boolean telling if list is incomplete.
+        """
+        folded = prefix.casefold()
+        position = bisect.bisect_left(self._folded, folded)
+        matches = []
+        while position < len(self._folded) and self._folded[position].startswith(folded):
+            if len(matches) == limit:
+                return matches, True
+            matches.append(self._values[position])
+            position += 1
+        return matches, False
+
+
+def read_message(stream):
+    """Reads single JSON-RPC message from binary stream
+
+    Returns
+    -------
+    Decoded message, or None if stream has ended.
+    """
+    content_length = None
+    while True:
+        line = stream.readline()
+        if not line:
+            return None
+        line = line.strip()
+        if not line:
+            break
+        name, _, value = line.decode("ascii").partition(":")
+        if name.strip().lower() == "content-length":
+            content_length = int(value)
+
+    if content_length is None:
+        raise ValueError("Message without Content-Length header")
+    return json.loads(stream.read(content_length).decode("utf-8"))
+
+
+def write_message(stream, message):
+    """Writes single JSON-RPC message into binary stream"""
+    body = json.dumps(message, ensure_ascii=False).encode("utf-8")
+    stream.write("Content-Length: {}\r\n\r\n".format(len(body)).encode("ascii"))
+    stream.write(body)
+    stream.flush()
+
+
+def uri_to_path(uri):
+    """Returns local path of file: URI, or empty string for other URIs"""
+    parsed = urllib.parse.urlparse(uri)
+    if parsed.scheme != "file":
+        return ""
+    return urllib.request.url2pathname(parsed.path)
+
+
+def path_to_uri(path):
+    return pathlib.Path(path).absolute().as_uri()
+
+
+def _utf16_length(text):
+    return len(text.encode("utf-16-le")) // 2
+
+
+def _from_utf16_offset(line, offset):
+    """Converts LSP character offset (in UTF-16 code units) into string index"""
+    if line.isascii():
+        return min(offset, len(line))
+    units = 0
+    for index, char in enumerate(line):
+        if units >= offset:
+            return index
+        units += 2 if ord(char) > 0xFFFF else 1
+    return len(line)
+
+
+def _to_utf16_offset(line, index):
+    return _utf16_length(line[:index])
+
+
+def _trim_value(line, start, end):
+    """Returns value between start and end, without surrounding list markers and quotes"""
+    while start < end and line[start] in " \t":
+        start += 1
+    if line.startswith("- ", start) or line[start:end] == "-":
+        start += 1
+    while start < end and line[start] in " \t[\"'":
+        start += 1
+    while end > start and line[end - 1] in " \t]\"'":
+        end -= 1
+    return line[start:end], start, end
+
+
+class Document:
+    """Post opened in editor
+
+    Attributes
+    ----------
+    uri
+        Document URI
+    path
+        Local path of document (empty string if it is not local file)
+    lines
+        Document text, split into lines
+    file_format
+        Format of post, or None if it is not supported
+    header_end
+        Number of first line that is not part of metadata
+    """
+
+    def __init__(self, uri, text):
+        self.uri = uri
+        self.path = uri_to_path(uri)
+        self.set_text(text)
+
+    def set_text(self, text):
+        self.lines = [line.rstrip("\r") for line in text.split("\n")]
+        self.file_format = self._detect_format()
+        self.header_end = self._find_header_end()
+
+    def _detect_format(self):
+        try:
+            file_format = pelican_metadata_generator.file_handler.Factory(self.path).file_format
+        except NotImplementedError:
+            return None
+
+        # file on disk might differ from editor buffer
+        if file_format in ["markdown", "yaml-front-matter"]:
+            handler = pelican_metadata_generator.file_handler.get_handler("yaml-front-matter")
+            return "yaml-front-matter" if handler.starts_front_matter(self.lines[0]) else "markdown"
+        if file_format not in SUPPORTED_FORMATS:
+            return None
+        return file_format
+
+    def _find_header_end(self):
+        if not self.file_format:
+            return 0
+
+        handler = pelican_metadata_generator.file_handler.get_handler(self.file_format)
+        post = handler("", headers_only=True)
+        for number, line in enumerate(self.lines):
+            post.feed_line(line + "\n")
+            if post.headers_complete:
+                return number
+        return len(self.lines)
+
+    def header_values(self):
+        """Yields metadata values that are offered for completion
+
+        Yields
+        ------
+        Tuples of key name, line number and list of (value, start, end)
+        tuples, where start and end are string indexes in line.
+        """
+        for number, key, start in self._header_lines():
+            line = self.lines[number]
+            yield key, number, self._split_items(line, start, key in LIST_KEYS)
+
+    def value_at(self, number, index):
+        """Returns key name and value being typed at given position
+
+        Returns
+        -------
+        Tuple of key name, beginning of value and its start index, or None
+        if position is not inside value offered for completion.
+        """
+        if number >= self.header_end:
+            return None
+
+        for line_number, key, start in self._header_lines(until=number):
+            if line_number != number or index < start:
+                continue
+            line = self.lines[number]
+            value_start = start
+            if key in LIST_KEYS:
+                separator = ";" if ";" in line[start:] else ","
+                value_start = max(line.rfind(separator, start, index) + 1, value_start)
+            while value_start < index and line[value_start] in VALUE_START_CHARS:
+                value_start += 1
+            return key, line[value_start:index], value_start
+        return None
+
+    def _header_lines(self, until=None):
+        """Yields number, key name and value start index of lines with known keys"""
+        last = self.header_end if until is None else min(until + 1, self.header_end)
+        key = None
+        for number in range(last):
+            line = self.lines[number]
+            m1 = KEY_LINE_RE.match(line)
+            if m1:
+                key = VALUE_KEYS.get(m1.group("key").lower())
+                start = m1.end()
+            elif key and line[:1] in [" ", "\t", "-"]:
+                # continuation of previous line
+                start = 0
+            else:
+                key = None
+            if key:
+                yield number, key, start
+
+    @staticmethod
+    def _split_items(line, start, is_list):
+        if not is_list:
+            value = _trim_value(line, start, len(line))
+            return [value] if value[0] else []
+
+        separator = ";" if ";" in line[start:] else ","
+        items = []
+        while True:
+            end = line.find(separator, start)
+            if end == -1:
+                end = len(line)
+            value = _trim_value(line, start, end)
+            if value[0]:
+                items.append(value)
+            if end == len(line):
+                return items
+            start = end + 1
+
+
+class LanguageServer:
+    """Language Server Protocol server offering known metadata values
+
+    Server keeps ``MetadataDatabase`` in memory, completes category,
+    series, tag and author values inside metadata of Markdown and
+    reStructuredText posts and reports unknown and duplicated values.
+    Metadata of saved files is read again, so values introduced in one
+    post are offered in next ones.
+
+    Parameters
+    ----------
+    database
+        ``MetadataDatabase`` with known values.
+    input_stream
+        Binary stream that messages are read from.
+    output_stream
+        Binary stream that messages are written to.
+    """
+
+    def __init__(self, database, input_stream, output_stream):
+        self.database = database
+        self.input_stream = input_stream
+        self.output_stream = output_stream
+        self.documents = {}
+        self.indexes = {key: ValueIndex() for key in KEY_NAMES}
+        # list of values and number of its items already in index, per key
+        self._indexed = {key: (None, 0) for key in KEY_NAMES}
+        self.initialized = False
+        self.shutdown_requested = False
+        self.exit_code = None
+        self._requests = {
+            "initialize": self.initialize,
+            "shutdown": self.shutdown,
+            "textDocument/completion": self.completion,
+        }
+        self._notifications = {
+            "exit": self.exit,
+            "textDocument/didOpen": self.did_open,
+            "textDocument/didChange": self.did_change,
+            "textDocument/didSave": self.did_save,
+            "textDocument/didClose": self.did_close,
+        }
+        self.update_indexes()
+
+    def serve(self):
+        """Handles messages until exit notification; returns exit code"""
+        while self.exit_code is None:
+            try:
+                message = read_message(self.input_stream)
+            except ValueError as e:
+                logging.warning("Can't read message: {error}".format(error=e))
+                self._send_error(None, PARSE_ERROR, str(e))
+                continue
+            if message is None:
+                return 1
+            self.handle_message(message)
+        return self.exit_code
+
+    def handle_message(self, message):
+        method = message.get("method")
+        params = message.get("params") or {}
+
+        if "id" not in message:
+            handler = self._notifications.get(method)
+            if handler and (self.initialized or method == "exit"):
+                try:
+                    handler(params)
+                except Exception:
+                    logging.exception("Error while handling {method}".format(method=method))
+            return
+
+        if method is None:
+            # response to request - server does not send any
+            return
+
+        handler = self._requests.get(method)
+        if handler is None:
+            self._send_error(message["id"], METHOD_NOT_FOUND, "Unknown method: {}".format(method))
+        elif not self.initialized and method != "initialize":
+            self._send_error(message["id"], SERVER_NOT_INITIALIZED, "Server is not initialized")
+        else:
+            try:
+                result = handler(params)
+            except Exception as e:
+                logging.exception("Error while handling {method}".format(method=method))
+                self._send_error(message["id"], INTERNAL_ERROR, str(e))
+                return
+            response = {"jsonrpc": "2.0", "id": message["id"], "result": result}
+            write_message(self.output_stream, response)
+
+    def update_indexes(self):
+        """Adds values that database learned since last call to completion indexes
+
+        Index is built again if list of values was replaced or got shorter.
+        """
+        for key, index in self.indexes.items():
+            values = getattr(self.database, key)
+            indexed_values, indexed_count = self._indexed[key]
+            if values is not indexed_values or len(values) < indexed_count:
+                self.indexes[key] = ValueIndex(values)
+            else:
+                index.update(values[indexed_count:])
+            self._indexed[key] = (values, len(values))
+
+    def initialize(self, params):
+        root_path = uri_to_path(params.get("rootUri") or "")
+        if root_path and not self.database.path:
+            self.database.read_directory(root_path)
+            self.update_indexes()
+
+        self.initialized = True
+        return {
+            "capabilities": {
+                "textDocumentSync": {
+                    "openClose": True,
+                    "change": SYNC_FULL,
+                    "save": {"includeText": False},
+                },
+                "completionProvider": {"triggerCharacters": [":", ",", ";", " ", "["]},
+            },
+            "serverInfo": {"name": "pelican-metadata-generator"},
+        }
+
+    def shutdown(self, params):
+        self.shutdown_requested = True
+        return None
+
+    def exit(self, params):
+        self.exit_code = 0 if self.shutdown_requested else 1
+
+    def did_open(self, params):
+        document = params["textDocument"]
+        self.documents[document["uri"]] = Document(document["uri"], document["text"])
+        self._publish_diagnostics(document["uri"])
+
+    def did_change(self, params):
+        uri = params["textDocument"]["uri"]
+        if uri not in self.documents:
+            return
+        self.documents[uri].set_text(params["contentChanges"][-1]["text"])
+        self._publish_diagnostics(uri)
+
+    def did_save(self, params):
+        document = self.documents.get(params["textDocument"]["uri"])
+        if document is None or not document.path or not document.file_format:
+            return
+        self.database.read_file(document.path)
+        self.update_indexes()
+        for uri in self.documents:
+            self._publish_diagnostics(uri)
+
+    def did_close(self, params):
+        uri = params["textDocument"]["uri"]
+        if self.documents.pop(uri, None) is not None:
+            self._notify("textDocument/publishDiagnostics", {"uri": uri, "diagnostics": []})
+
+    def completion(self, params):
+        empty = {"isIncomplete": False, "items": []}
+        document = self.documents.get(params["textDocument"]["uri"])
+        if document is None or not document.file_format:
+            return empty
+
+        number = params["position"]["line"]
+        if number >= len(document.lines):
+            return empty
+        line = document.lines[number]
+        index = _from_utf16_offset(line, params["position"]["character"])
+        value = document.value_at(number, index)
+        if value is None:
+            return empty
+
+        key, prefix, value_start = value
+        used_values = set()
+        for line_key, _, items in document.header_values():
+            if line_key == key:
+                used_values.update(item[0] for item in items if item[0] != prefix)
+
+        matches, incomplete = self.indexes[key].complete(prefix)
+        edit_range = {
+            "start": {"line": number, "character": _to_utf16_offset(line, value_start)},
+            "end": {"line": number, "character": _to_utf16_offset(line, index)},
+        }
+        items = [
+            {
+                "label": match,
+                "kind": COMPLETION_KIND_VALUE,
+                "detail": KEY_NAMES[key],
+                "textEdit": {"range": edit_range, "newText": match},
+            }
+            for match in matches
+            if match not in used_values
+        ]
+        return {"isIncomplete": incomplete, "items": items}
+
+    def diagnostics(self, document):
+        """Returns list of LSP diagnostics of document metadata"""
+        diagnostics = []
+        seen = {}
+        for key, number, items in document.header_values():
+            line = document.lines[number]
+            name = KEY_NAMES[key]
+            for value, start, end in items:
+                message = None
+                severity = SEVERITY_INFORMATION
+                if value in seen.setdefault(key, set()):
+                    message = "Duplicate {} '{}'".format(name, value)
+                    severity = SEVERITY_WARNING
+                elif value not in self.indexes[key]:
+                    message = "Unknown {} '{}'".format(name, value)
+                    similar = self.indexes[key].find_similar(value)
+                    if similar:
+                        message = "{}, did you mean '{}'?".format(message, similar)
+                        severity = SEVERITY_WARNING
+                seen[key].add(value)
+                if message is None:
+                    continue
+                diagnostics.append(
+                    {
+                        "range": {
+                            "start": {"line": number, "character": _to_utf16_offset(line, start)},
+                            "end": {"line": number, "character": _to_utf16_offset(line, end)},
+                        },
+                        "severity": severity,
+                        "source": "pelican-metadata-generator",
+                        "message": message,
+                    }
+                )
+        return diagnostics
+
+    def _publish_diagnostics(self, uri):
+        diagnostics = self.diagnostics(self.documents[uri])
+        self._notify("textDocument/publishDiagnostics", {"uri": uri, "diagnostics": diagnostics})
+
+    def _notify(self, method, params):
+        write_message(self.output_stream, {"jsonrpc": "2.0", "method": method, "params": params})
+
+    def _send_error(self, message_id, code, message):
+        write_message(
+            self.output_stream,
+            {"jsonrpc": "2.0", "id": message_id, "error": {"code": code, "message": message}},
+        )
@@ -1,10 +1,24 @@
 import os
+import re
+import sys
+import bisect
+import time
+import asyncio
+import functools
+import array
+import calendar
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from PyQt5 import QtCore
 
+import pelican_metadata_generator.authors
 import pelican_metadata_generator.file_handler
+import pelican_metadata_generator.gitscan
+import pelican_metadata_generator.scanner
+import pelican_metadata_generator.slugs
+import pelican_metadata_generator.sources
+from pelican_metadata_generator.templates import FilenameTemplate
 
 
 class NewPostMetadata(QtCore.QObject):
@@ -30,10 +44,16 @@ class NewPostMetadata(QtCore.QObject):
         Post summary
     file_format
         File format. See pelican_metadata_generator.file_handler.Factory for supported file formats.
+    fallback_encoding
+        Encoding used to read existing file that is not valid UTF-8, like
+        ``MetadataDatabase.fallback_encoding``
+    filename_template
+        ``FilenameTemplate`` used to create file name
     """
 
     changed = QtCore.pyqtSignal()
     fileHasHeaders = QtCore.pyqtSignal()
+    fileChanged = QtCore.pyqtSignal(str)
 
     def __init__(self, filename_template):
         super(NewPostMetadata, self).__init__(None)
@@ -47,6 +67,9 @@ class NewPostMetadata(QtCore.QObject):
         self.authors = []
         self.summary = ""
         self.file_format = ""
+        self.fallback_encoding = None
+        if not isinstance(filename_template, FilenameTemplate):
+            filename_template = FilenameTemplate(filename_template)
         self.filename_template = filename_template
 
     @property
@@ -57,18 +80,7 @@ class NewPostMetadata(QtCore.QObject):
             .generate()
             .default_extension
         )
-        parsed_date = datetime.strptime(self.date, "%Y-%m-%d %H:%M:%S")
-        return self.filename_template.format(
-            year=parsed_date.year,
-            month=parsed_date.month,
-            day=parsed_date.day,
-            hour=parsed_date.hour,
-            minute=parsed_date.minute,
-            second=parsed_date.second,
-            category=self.category,
-            slug=self.slug,
-            ext=ext
-        )
+        return self.filename_template.format(self.date, self.category, self.slug, ext)
 
     def set_title(self, value):
         self.title = value
@@ -131,10 +143,14 @@ class NewPostMetadata(QtCore.QObject):
         Instead, controller is responsible for asking user what should
         be done and calling appropriate method directly (adding headers
         at top of file or overwriting existing metadata).
+
+        If file is changed by another program before it is written,
+        ``fileChanged`` is emitted and file is read again, so user is asked
+        again about new content.
         """
         self.file = pelican_metadata_generator.file_handler.Factory(
             filepath, self.file_format
-        ).generate()
+        ).generate(fallback_encoding=self.fallback_encoding)
 
         if self.file.has_metadata():
             self.fileHasHeaders.emit()
@@ -144,12 +160,20 @@ class NewPostMetadata(QtCore.QObject):
     def to_file_prepend_headers(self):
         """Adds metadata at top of file content (leaving existing metadata as-is)"""
         self.file.headers = self._format_headers_object()
-        self.file.prepend_headers()
+        self._write_file(self.file.prepend_headers)
 
     def to_file_overwrite_headers(self):
         """Adds metadata in place of existing metadata"""
         self.file.headers = self._format_headers_object()
-        self.file.overwrite_headers()
+        self._write_file(self.file.overwrite_headers)
+
+    def _write_file(self, write):
+        try:
+            write()
+        except pelican_metadata_generator.file_handler.FileChangedError as e:
+            logging.warning("Not saving file: {error}".format(error=e))
+            self.fileChanged.emit(self.file.path)
+            self.to_file(self.file.path)
 
     def _format_headers_object(self):
         """Prepares dictionary of metadata to inject in FileHandler subclass"""
@@ -180,6 +204,753 @@ class NewPostMetadata(QtCore.QObject):
         return file_.formatted_headers
 
 
+class SymbolTable:
+    """Assigns small integer identifiers to strings
+
+    Every distinct value is stored exactly once (and interned), no matter
+    how many posts refer to it. Identifiers are assigned in order of first
+    appearance, starting at 0.
+    """
+
+    def __init__(self):
+        self._ids = {}
+        self._values = []
+
+    def __len__(self):
+        return len(self._values)
+
+    def __contains__(self, value):
+        return value in self._ids
+
+    def intern(self, value):
+        """Returns identifier of value, adding value to table if necessary"""
+        symbol_id = self._ids.get(value)
+        if symbol_id is None:
+            value = sys.intern(value)
+            symbol_id = len(self._values)
+            self._ids[value] = symbol_id
+            self._values.append(value)
+        return symbol_id
+
+    def get(self, value, default=None):
+        """Returns identifier of value without adding it to table"""
+        return self._ids.get(value, default)
+
+    def lookup(self, symbol_id):
+        """Returns string represented by identifier"""
+        return self._values[symbol_id]
+
+
+class PostRecord:
+    """Compact representation of metadata of single existing post
+
+    Values shared between posts (category, series, tags and authors) are
+    stored as identifiers in ``SymbolTable`` owned by ``MetadataDatabase``.
+    Header names of remaining metadata are interned.
+
+    Note
+    ----
+    Records take less memory than dictionaries returned by
+    ``AbstractFileHandler.headers``, and the difference grows with number
+    of tags. ``pelican_metadata_generator.benchmark.measure_record_memory``
+    compares both on synthetic corpus: with 100 000 posts (Python 3.11)
+    records take about 614 bytes per post and dictionaries about 883 bytes,
+    so 1 000 000 posts take about 614 MB instead of 883 MB. Most of that
+    are strings unique to post (path, title, slug, date). To measure again,
+    run ``python -m pelican_metadata_generator.benchmark --record-memory
+    100000``.
+
+    Attributes
+    ----------
+    path
+        Path of post file
+    title
+        Post title
+    slug
+        Post slug, as written in file
+    date
+        Created date, as written in file
+    modified
+        Last modified date, as written in file
+    category
+        Symbol identifier of post category (or None)
+    series
+        Symbol identifier of post series (or None)
+    tags
+        Tuple of symbol identifiers of post tags
+    authors
+        Tuple of symbol identifiers of post authors
+    extra
+        Tuple of (name, value) pairs of remaining metadata
+    """
+
+    __slots__ = (
+        "path",
+        "title",
+        "slug",
+        "date",
+        "modified",
+        "category",
+        "series",
+        "tags",
+        "authors",
+        "extra",
+    )
+
+    def __init__(
+        self,
+        path,
+        title="",
+        slug="",
+        date="",
+        modified="",
+        category=None,
+        series=None,
+        tags=(),
+        authors=(),
+        extra=(),
+    ):
+        self.path = path
+        self.title = title
+        self.slug = slug
+        self.date = date
+        self.modified = modified
+        self.category = category
+        self.series = series
+        self.tags = tags
+        self.authors = authors
+        self.extra = extra
+
+    @classmethod
+    def from_headers(cls, path, headers, symbols):
+        """Creates record from ``AbstractFileHandler.headers`` dictionary
+
+        Parameters
+        ----------
+        path
+            Path of post file.
+        headers
+            Dictionary of post metadata.
+        symbols
+            ``SymbolTable`` that shared values should be stored in.
+        """
+        headers = dict(headers)
+        record = cls(path)
+        for key in ["title", "slug", "date", "modified"]:
+            setattr(record, key, headers.pop(key, ""))
+
+        for key in ["category", "series"]:
+            value = headers.pop(key, "").strip()
+            if value:
+                setattr(record, key, symbols.intern(value))
+
+        record.tags = cls._symbols_tuple(headers.pop("tags", ""), symbols)
+        authors = headers.pop("authors", "") or headers.pop("author", "")
+        headers.pop("author", None)
+        record.authors = cls._symbols_tuple(authors, symbols)
+
+        record.extra = tuple((sys.intern(key), value) for key, value in headers.items())
+        return record
+
+    @staticmethod
+    def _symbols_tuple(values, symbols):
+        values = pelican_metadata_generator.file_handler.split_values(values)
+        return tuple(symbols.intern(v) for v in values if v)
+
+    def to_headers(self, symbols):
+        """Returns post metadata as dictionary, as used by ``AbstractFileHandler``"""
+        headers = {}
+        for key in ["title", "slug", "date", "modified"]:
+            if getattr(self, key):
+                headers[key] = getattr(self, key)
+
+        for key in ["category", "series"]:
+            if getattr(self, key) is not None:
+                headers[key] = symbols.lookup(getattr(self, key))
+
+        for key in ["tags", "authors"]:
+            values = [symbols.lookup(symbol_id) for symbol_id in getattr(self, key)]
+            if values:
+                separator = "; " if any("," in v for v in values) else ", "
+                headers[key] = separator.join(values)
+
+        headers.update(self.extra)
+        return headers
+
+
+NO_SYMBOL = -1
+NO_DATE = -(2**63)
+SECONDS_PER_DAY = 24 * 60 * 60
+# largest time zone offset in use (UTC+14:00)
+MAX_UTC_OFFSET = 14 * 60 * 60
+
+EPOCH = datetime(1970, 1, 1)
+SECOND = timedelta(seconds=1)
+DATE_RE = re.compile(
+    r"(\d{4})[-/](\d{1,2})[-/](\d{1,2})"
+    r"(?:[ T](\d{1,2}):(\d{2})(?::(\d{2})(?:[.,]\d+)?)?)?"
+    r"\s*(Z|[+-]\d{2}:?\d{2})?$",
+    re.IGNORECASE,
+)
+# other formats that Pelican accepts and people actually use
+DATE_FORMATS = ("%d %B %Y", "%d %b %Y", "%B %d, %Y", "%b %d, %Y", "%d.%m.%Y", "%d.%m.%Y %H:%M")
+
+
+def _under_directory(directory):
+    """Returns function checking if path is directory itself or is inside it"""
+    prefix = os.path.join(directory, "")
+    return lambda path: path == directory or path.startswith(prefix)
+
+
+def _datetime_to_timestamp(parsed_date, wall_clock=False):
+    if parsed_date.tzinfo is None or wall_clock:
+        return (parsed_date.replace(tzinfo=None) - EPOCH) // SECOND
+    return int(parsed_date.timestamp())
+
+
+def date_to_timestamp(value, wall_clock=False):
+    """Converts date as written in post metadata into seconds since epoch
+
+    ISO 8601 dates are parsed by ``datetime.fromisoformat``, dates with
+    slashes, single-digit numbers or "Z" suffix by regular expression, and
+    only remaining values are tried against ``DATE_FORMATS``.
+    Dates without time zone are treated as UTC. Returns None if value
+    can't be parsed.
+
+    Parameters
+    ----------
+    value
+        Date as written in post metadata.
+    wall_clock
+        Ignore time zone offset, so returned time is date and time as
+        written (treated as UTC). Used to compare calendar days.
+    """
+    value = value.strip()
+    if not value:
+        return None
+
+    try:
+        return _datetime_to_timestamp(datetime.fromisoformat(value), wall_clock)
+    except ValueError:
+        pass
+
+    match = DATE_RE.match(value)
+    if match:
+        year, month, day, hour, minute, second = (int(part or 0) for part in match.groups()[:6])
+        if not 1 <= month <= 12 or not 1 <= day <= calendar.monthrange(year, month)[1]:
+            return None
+        if hour > 23 or minute > 59 or second > 59:
+            return None
+        timestamp = calendar.timegm((year, month, day, hour, minute, second))
+        offset = match.group(7)
+        if offset and offset.upper() != "Z" and not wall_clock:
+            offset = offset.replace(":", "")
+            minutes = int(offset[1:3]) * 60 + int(offset[3:5])
+            timestamp += -minutes * 60 if offset[0] == "+" else minutes * 60
+        return timestamp
+
+    for date_format in DATE_FORMATS:
+        try:
+            return _datetime_to_timestamp(datetime.strptime(value, date_format))
+        except ValueError:
+            continue
+    return None
+
+
+def timestamp_to_date(timestamp):
+    """Converts seconds since epoch into date in "YYYY-MM-DD hh:mm:ss" format (in UTC)"""
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(timestamp))
+
+
+class PostColumns:
+    """Column-oriented view of ``PostRecord`` values, used for corpus analytics
+
+    Each column is typed array with one item per post, so questions about
+    whole corpus are answered by scanning few flat buffers instead of
+    re-reading files.
+
+    Attributes
+    ----------
+    paths
+        List of post paths
+    date
+        Created dates as seconds since epoch (``NO_DATE`` if missing)
+    modified
+        Last modified dates as seconds since epoch (``NO_DATE`` if missing)
+    category
+        Category symbol identifiers (``NO_SYMBOL`` if missing)
+    series
+        Series symbol identifiers (``NO_SYMBOL`` if missing)
+    tag_offsets
+        Tags of post ``i`` are ``tag_ids[tag_offsets[i]:tag_offsets[i + 1]]``
+    tag_ids
+        Tag symbol identifiers of all posts
+
+    Note
+    ----
+    Queries by date use indexes of posts sorted by created date. Index is
+    built on first query (separately for every category that is asked
+    about) and kept sorted when posts are appended or replaced, so every
+    query takes logarithmic time.
+    """
+
+    def __init__(self):
+        self.paths = []
+        self.date = array.array("q")
+        self.modified = array.array("q")
+        self.category = array.array("q")
+        self.series = array.array("q")
+        self.tag_offsets = array.array("q", [0])
+        self.tag_ids = array.array("q")
+        self._date_indexes = {}
+
+    def __len__(self):
+        return len(self.paths)
+
+    @classmethod
+    def from_records(cls, records):
+        columns = cls()
+        for record in records:
+            columns.append(record)
+        return columns
+
+    def append(self, record):
+        """Adds values of ``PostRecord`` at the end of columns"""
+        for column in ["date", "modified"]:
+            timestamp = date_to_timestamp(getattr(record, column))
+            getattr(self, column).append(NO_DATE if timestamp is None else timestamp)
+
+        for column in ["category", "series"]:
+            symbol_id = getattr(record, column)
+            getattr(self, column).append(NO_SYMBOL if symbol_id is None else symbol_id)
+
+        self.paths.append(record.path)
+        self.tag_ids.extend(record.tags)
+        self.tag_offsets.append(len(self.tag_ids))
+        self._add_to_date_indexes(len(self.paths) - 1)
+
+    def replace(self, row, record):
+        """Replaces values in row with values of ``PostRecord``
+
+        Date indexes that were already built are updated for that row only.
+        """
+        self._remove_from_date_indexes(row)
+        for column in ["date", "modified"]:
+            timestamp = date_to_timestamp(getattr(record, column))
+            getattr(self, column)[row] = NO_DATE if timestamp is None else timestamp
+
+        for column in ["category", "series"]:
+            symbol_id = getattr(record, column)
+            getattr(self, column)[row] = NO_SYMBOL if symbol_id is None else symbol_id
+
+        self.paths[row] = record.path
+        start, end = self.tag_offsets[row], self.tag_offsets[row + 1]
+        self.tag_ids[start:end] = array.array("q", record.tags)
+        shift = len(record.tags) - (end - start)
+        if shift:
+            for i in range(row + 1, len(self.tag_offsets)):
+                self.tag_offsets[i] += shift
+        self._add_to_date_indexes(row)
+
+    def _add_to_date_indexes(self, row):
+        timestamp = self.date[row]
+        if timestamp == NO_DATE:
+            return
+        for category in {None, self.category[row]}:
+            index = self._date_indexes.get(category)
+            if index is not None:
+                dates, rows = index
+                position = bisect.bisect_right(dates, timestamp)
+                dates.insert(position, timestamp)
+                rows.insert(position, row)
+
+    def _remove_from_date_indexes(self, row):
+        timestamp = self.date[row]
+        if timestamp == NO_DATE:
+            return
+        for category in {None, self.category[row]}:
+            index = self._date_indexes.get(category)
+            if index is not None:
+                dates, rows = index
+                position = bisect.bisect_left(dates, timestamp)
+                while rows[position] != row:
+                    position += 1
+                del dates[position]
+                del rows[position]
+
+    def _date_index(self, category=None):
+        """Returns (dates, rows) of posts with created date, sorted by date"""
+        index = self._date_indexes.get(category)
+        if index is None:
+            rows = [
+                i
+                for i, timestamp in enumerate(self.date)
+                if timestamp != NO_DATE and (category is None or self.category[i] == category)
+            ]
+            rows.sort(key=self.date.__getitem__)
+            index = (array.array("q", [self.date[i] for i in rows]), array.array("q", rows))
+            self._date_indexes[category] = index
+        return index
+
+    def rows_between(self, start, end, category=None):
+        """Returns rows of posts created in [start, end) time range, ordered by date
+
+        Parameters
+        ----------
+        start, end
+            Seconds since epoch.
+        category
+            If given, only posts with that category symbol identifier are returned.
+        """
+        dates, rows = self._date_index(category)
+        return list(rows[bisect.bisect_left(dates, start):bisect.bisect_left(dates, end)])
+
+    def previous_row(self, timestamp, category=None):
+        """Returns row of latest post created before timestamp, or None
+
+        Parameters
+        ----------
+        timestamp
+            Seconds since epoch.
+        category
+            If given, only posts with that category symbol identifier are considered.
+        """
+        dates, rows = self._date_index(category)
+        position = bisect.bisect_left(dates, timestamp)
+        if not position:
+            return None
+        return rows[position - 1]
+
+    def posts_per_month(self, category=None):
+        """Returns dictionary mapping (year, month) to number of posts
+
+        Parameters
+        ----------
+        category
+            If given, only posts with that category symbol identifier are counted.
+        """
+        counts = {}
+        for i, timestamp in enumerate(self.date):
+            if timestamp == NO_DATE:
+                continue
+            if category is not None and self.category[i] != category:
+                continue
+            month = time.gmtime(timestamp)[:2]
+            counts[month] = counts.get(month, 0) + 1
+        return counts
+
+    def tag_usage_per_month(self, tag):
+        """Returns dictionary mapping (year, month) to number of posts with tag
+
+        Parameters
+        ----------
+        tag
+            Tag symbol identifier.
+        """
+        counts = {}
+        offsets = self.tag_offsets
+        for i, timestamp in enumerate(self.date):
+            if timestamp == NO_DATE:
+                continue
+            if tag not in self.tag_ids[offsets[i]:offsets[i + 1]]:
+                continue
+            month = time.gmtime(timestamp)[:2]
+            counts[month] = counts.get(month, 0) + 1
+        return counts
+
+
+class KnownValuesModel(QtCore.QAbstractListModel):
+    """Sorted list of known values of single metadata key, for use in views
+
+    Values are sorted ignoring letter case. New values are inserted in
+    place and announced with ``rowsInserted``, so views keep their current
+    item and nothing is rebuilt.
+    """
+
+    def __init__(self, values=(), parent=None):
+        super(KnownValuesModel, self).__init__(parent)
+        self._keys = []
+        self._values = []
+        self._set_values(values)
+
+    def _set_values(self, values):
+        entries = sorted({(value.lower(), value) for value in values})
+        self._keys = [key for key, _ in entries]
+        self._values = [value for _, value in entries]
+
+    def __len__(self):
+        return len(self._values)
+
+    def __contains__(self, value):
+        row = self._position(value)
+        return row < len(self._values) and self._values[row] == value
+
+    def values(self):
+        return list(self._values)
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._values)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._values):
+            return None
+        if role in (QtCore.Qt.DisplayRole, QtCore.Qt.EditRole):
+            return self._values[index.row()]
+        return None
+
+    def _position(self, value):
+        key = value.lower()
+        low = bisect.bisect_left(self._keys, key)
+        high = bisect.bisect_right(self._keys, key, low)
+        return bisect.bisect_left(self._values, value, low, high)
+
+    def add(self, value):
+        """Inserts value at its sorted position; does nothing if value is already known"""
+        if value in self:
+            return
+        row = self._position(value)
+        self.beginInsertRows(QtCore.QModelIndex(), row, row)
+        self._keys.insert(row, value.lower())
+        self._values.insert(row, value)
+        self.endInsertRows()
+
+    def remove(self, value):
+        """Removes value; does nothing if value is not known"""
+        if value not in self:
+            return
+        row = self._position(value)
+        self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+        del self._keys[row]
+        del self._values[row]
+        self.endRemoveRows()
+
+    def update(self, values):
+        """Makes model contain exactly given values, inserting and removing rows as needed"""
+        values = set(values)
+        for value in [value for value in self._values if value not in values]:
+            self.remove(value)
+        for value in values:
+            self.add(value)
+
+    def reset(self, values):
+        """Replaces all values at once"""
+        self.beginResetModel()
+        self._set_values(values)
+        self.endResetModel()
+
+
+# files modified shortly before scan started might have timestamp earlier
+# than scan start, because of filesystem timestamp granularity
+GIT_MTIME_MARGIN_NS = 2 * 10**9
+
+
+class PostTableModel(QtCore.QAbstractTableModel):
+    """Editable table of metadata of all posts known to MetadataDatabase, one row per post
+
+    Rows are given to views in batches, as they are scrolled to (see
+    ``fetchMore``), and metadata of row is converted to text only when
+    view asks for it, so table of tens of thousands of posts opens
+    instantly. Edited values are kept until ``save`` writes them. Only
+    posts read from local files can be edited; posts read from archives
+    or memory are read-only.
+
+    Parameters
+    ----------
+    database
+        ``MetadataDatabase``; table is reloaded every time it changes.
+
+    Attributes
+    ----------
+    dirty
+        Dictionary mapping path of every edited post to dictionary of
+        changed metadata values
+    """
+
+    COLUMNS = ("title", "date", "category", "tags", "series")
+    FETCH_SIZE = 500
+
+    dirtyChanged = QtCore.pyqtSignal(int)
+
+    def __init__(self, database, parent=None):
+        super(PostTableModel, self).__init__(parent)
+        self.database = database
+        self.dirty = {}
+        self._paths = []
+        self._fetched = 0
+        self._headers = {}
+        self._editable = {}
+        self._saving = False
+        database.changed.connect(self.reload)
+        self.reload()
+
+    def reload(self):
+        """Reads list of posts from database again, keeping edits of posts that still exist"""
+        if self._saving:
+            return
+        self.beginResetModel()
+        self._paths = sorted(self.database.posts)
+        self._fetched = min(self.FETCH_SIZE, len(self._paths))
+        self._headers = {}
+        self._editable = {}
+        self.dirty = {
+            path: values for path, values in self.dirty.items() if path in self.database.posts
+        }
+        self.endResetModel()
+        self.dirtyChanged.emit(len(self.dirty))
+
+    def path(self, row):
+        """Returns path of post in row"""
+        return self._paths[row]
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._fetched
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.COLUMNS)
+
+    def canFetchMore(self, parent):
+        return not parent.isValid() and self._fetched < len(self._paths)
+
+    def fetchMore(self, parent):
+        count = min(self.FETCH_SIZE, len(self._paths) - self._fetched)
+        if parent.isValid() or count <= 0:
+            return
+        self.beginInsertRows(QtCore.QModelIndex(), self._fetched, self._fetched + count - 1)
+        self._fetched += count
+        self.endInsertRows()
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if orientation == QtCore.Qt.Horizontal and role == QtCore.Qt.DisplayRole:
+            return self.COLUMNS[section].title()
+        return super(PostTableModel, self).headerData(section, orientation, role)
+
+    def flags(self, index):
+        flags = super(PostTableModel, self).flags(index)
+        if index.isValid() and self._isEditable(self._paths[index.row()]):
+            flags |= QtCore.Qt.ItemIsEditable
+        return flags
+
+    def _isEditable(self, path):
+        editable = self._editable.get(path)
+        if editable is None:
+            # posts read from archives and memory don't have local file
+            editable = self._editable[path] = os.path.isfile(path)
+        return editable
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        path = self._paths[index.row()]
+        if role == QtCore.Qt.ToolTipRole:
+            return path
+        if role not in (QtCore.Qt.DisplayRole, QtCore.Qt.EditRole):
+            return None
+
+        key = self.COLUMNS[index.column()]
+        edited = self.dirty.get(path, {})
+        if key in edited:
+            return edited[key]
+        return self._postHeaders(path).get(key, "")
+
+    def setData(self, index, value, role=QtCore.Qt.EditRole):
+        if not index.isValid() or role != QtCore.Qt.EditRole:
+            return False
+
+        path = self._paths[index.row()]
+        if not self._isEditable(path):
+            return False
+        key = self.COLUMNS[index.column()]
+        value = value.strip()
+        edited = self.dirty.setdefault(path, {})
+        if value == self._postHeaders(path).get(key, ""):
+            edited.pop(key, None)
+        else:
+            edited[key] = value
+        if not edited:
+            del self.dirty[path]
+
+        self.dataChanged.emit(index, index, [QtCore.Qt.DisplayRole, QtCore.Qt.EditRole])
+        self.dirtyChanged.emit(len(self.dirty))
+        return True
+
+    def save(self):
+        """Writes edited metadata into files
+
+        Every file is read fully again just before it is written, and only
+        lines of edited values are replaced (see ``edit_headers``); other
+        metadata and content are written as they were. File changed by
+        another program since it was read is not overwritten, and file
+        removed since then is not created again. Database is updated once,
+        after all files are written, and only rows of saved posts are
+        updated in views.
+
+        Returns
+        -------
+        Dictionary mapping path of every file that could not be saved to
+        error message. These files keep their edits.
+        """
+        errors = {}
+        saved = []
+        for path, edited in list(self.dirty.items()):
+            try:
+                post = pelican_metadata_generator.file_handler.Factory(path).generate(
+                    fallback_encoding=self.database.fallback_encoding
+                )
+                if not post.exists:
+                    # file was removed after it was read; don't create it again
+                    raise FileNotFoundError("{} does not exist anymore".format(path))
+                post.edit_headers(edited)
+            except (
+                OSError,
+                UnicodeDecodeError,
+                NotImplementedError,
+                pelican_metadata_generator.file_handler.FileChangedError,
+            ) as e:
+                logging.warning("Can't save {file}: {error}".format(file=path, error=e))
+                errors[path] = str(e)
+                continue
+            del self.dirty[path]
+            saved.append(path)
+
+        if saved:
+            self._saving = True
+            try:
+                self.database.read_files(saved)
+            finally:
+                self._saving = False
+            self._updateRows(saved)
+        self.dirtyChanged.emit(len(self.dirty))
+        return errors
+
+    def _updateRows(self, paths):
+        """Shows metadata of posts read again, keeping rows (and view position) in place"""
+        if len(self.database.posts) != len(self._paths) or not all(
+            path in self.database.posts for path in paths
+        ):
+            self.reload()
+            return
+
+        last_column = len(self.COLUMNS) - 1
+        for path in paths:
+            self._headers.pop(path, None)
+            row = bisect.bisect_left(self._paths, path)
+            if row < self._fetched:
+                self.dataChanged.emit(self.index(row, 0), self.index(row, last_column))
+
+    def _postHeaders(self, path):
+        headers = self._headers.get(path)
+        if headers is None:
+            headers = self.database.posts[path].to_headers(self.database.symbols)
+            self._headers[path] = headers
+        return headers
+
+
 class MetadataDatabase(QtCore.QObject):
     """Represents all known metadata values
 
@@ -194,15 +965,69 @@ class MetadataDatabase(QtCore.QObject):
 
         Note
         ----
-        No parsing of author value is attempted.
-        "John Doe" and "Doe, John" are considered not equal,
-        even if they probably represent the same person.
+        Values are kept as written, so "John Doe" and "Doe, John" are
+        separate items. Use ``author_index`` to find out which of them
+        represent the same person.
+    author_index
+        ``AuthorIndex`` grouping different ways of writing author names
+    series
+        List of series
+    value_models
+        Dictionary mapping "category", "tags", "series" and "authors" to
+        ``KnownValuesModel`` shared by all views that offer known values.
+        Authors model contains only preferred name of every author.
+    posts
+        Dictionary mapping path of every read post to its ``PostRecord``
+    symbols
+        ``SymbolTable`` used by records in ``posts``
+    columns
+        ``PostColumns`` built from ``posts`` after directory is read, also
+        used to find posts by created date
+    slugs
+        Dictionary mapping slug of every read post to its path. Slug is taken
+        from metadata or, if missing, derived from title the way Pelican does.
+    slug_engine
+        ``SlugEngine`` used to derive slugs from titles. When it is replaced
+        after files were read, ``rebuild_indexes`` should be called.
+    files
+        Set of absolute paths of all files found in read directories,
+        including files with unsupported extensions
     path
         Path of last read directory
 
         Note
         ----
         It is intended for internal use of model methods.
+    directories
+        Paths of all read directories and archives, in order they were read
+    scan_concurrency
+        If set, directories are read by asyncio scanner with that many
+        filesystem operations in flight. Useful on high-latency filesystems.
+    max_header_lines
+        Files with more lines of metadata are not read further
+    max_header_size
+        Files with more characters of metadata are not read further
+    truncated
+        Dictionary mapping path of every file that was not read fully
+        to the reason
+    fallback_encoding
+        Encoding used for files that are not valid UTF-8
+    skipped
+        Dictionary mapping name of error class to list of (path, message)
+        pairs of files and directories that could not be read
+    use_git
+        If directory is in git work tree, read files listed by git (skipping
+        ignored files) and, when directory is read again, only files changed
+        since previous scan. Disabled by default.
+    git_scans
+        Dictionary mapping path of every directory read from git work tree
+        to (commit, scan start time in nanoseconds) of its last scan
+    read_progress
+        If set, called without arguments after every
+        ``read_progress_interval`` files are read, so GUI can process
+        pending events while big directory is read
+    read_progress_interval
+        Number of files read between calls of ``read_progress``
     """
 
     changed = QtCore.pyqtSignal()
@@ -213,7 +1038,33 @@ class MetadataDatabase(QtCore.QObject):
         self.tags = []
         self.authors = []
         self.series = []
+        self.author_index = pelican_metadata_generator.authors.AuthorIndex()
+        self.value_models = {
+            key: KnownValuesModel(parent=self) for key in ["category", "tags", "series", "authors"]
+        }
+        # metadata key -> (list of known values, set of the same values)
+        self._known_sets = {}
+        self.posts = {}
+        self.symbols = SymbolTable()
+        self.columns = PostColumns()
+        self.slugs = {}
+        # slug -> paths of other posts with the same slug, in reading order
+        self._shadowed_slugs = {}
+        self.slug_engine = pelican_metadata_generator.slugs.SlugEngine()
+        self.files = set()
         self.path = []
+        self.directories = []
+        self.scan_concurrency = None
+        self.max_header_lines = 1000
+        self.max_header_size = 64 * 1024
+        self.truncated = {}
+        self.fallback_encoding = None
+        self.skipped = {}
+        self.use_git = False
+        self.git_scans = {}
+        self.read_progress = None
+        self.read_progress_interval = 100
+        self._filesSinceProgress = 0
         self.read_directory(path)
 
     def read_directory(self, path):
@@ -222,59 +1073,533 @@ class MetadataDatabase(QtCore.QObject):
         Parameters
         ----------
         path
-            Path of directory that should be read.
+            Path of directory that should be read. It may also be path
+            of zip or tar archive.
         """
         if not path:
             return
 
         path = os.path.abspath(path)
         if os.path.isdir(path):
-            self._readPathFiles(path)
-            self.path = path
-            self.changed.emit()
+            scan_start = time.time_ns()
+            commit = None
+            if self.use_git and pelican_metadata_generator.gitscan.is_work_tree(path):
+                commit = pelican_metadata_generator.gitscan.head_commit(path)
+
+            if not (commit and self._rescanGitChanges(path)):
+                self._forgetPosts(_under_directory(path))
+                self._forgetReadProblems(_under_directory(path))
+                self._readPathFiles(path, git=commit is not None)
+                self.columns = PostColumns.from_records(self.posts.values())
 
-    def _readPathFiles(self, path):
-        for root, dirs, files in os.walk(path):
-            for filename in files:
-                self._parseFile(os.path.join(root, filename))
+            if commit:
+                self.git_scans[path] = (commit, scan_start)
+            self._finishRead(path)
+        elif os.path.isfile(path):
+            source = pelican_metadata_generator.sources.open_source(path)
+            if source is None:
+                logging.warning("{path} is neither directory nor archive".format(path=path))
+                return
+            try:
+                self.read_source(source)
+            finally:
+                source.close()
 
-    def _parseFile(self, path):
+    def read_source(self, source):
+        """Reads metadata from all files in source
+
+        Parameters
+        ----------
+        source
+            Source object, like archive or in-memory tree (see
+            pelican_metadata_generator.sources).
+        """
+        self._forgetPosts(_under_directory(source.path))
+        self._forgetReadProblems(_under_directory(source.path))
+        self._readSourceFiles(source)
+        self.columns = PostColumns.from_records(self.posts.values())
+        self._finishRead(source.path)
+
+    def _finishRead(self, path):
+        self._updateAuthorsModel()
+        self.path = path
+        if path not in self.directories:
+            self.directories.append(path)
+        if self.skipped:
+            summary = ", ".join(
+                "{}: {}".format(name, count) for name, count in self.skipped_summary().items()
+            )
+            logging.warning("Some files could not be read ({})".format(summary))
+        self.changed.emit()
+
+    def read_file(self, path):
+        """Reads metadata from single file, replacing metadata read from it earlier
+
+        Known values are only ever added, so values that are no longer
+        used by file are still offered.
+
+        Parameters
+        ----------
+        path
+            Path of file that should be read.
+        """
+        self.read_files([path])
+
+    def read_files(self, paths):
+        """Reads metadata from files, replacing metadata read from them earlier
+
+        Indexes are updated only for posts that were read again, unless some
+        posts were removed, in which case they are rebuilt once for all
+        files. ``changed`` is emitted once. See ``read_file``.
+        """
+        if self._rereadFiles([os.path.abspath(path) for path in paths]):
+            self.rebuild_indexes()
+        else:
+            self._updateAuthorsModel()
+        self.changed.emit()
+
+    def _rereadFiles(self, paths):
+        """Reads files again, forgetting files that don't exist anymore
+
+        Posts that are read again replace their earlier rows in ``columns``
+        and their earlier entries in slug and author indexes.
+
+        Returns
+        -------
+        True if posts were removed and indexes have to be rebuilt.
+        """
+        rebuild = False
+        self._forgetReadProblems(set(paths).__contains__)
+        for path in paths:
+            previous = self.posts.pop(path, None)
+            if previous is not None:
+                self._unindexPost(previous)
+            if not os.path.isfile(path):
+                self.files.discard(path)
+                rebuild = rebuild or previous is not None
+                continue
+            self.files.add(path)
+            self._parseFile(path)
+            record = self.posts.get(path)
+            if record is None:
+                rebuild = rebuild or previous is not None
+            elif previous is None:
+                self.columns.append(record)
+            else:
+                self.columns.replace(self.columns.paths.index(path), record)
+        return rebuild
+
+    def _rescanGitChanges(self, path):
+        """Reads again only files changed since previous scan of git work tree
+
+        Candidates are files changed since previously scanned commit and
+        untracked files. Of these, only files modified after previous scan
+        started (or not read at all) are read, so rescan takes time
+        proportional to the number of changes.
+
+        Returns
+        -------
+        False if directory was not scanned before or changes could not be
+        obtained from git.
+        """
+        if path not in self.git_scans:
+            return False
+        commit, scan_start = self.git_scans[path]
+        candidates = pelican_metadata_generator.gitscan.changed_files(path, commit)
+        if candidates is None:
+            return False
+
+        threshold = scan_start - GIT_MTIME_MARGIN_NS
+        changed = []
+        for candidate in candidates:
+            try:
+                modified = os.stat(candidate).st_mtime_ns
+            except OSError:
+                modified = None
+            if modified is None or modified >= threshold or candidate not in self.files:
+                changed.append(candidate)
+
+        logging.info(
+            "Reading {n} files changed in {path} since {commit}".format(
+                n=len(changed), path=path, commit=commit
+            )
+        )
+        if self._rereadFiles(changed):
+            self.rebuild_indexes()
+        return True
+
+    def _forgetPosts(self, matches):
+        """Removes posts and files for paths that match
+
+        Called before directory is scanned again, so files that were
+        removed or renamed since previous scan are not known anymore.
+
+        Parameters
+        ----------
+        matches
+            Function returning True for paths that should be forgotten
+        """
+        for path in [path for path in self.posts if matches(path)]:
+            self._unindexPost(self.posts.pop(path))
+        self.files.difference_update([path for path in self.files if matches(path)])
+
+    def _forgetReadProblems(self, matches):
+        """Removes entries of ``truncated`` and ``skipped`` for paths that match
+
+        Called before files are read again, so problems that were fixed
+        since previous read are not reported anymore.
+
+        Parameters
+        ----------
+        matches
+            Function returning True for paths that should be forgotten
+        """
+        self.truncated = {
+            path: reason for path, reason in self.truncated.items() if not matches(path)
+        }
+        skipped = {}
+        for name, files in self.skipped.items():
+            files = [(path, message) for path, message in files if not matches(path)]
+            if files:
+                skipped[name] = files
+        self.skipped = skipped
+
+    def skipped_summary(self):
+        """Returns dictionary mapping name of error class to number of skipped files"""
+        return {name: len(files) for name, files in self.skipped.items()}
+
+    def _readPathFiles(self, path, git=False):
+        files = pelican_metadata_generator.gitscan.list_files(path) if git else None
+
+        if self.scan_concurrency:
+            read_file = functools.partial(
+                pelican_metadata_generator.scanner.read_file, **self._read_options()
+            )
+            if files is None:
+                scan = pelican_metadata_generator.scanner.scan_directory(
+                    path,
+                    self._addScannedFile,
+                    concurrency=self.scan_concurrency,
+                    read_file=read_file,
+                    on_error=self._skipFile,
+                )
+            else:
+                scan = pelican_metadata_generator.scanner.scan_files(
+                    files,
+                    self._addScannedFile,
+                    concurrency=self.scan_concurrency,
+                    read_file=read_file,
+                    on_error=self._skipFile,
+                )
+            asyncio.run(scan)
+            return
+
+        if files is not None:
+            for filepath in files:
+                self.files.add(filepath)
+                self._parseFile(filepath)
+            return
+
+        self._readSourceFiles(pelican_metadata_generator.sources.DirectorySource(path))
+
+    def _readSourceFiles(self, source):
+        for filepath in source.walk(onerror=self._skipDirectory):
+            self.files.add(filepath)
+            self._parseFile(filepath, source)
+
+    def _parseFile(self, path, source=None):
         logging.debug("Processing {file}".format(file=path))
+        self._reportProgress()
 
         try:
-            post = pelican_metadata_generator.file_handler.Factory(path).generate()
+            post = pelican_metadata_generator.file_handler.Factory(path, source=source).generate(
+                **self._read_options()
+            )
         except NotImplementedError:
             msg = "Ignoring {file} because it has unsupported extension"
             logging.info(msg.format(file=path))
             return
+        except (OSError, UnicodeDecodeError) as e:
+            self._skipFile(path, e)
+            return
+
+        self._addPost(path, post)
+
+    def _addScannedFile(self, path, post):
+        self._reportProgress()
+        self.files.add(path)
+        if post is not None:
+            self._addPost(path, post)
+
+    def _reportProgress(self):
+        if self.read_progress is None:
+            return
+        self._filesSinceProgress += 1
+        if self._filesSinceProgress >= self.read_progress_interval:
+            self._filesSinceProgress = 0
+            self.read_progress()
+
+    def _skipDirectory(self, error):
+        self._skipFile(error.filename, error)
+
+    def _skipFile(self, path, error):
+        logging.warning("Skipping {file}: {error}".format(file=path, error=error))
+        self.skipped.setdefault(type(error).__name__, []).append((path, str(error)))
+
+    def _read_options(self):
+        return {
+            "headers_only": True,
+            "max_header_lines": self.max_header_lines,
+            "max_header_size": self.max_header_size,
+            "fallback_encoding": self.fallback_encoding,
+        }
+
+    def _addPost(self, path, post):
+        if post.truncated:
+            self.truncated[path] = post.truncated
+            msg = "File {file} was not read fully: {reason}"
+            logging.warning(msg.format(file=path, reason=post.truncated))
+
+        record = PostRecord.from_headers(path, post.headers, self.symbols)
+        self.posts[path] = record
+        self._indexSlug(record)
+        for symbol_id in record.authors:
+            self.author_index.add(self.symbols.lookup(symbol_id), path)
 
         for header in post.headers:
             if header in ["tags", "category", "author", "authors", "series"]:
                 self._appendMeta(header, post.headers[header])
 
-    def _appendMeta(self, name, values):
+    def rebuild_indexes(self):
+        """Recomputes all indexes derived from ``posts``"""
+        self.slugs = {}
+        self._shadowed_slugs = {}
+        self.author_index = pelican_metadata_generator.authors.AuthorIndex()
+        for name in self.authors:
+            self.author_index.add(name)
+        for record in self.posts.values():
+            self._indexSlug(record)
+            for symbol_id in record.authors:
+                self.author_index.add(self.symbols.lookup(symbol_id), record.path)
+        self.columns = PostColumns.from_records(self.posts.values())
+        for key in ["category", "tags", "series"]:
+            self.value_models[key].update(getattr(self, key))
+        self._updateAuthorsModel()
+
+    def free_slug(self, slug):
+        """Returns slug, or its first variant not used by any known post"""
+        candidate = slug
+        suffix = 2
+        while candidate in self.slugs:
+            candidate = "{}-{}".format(slug, suffix)
+            suffix += 1
+        return candidate
+
+    def path_exists(self, filename):
+        """True if file name (relative to last read directory) is known to exist"""
+        if not self.path:
+            return False
+        return os.path.normpath(os.path.join(self.path, filename)) in self.files
+
+    def free_path(self, filename):
+        """Returns file name, or its first variant that doesn't exist in last read directory"""
+        root, ext = os.path.splitext(filename)
+        candidate = filename
+        suffix = 2
+        while self.path_exists(candidate):
+            candidate = "{}-{}{}".format(root, suffix, ext)
+            suffix += 1
+        return candidate
+
+    def posts_on_day(self, date):
+        """Returns paths of posts created on the same day as date
+
+        Days are compared as written in metadata, ignoring time zone
+        offsets, so post written at "2020-01-02 01:00+02:00" is created on
+        2 January no matter how dates of other posts are written.
+
+        Parameters
+        ----------
+        date
+            Date as written in post metadata.
         """
-        This takes string that is metadata tag value, makes it a list
-        (separated by semicolon or comma), and appends element from list
-        into database of known values for given tag if that value hasn't
-        been encountered earlier.
-        This way we can be sure that known values in database are unique
+        timestamp = date_to_timestamp(date, wall_clock=True)
+        if timestamp is None:
+            return []
+        start = timestamp - timestamp % SECONDS_PER_DAY
+        return [path for path, _ in self._postsWrittenBetween(start, start + SECONDS_PER_DAY)]
+
+    def _postsWrittenBetween(self, start, end):
+        """Yields (path, created date) of posts created in [start, end), as written
+
+        Created dates are compared ignoring time zone offsets (see
+        ``date_to_timestamp``). Posts are found in created date index, which
+        keeps offsets, so range is widened by the largest offset first.
+        """
+        for row in self.columns.rows_between(start - MAX_UTC_OFFSET, end + MAX_UTC_OFFSET):
+            path = self.columns.paths[row]
+            timestamp = date_to_timestamp(self.posts[path].date, wall_clock=True)
+            if start <= timestamp < end:
+                yield path, timestamp
+
+    def previous_post(self, date, category=None):
+        """Returns latest post created before date
+
+        Parameters
+        ----------
+        date
+            Date as written in post metadata.
+        category
+            If given, only posts in that category are considered.
+
+        Returns
+        -------
+        Tuple of (number of seconds between posts, path of post), or None
+        if there is no such post.
+        """
+        timestamp = date_to_timestamp(date)
+        category_id = None
+        if category:
+            category_id = self.symbols.get(category)
+            if category_id is None:
+                return None
+        if timestamp is None:
+            return None
+
+        row = self.columns.previous_row(timestamp, category_id)
+        if row is None:
+            return None
+        return timestamp - self.columns.date[row], self.columns.paths[row]
+
+    def template_collisions(self, template, date, category, slug):
+        """Returns paths of posts that template would give the same name as new post
+
+        Only posts created in the same period as new post (the same day, if
+        day is the smallest date field of template) can have the same name,
+        so they are found in created date index and only they are compared.
+        Like Pelican, template is filled with dates as written, ignoring
+        time zone offsets. Extensions are ignored, because Pelican output of posts in different
+        formats still collides. Templates without date fields are not
+        checked; use ``free_slug`` and ``path_exists`` for them.
+
+        Parameters
+        ----------
+        template
+            ``FilenameTemplate``.
+        date
+            Created date of new post, as written in post metadata.
+        category
+            Category of new post.
+        slug
+            Slug of new post.
+        """
+        period = template.smallest_date_field
+        timestamp = date_to_timestamp(date, wall_clock=True)
+        if period is None or timestamp is None:
+            return []
+
+        year, month = time.gmtime(timestamp)[:2]
+        if period == "year":
+            start = calendar.timegm((year, 1, 1, 0, 0, 0))
+            end = calendar.timegm((year + 1, 1, 1, 0, 0, 0))
+        elif period == "month":
+            start = calendar.timegm((year, month, 1, 0, 0, 0))
+            end = calendar.timegm((year + month // 12, month % 12 + 1, 1, 0, 0, 0))
+        else:
+            length = {"day": SECONDS_PER_DAY, "hour": 60 * 60, "minute": 60, "second": 1}
+            start = timestamp - timestamp % length[period]
+            end = start + length[period]
+
+        filename = template.format(timestamp_to_date(timestamp), category, slug, "")
+        collisions = []
+        for path, other_timestamp in self._postsWrittenBetween(start, end):
+            record = self.posts[path]
+            other_category = ""
+            if record.category is not None:
+                other_category = self.symbols.lookup(record.category)
+            other_filename = template.format(
+                timestamp_to_date(other_timestamp),
+                other_category,
+                record.slug or self.slug_engine.slugify(record.title),
+                "",
+            )
+            if other_filename == filename:
+                collisions.append(record.path)
+        return collisions
+
+    def add_known_value(self, name, value):
+        """Adds value to known values of metadata key, if it is not known yet
+
+        Parameters
+        ----------
+        name
+            Metadata key ("category", "tags", "series" or "authors").
+        value
+            Value that should be added.
         """
         if name == "author":
             name = "authors"
 
-        if ";" in values:
-            values = values.split(";")
+        known_values = getattr(self, name)
+        known_set = self._knownSet(name, known_values)
+        if not value or value in known_set:
+            return
+
+        logging.debug("Appending {v} to {n}".format(v=value, n=name))
+        known_values.append(value)
+        known_set.add(value)
+        if name == "authors":
+            self.author_index.add(value)
         else:
-            values = values.split(",")
+            self.value_models[name].add(value)
 
-        known_values = getattr(self, name)
+    def _knownSet(self, name, known_values):
+        """Returns set of known values of metadata key, built again if list was replaced"""
+        cached_list, known_set = self._known_sets.get(name, (None, None))
+        if cached_list is not known_values or len(known_set) != len(known_values):
+            known_set = set(known_values)
+            self._known_sets[name] = (known_values, known_set)
+        return known_set
+
+    def _updateAuthorsModel(self):
+        self.value_models["authors"].update(self.author_index.canonical_names())
+
+    def _indexSlug(self, record):
+        slug = record.slug or self.slug_engine.slugify(record.title)
+        if slug and self.slugs.setdefault(slug, record.path) != record.path:
+            self._shadowed_slugs.setdefault(slug, []).append(record.path)
+
+    def _unindexSlug(self, record):
+        slug = record.slug or self.slug_engine.slugify(record.title)
+        if not slug:
+            return
+        shadowed = self._shadowed_slugs.get(slug, [])
+        if self.slugs.get(slug) == record.path:
+            if shadowed:
+                self.slugs[slug] = shadowed.pop(0)
+            else:
+                del self.slugs[slug]
+        elif record.path in shadowed:
+            shadowed.remove(record.path)
+        if not shadowed:
+            self._shadowed_slugs.pop(slug, None)
 
+    def _unindexPost(self, record):
+        """Removes post from slug and author indexes"""
+        self._unindexSlug(record)
+        for symbol_id in record.authors:
+            self.author_index.discard(self.symbols.lookup(symbol_id), record.path)
+
+    def _appendMeta(self, name, values):
+        """
+        This takes string that is metadata tag value, makes it a list
+        (separated by semicolon or comma), and appends element from list
+        into database of known values for given tag if that value hasn't
+        been encountered earlier.
+        This way we can be sure that known values in database are unique
+        """
         # TODO: I guess we don't support empty values? pelican does this a bit different
-        values = [v.strip() for v in values]
+        values = pelican_metadata_generator.file_handler.split_values(values)
 
         for v in values:
-            if v and v not in known_values:
-                logging.debug("Appending {v} to {n}".format(v=v, n=name))
-                known_values.append(v)
-                setattr(self, name, known_values)
+            self.add_known_value(name, v)
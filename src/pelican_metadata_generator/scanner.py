@@ -0,0 +1,171 @@
+import os
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import pelican_metadata_generator.file_handler
+
+DEFAULT_CONCURRENCY = 16
+
+
+def list_directory(path):
+    """Returns lists of subdirectories and files in directory
+
+    Like ``os.walk``, symbolic links to directories are not followed,
+    so links pointing to parent directory don't cause endless scan.
+    """
+    dirs = []
+    files = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                dirs.append(entry.path)
+            elif not entry.is_dir():
+                files.append(entry.path)
+    return dirs, files
+
+
+def read_file(path, **options):
+    """Returns FileHandler object of file, or None if file format is not supported
+
+    Parameters
+    ----------
+    path
+        Path to file.
+    options
+        Keyword arguments passed to FileHandler class.
+    """
+    try:
+        return pelican_metadata_generator.file_handler.Factory(path).generate(**options)
+    except NotImplementedError:
+        msg = "Ignoring {file} because it has unsupported extension"
+        logging.info(msg.format(file=path))
+        return None
+
+
+async def scan_directory(
+    path,
+    callback,
+    concurrency=DEFAULT_CONCURRENCY,
+    read_file=read_file,
+    list_directory=list_directory,
+    on_error=None,
+):
+    """Reads all files in directory tree, overlapping directory listings and file reads
+
+    Blocking filesystem calls are run in pool of ``concurrency`` threads,
+    so on high-latency filesystems (NFS, sshfs) many network round trips
+    are in flight at the same time.
+
+    Parameters
+    ----------
+    path
+        Path of directory that should be read.
+    callback
+        Called with file path and FileHandler object (or None, if file
+        format is not supported) as soon as each file is read. It is
+        always called from thread running the event loop.
+    concurrency
+        Maximum number of filesystem operations in progress.
+    read_file
+        Function that reads single file.
+    list_directory
+        Function that returns lists of subdirectories and files in directory.
+    on_error
+        If given, it is called with path and exception when directory can't
+        be listed or file can't be read or decoded, and scan continues.
+        Otherwise, first such error aborts scan.
+    """
+    scanner = _Scanner(callback, concurrency, read_file, list_directory, on_error)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        await scanner.run(path, executor)
+
+
+async def scan_files(
+    paths,
+    callback,
+    concurrency=DEFAULT_CONCURRENCY,
+    read_file=read_file,
+    on_error=None,
+):
+    """Reads files from list, overlapping file reads
+
+    Parameters are the same as in ``scan_directory``, except ``paths`` is
+    list of paths of files that should be read.
+    """
+    scanner = _Scanner(callback, concurrency, read_file, list_directory, on_error)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        await scanner.run_files(paths, executor)
+
+
+class _Scanner:
+    def __init__(self, callback, concurrency, read_file, list_directory, on_error):
+        self.callback = callback
+        self.on_error = on_error
+        self.read_file = read_file
+        self.list_directory = list_directory
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.tasks = set()
+        self.finished = asyncio.Event()
+        self.error = None
+
+    async def run(self, path, executor):
+        self.executor = executor
+        self._spawn(self._scan_directory(path))
+        await self._wait()
+
+    async def run_files(self, paths, executor):
+        self.executor = executor
+        if not paths:
+            return
+        for path in paths:
+            self._spawn(self._read_file(path))
+        await self._wait()
+
+    async def _wait(self):
+        await self.finished.wait()
+        if self.error:
+            raise self.error
+
+    def _spawn(self, coroutine):
+        task = asyncio.ensure_future(coroutine)
+        task.add_done_callback(self._task_done)
+        self.tasks.add(task)
+
+    def _task_done(self, task):
+        self.tasks.discard(task)
+        if not task.cancelled() and task.exception() and not self.error:
+            self.error = task.exception()
+            for other_task in self.tasks:
+                other_task.cancel()
+        if self.error or not self.tasks:
+            self.finished.set()
+
+    async def _run_blocking(self, function, *args):
+        async with self.semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, function, *args)
+
+    async def _scan_directory(self, path):
+        try:
+            dirs, files = await self._run_blocking(self.list_directory, path)
+        except OSError as e:
+            if self.on_error is None:
+                raise
+            self.on_error(path, e)
+            return
+        for dirpath in dirs:
+            self._spawn(self._scan_directory(dirpath))
+        for filepath in files:
+            self._spawn(self._read_file(filepath))
+
+    async def _read_file(self, path):
+        logging.debug("Processing {file}".format(file=path))
+        try:
+            post = await self._run_blocking(self.read_file, path)
+        except (OSError, UnicodeDecodeError) as e:
+            if self.on_error is None:
+                raise
+            self.on_error(path, e)
+            return
+        self.callback(path, post)
@@ -0,0 +1,118 @@
+import os
+import re
+import sys
+import html
+import runpy
+import functools
+import unicodedata
+
+try:
+    # the same transliteration tables as Pelican
+    from unidecode import unidecode
+except ImportError:
+    # declared dependency; differs from Unidecode only in rare characters
+    from text_unidecode import unidecode
+
+# Pelican defaults of SLUG_REGEX_SUBSTITUTIONS
+DEFAULT_REGEX_SUBSTITUTIONS = [
+    (r"[^\w\s-]", ""),
+    (r"(?u)\A\s*", ""),
+    (r"(?u)\s*\Z", ""),
+    (r"[-\s]+", "-"),
+]
+DEFAULT_CACHE_SIZE = 1024
+
+COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+TAG_RE = re.compile(r"<.*?>", re.DOTALL)
+
+
+def _normalize(text):
+    return unicodedata.normalize("NFKC", text)
+
+
+class _TransliterationTable(dict):
+    """Translation table for ``str.translate`` that converts characters to ASCII
+
+    Characters are transliterated when they are seen for the first time.
+    """
+
+    def __missing__(self, codepoint):
+        value = self[codepoint] = unidecode(chr(codepoint))
+        return value
+
+
+class SlugEngine:
+    """Creates slugs the way Pelican does
+
+    Substitution rules are compiled once and recent results are cached,
+    so slug can be computed again on every keystroke in title.
+
+    Parameters
+    ----------
+    regex_subs
+        List of (pattern, replacement) pairs, as in Pelican
+        ``SLUG_REGEX_SUBSTITUTIONS`` setting.
+    preserve_case
+        Don't convert slug to lower case (``SLUGIFY_PRESERVE_CASE``).
+    use_unicode
+        Don't transliterate slug to ASCII (``SLUGIFY_USE_UNICODE``).
+    cache_size
+        Number of recent results that are remembered.
+    """
+
+    def __init__(
+        self,
+        regex_subs=DEFAULT_REGEX_SUBSTITUTIONS,
+        preserve_case=False,
+        use_unicode=False,
+        cache_size=DEFAULT_CACHE_SIZE,
+    ):
+        self.regex_subs = list(regex_subs)
+        self.preserve_case = preserve_case
+        self.use_unicode = use_unicode
+        self._substitutions = [
+            (re.compile(_normalize(pattern), re.IGNORECASE), _normalize(replacement))
+            for pattern, replacement in self.regex_subs
+        ]
+        self._table = _TransliterationTable()
+        self.slugify = functools.lru_cache(maxsize=cache_size)(self._slugify)
+
+    @classmethod
+    def from_pelicanconf(cls, path, **options):
+        """Creates engine using slug settings from Pelican configuration file
+
+        Like Pelican, configuration file is executed as Python code, with
+        its directory on ``sys.path`` so it can import modules next to it.
+        Settings missing from file have Pelican default values.
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        sys.path.insert(0, directory)
+        try:
+            settings = runpy.run_path(path)
+        finally:
+            sys.path.remove(directory)
+        return cls(
+            regex_subs=settings.get("SLUG_REGEX_SUBSTITUTIONS", DEFAULT_REGEX_SUBSTITUTIONS),
+            preserve_case=settings.get("SLUGIFY_PRESERVE_CASE", False),
+            use_unicode=settings.get("SLUGIFY_USE_UNICODE", False),
+            **options,
+        )
+
+    def _slugify(self, value):
+        """Returns slug of value (exposed, with cache, as ``slugify``)"""
+        if "<" in value or "&" in value:
+            value = TAG_RE.sub("", COMMENT_RE.sub("", value))
+            value = html.unescape(" ".join(value.split()))
+        else:
+            value = " ".join(value.split())
+
+        value = _normalize(value)
+        if not self.use_unicode and not value.isascii():
+            value = value.translate(self._table)
+
+        for pattern, replacement in self._substitutions:
+            value = pattern.sub(replacement, value)
+
+        if not self.preserve_case:
+            value = value.lower()
+        return value.strip()
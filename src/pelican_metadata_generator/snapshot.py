@@ -0,0 +1,193 @@
+import os
+import sys
+import json
+import logging
+import sqlite3
+import pathlib
+from datetime import datetime, timezone
+
+import pelican_metadata_generator.model
+
+SCHEMA_VERSION = 2
+
+KNOWN_VALUES_KEYS = ["category", "tags", "authors", "series"]
+
+
+class SnapshotError(Exception):
+    """Raised when snapshot file can't be used"""
+
+
+def write_snapshot(database, path):
+    """Saves content of MetadataDatabase into SQLite snapshot file
+
+    Snapshot is written into temporary file first and moved in place
+    when complete, so readers never see partially written snapshot.
+
+    Parameters
+    ----------
+    database
+        MetadataDatabase object that should be saved.
+    path
+        Path of snapshot file.
+    """
+    tmp_path = "{}.tmp".format(path)
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    connection = sqlite3.connect(tmp_path)
+    try:
+        with connection:
+            _create_schema(connection)
+            header = {
+                "schema_version": str(SCHEMA_VERSION),
+                "content_root": database.path or "",
+                "content_roots": json.dumps(database.directories),
+                "scanned_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            }
+            connection.executemany("INSERT INTO header VALUES (?, ?)", header.items())
+            connection.executemany(
+                "INSERT INTO symbols VALUES (?, ?)",
+                ((i, database.symbols.lookup(i)) for i in range(len(database.symbols))),
+            )
+            for key in KNOWN_VALUES_KEYS:
+                connection.executemany(
+                    "INSERT INTO known_values VALUES (?, ?, ?)",
+                    ((key, i, value) for i, value in enumerate(getattr(database, key))),
+                )
+            connection.executemany(
+                "INSERT INTO posts VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (_record_to_row(record) for record in database.posts.values()),
+            )
+            connection.executemany(
+                "INSERT INTO files VALUES (?)", ((path,) for path in sorted(database.files))
+            )
+    finally:
+        connection.close()
+
+    os.replace(tmp_path, path)
+    logging.info("Wrote snapshot of {n} posts to {file}".format(n=len(database.posts), file=path))
+
+
+def read_snapshot(database, path):
+    """Replaces content of MetadataDatabase with data from snapshot file
+
+    Parameters
+    ----------
+    database
+        MetadataDatabase object that should be filled.
+    path
+        Path of snapshot file.
+
+    Returns
+    -------
+    Dictionary with snapshot header (schema version, last and all content
+    roots, scan time).
+    """
+    if not os.path.isfile(path):
+        raise SnapshotError("Snapshot file does not exist: {}".format(path))
+
+    uri = "{}?mode=ro".format(pathlib.Path(os.path.abspath(path)).as_uri())
+    connection = sqlite3.connect(uri, uri=True)
+    try:
+        header = _read_header(connection, path)
+
+        symbols = pelican_metadata_generator.model.SymbolTable()
+        for symbol_id, value in connection.execute("SELECT id, value FROM symbols ORDER BY id"):
+            if symbols.intern(value) != symbol_id:
+                raise SnapshotError("Snapshot symbol table is not contiguous: {}".format(path))
+
+        known_values = {key: [] for key in KNOWN_VALUES_KEYS}
+        for key, value in connection.execute(
+            "SELECT key, value FROM known_values ORDER BY key, position"
+        ):
+            known_values.setdefault(key, []).append(value)
+
+        posts = {}
+        for row in connection.execute("SELECT * FROM posts ORDER BY rowid"):
+            record = _row_to_record(row)
+            posts[record.path] = record
+
+        files = {path for (path,) in connection.execute("SELECT path FROM files")}
+    except sqlite3.DatabaseError as e:
+        raise SnapshotError("Can't read snapshot {}: {}".format(path, e))
+    finally:
+        connection.close()
+
+    database.symbols = symbols
+    database.posts = posts
+    database.files = files
+    for key in KNOWN_VALUES_KEYS:
+        setattr(database, key, known_values[key])
+    database.rebuild_indexes()
+    database.path = header["content_root"]
+    database.directories = header["content_roots"]
+    database.changed.emit()
+
+    logging.info(
+        "Read snapshot of {n} posts from {root} scanned at {time}".format(
+            n=len(posts), root=header["content_root"], time=header["scanned_at"]
+        )
+    )
+    return header
+
+
+def _create_schema(connection):
+    connection.execute("CREATE TABLE header (key TEXT PRIMARY KEY, value TEXT)")
+    connection.execute("CREATE TABLE symbols (id INTEGER PRIMARY KEY, value TEXT)")
+    connection.execute("CREATE TABLE known_values (key TEXT, position INTEGER, value TEXT)")
+    connection.execute(
+        "CREATE TABLE posts ("
+        "path TEXT PRIMARY KEY, title TEXT, slug TEXT, date TEXT, modified TEXT, "
+        "category INTEGER, series INTEGER, tags TEXT, authors TEXT, extra TEXT)"
+    )
+    connection.execute("CREATE TABLE files (path TEXT PRIMARY KEY)")
+
+
+def _read_header(connection, path):
+    try:
+        header = dict(connection.execute("SELECT key, value FROM header"))
+    except sqlite3.DatabaseError as e:
+        raise SnapshotError("File is not metadata snapshot: {} ({})".format(path, e))
+
+    if header.get("schema_version") != str(SCHEMA_VERSION):
+        msg = "Snapshot {} has schema version {}, expected {}"
+        raise SnapshotError(msg.format(path, header.get("schema_version"), SCHEMA_VERSION))
+
+    # snapshots written before all roots were recorded have only the last one
+    if "content_roots" in header:
+        header["content_roots"] = json.loads(header["content_roots"])
+    else:
+        header["content_roots"] = [header["content_root"]] if header["content_root"] else []
+    return header
+
+
+def _record_to_row(record):
+    return (
+        record.path,
+        record.title,
+        record.slug,
+        record.date,
+        record.modified,
+        record.category,
+        record.series,
+        ",".join(str(symbol_id) for symbol_id in record.tags),
+        ",".join(str(symbol_id) for symbol_id in record.authors),
+        json.dumps(record.extra) if record.extra else "",
+    )
+
+
+def _row_to_record(row):
+    path, title, slug, date, modified, category, series, tags, authors, extra = row
+    extra = json.loads(extra) if extra else ()
+    return pelican_metadata_generator.model.PostRecord(
+        path,
+        title=title,
+        slug=slug,
+        date=date,
+        modified=modified,
+        category=category,
+        series=series,
+        tags=tuple(int(symbol_id) for symbol_id in tags.split(",") if symbol_id),
+        authors=tuple(int(symbol_id) for symbol_id in authors.split(",") if symbol_id),
+        extra=tuple((sys.intern(key), value) for key, value in extra),
+    )
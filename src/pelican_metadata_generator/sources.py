@@ -0,0 +1,223 @@
+import io
+import os
+import errno
+import tarfile
+import zipfile
+
+
+class Source:
+    """
+    Abstract class that defines interface of places that files are read from.
+    Paths of files are absolute; files inside archive have path of archive
+    followed by member name.
+
+    Attributes
+    ----------
+    path
+        Path of directory or archive
+    """
+
+    path = ""
+
+    def walk(self, onerror=None):
+        """Yields paths of all files in source
+
+        Parameters
+        ----------
+        onerror
+            Called with OSError when part of source can't be listed.
+        """
+        raise NotImplementedError
+
+    def open(self, path):
+        """Returns binary stream with content of file"""
+        raise NotImplementedError
+
+    def isfile(self, path):
+        """True if path points to file in source"""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class LocalFiles(Source):
+    """Files on local disk"""
+
+    def walk(self, onerror=None):
+        return []
+
+    def open(self, path):
+        return open(path, "rb")
+
+    def isfile(self, path):
+        return os.path.isfile(path)
+
+
+LOCAL_FILES = LocalFiles()
+
+
+class DirectorySource(LocalFiles):
+    """Files in directory tree on local disk
+
+    Parameters
+    ----------
+    path
+        Path of directory.
+    """
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+
+    def walk(self, onerror=None):
+        for root, dirs, files in os.walk(self.path, onerror=onerror):
+            for filename in files:
+                yield os.path.join(root, filename)
+
+
+def _member_path(archive_path, name):
+    """Returns path of archive member, or None if name points outside archive"""
+    parts = name.replace("\\", "/").split("/")
+    if name.startswith(("/", "\\")) or os.path.splitdrive(name)[0] or ".." in parts:
+        return None
+    return os.path.normpath(os.path.join(archive_path, name))
+
+
+def _unsafe_member_error(archive_path, name):
+    return OSError(
+        errno.EINVAL, "Member name points outside archive", os.path.join(archive_path, name)
+    )
+
+
+class ZipSource(Source):
+    """Files inside zip archive, read without extracting them
+
+    Parameters
+    ----------
+    path
+        Path of archive.
+    """
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        self._archive = zipfile.ZipFile(self.path)
+        self._members = {}
+        self._unsafe_names = []
+        for info in self._archive.infolist():
+            if info.is_dir():
+                continue
+            member_path = _member_path(self.path, info.filename)
+            if member_path is None:
+                self._unsafe_names.append(info.filename)
+            else:
+                self._members[member_path] = info
+
+    def walk(self, onerror=None):
+        if onerror is not None:
+            for name in self._unsafe_names:
+                onerror(_unsafe_member_error(self.path, name))
+        return list(self._members)
+
+    def open(self, path):
+        try:
+            return self._archive.open(self._members[path])
+        except KeyError:
+            raise FileNotFoundError("No member {} in archive {}".format(path, self.path))
+
+    def isfile(self, path):
+        return path in self._members
+
+    def close(self):
+        self._archive.close()
+
+
+class TarSource(Source):
+    """Files inside (optionally compressed) tar archive, read without extracting them
+
+    Members are read in order they are stored in archive, while archive
+    is read, so compressed archive is decompressed only once. Member opened
+    right after ``walk`` yields its path is read from current position of
+    archive, without seeking back in compressed stream, and only as far as
+    it is read. Members that are never opened (like files with unsupported
+    extensions) are skipped without reading their content.
+
+    Parameters
+    ----------
+    path
+        Path of archive.
+    """
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        self._archive = tarfile.open(self.path, "r:*")
+        self._members = {}
+
+    def walk(self, onerror=None):
+        for member in self._archive:
+            if not member.isfile():
+                continue
+            path = _member_path(self.path, member.name)
+            if path is None:
+                if onerror is not None:
+                    onerror(_unsafe_member_error(self.path, member.name))
+                continue
+            self._members[path] = member
+            yield path
+
+    def open(self, path):
+        try:
+            return self._archive.extractfile(self._members[path])
+        except KeyError:
+            raise FileNotFoundError("No member {} in archive {}".format(path, self.path))
+
+    def isfile(self, path):
+        return path in self._members
+
+    def close(self):
+        self._archive.close()
+
+
+class MemorySource(Source):
+    """Files kept in memory, mostly useful for tests
+
+    Parameters
+    ----------
+    files
+        Dictionary mapping file name (relative to ``path``) to its content,
+        as string or bytes.
+    path
+        Directory that file names are relative to.
+    """
+
+    def __init__(self, files, path="/memory"):
+        self.path = path
+        self._files = {}
+        for name, content in files.items():
+            if isinstance(content, str):
+                content = content.encode("utf-8")
+            self._files[os.path.normpath(os.path.join(path, name))] = content
+
+    def walk(self, onerror=None):
+        return sorted(self._files)
+
+    def open(self, path):
+        try:
+            return io.BytesIO(self._files[path])
+        except KeyError:
+            raise FileNotFoundError("No file {} in memory".format(path))
+
+    def isfile(self, path):
+        return path in self._files
+
+
+def open_source(path):
+    """Returns source for directory or archive at path, or None if path is neither"""
+    if os.path.isdir(path):
+        return DirectorySource(path)
+    if not os.path.isfile(path):
+        return None
+    if zipfile.is_zipfile(path):
+        return ZipSource(path)
+    if tarfile.is_tarfile(path):
+        return TarSource(path)
+    return None
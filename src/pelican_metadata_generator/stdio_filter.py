@@ -0,0 +1,65 @@
+import sys
+
+import pelican_metadata_generator.file_handler
+
+
+def apply_headers(file_format, values, tags, input_stream, output_stream):
+    """Copies post from input to output stream, updating its metadata
+
+    Only metadata part of post is kept in memory; rest of post is copied
+    in chunks as it is read.
+    If post has metadata, new values are merged into it and existing
+    metadata is overwritten. Otherwise, metadata is added at top of post.
+
+    Parameters
+    ----------
+    file_format
+        Format of post (see pelican_metadata_generator.file_handler.Factory).
+    values
+        Dictionary of metadata values to set. Empty value removes key.
+    tags
+        List of tags to add to tags already present in post.
+    input_stream
+        Stream with post content.
+    output_stream
+        Stream that updated post is written to.
+    """
+    post = pelican_metadata_generator.file_handler.Factory("", file_format).generate(
+        headers_only=True
+    )
+    post.read_stream(input_stream)
+    had_metadata = post.has_metadata()
+
+    headers = dict(post.headers)
+    for key, value in values.items():
+        if value:
+            headers[key] = value
+        else:
+            headers.pop(key, None)
+
+    if tags:
+        known_tags = pelican_metadata_generator.file_handler.split_values(headers.get("tags", ""))
+        known_tags = [tag for tag in known_tags if tag]
+        known_tags.extend(tag for tag in tags if tag not in known_tags)
+        separator = "; " if any("," in tag for tag in known_tags) else ", "
+        headers["tags"] = separator.join(known_tags)
+
+    post.headers = headers
+    if had_metadata:
+        post.overwrite_headers_stream(output_stream, remaining=input_stream)
+    else:
+        post.prepend_headers_stream(output_stream, remaining=input_stream)
+
+
+def run(args):
+    """Runs filter mode using command line arguments; returns exit code"""
+    values = {}
+    for item in args.set or []:
+        key, _, value = item.partition("=")
+        values[key.strip().lower()] = value.strip()
+
+    sys.stdin.reconfigure(encoding="utf-8")
+    sys.stdout.reconfigure(encoding="utf-8")
+    apply_headers(args.format, values, args.tag or [], sys.stdin, sys.stdout)
+    sys.stdout.flush()
+    return 0
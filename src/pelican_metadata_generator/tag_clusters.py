@@ -0,0 +1,319 @@
+import re
+import zlib
+import random
+import unicodedata
+
+DEFAULT_THRESHOLD = 0.5
+NGRAM_SIZE = 3
+PERMUTATIONS = 24
+BAND_SIZE = 2
+# buckets shared by more tags than that are formed by very common n-grams
+# and would produce mostly false candidates
+MAX_BUCKET_SIZE = 200
+# tags shorter than that have too few n-grams to be compared reliably;
+# they are only grouped as aliases
+MIN_SIMILARITY_LENGTH = 4
+# normalized forms of different length are grouped only if shorter one is
+# at least that long relative to longer one, so "python web" is not a
+# variant of "python"
+MIN_LENGTH_RATIO = 0.8
+
+# short tags that are well-known names of longer ones
+DEFAULT_ALIASES = {
+    "py": "python",
+    "js": "javascript",
+    "ts": "typescript",
+    "rb": "ruby",
+    "k8s": "kubernetes",
+    "pg": "postgresql",
+}
+
+WORD_RE = re.compile(r"[^\W_]+")
+TRAILING_DIGITS_RE = re.compile(r"(?<=[^\W\d_])\d+$")
+
+# (suffix, replacement, minimum length of remaining stem)
+SUFFIXES = [
+    ("sses", "ss", 2),
+    ("ies", "y", 2),
+    ("ing", "", 4),
+    ("ss", "ss", 0),
+    ("us", "us", 0),
+    ("is", "is", 0),
+    ("s", "", 3),
+]
+
+_MERSENNE_PRIME = (1 << 61) - 1
+
+
+def stem(word):
+    """Returns word without common English inflection suffixes and version number"""
+    word = TRAILING_DIGITS_RE.sub("", word)
+    for suffix, replacement, min_length in SUFFIXES:
+        if word.endswith(suffix):
+            if len(word) - len(suffix) >= min_length:
+                return word[: -len(suffix)] + replacement
+            return word
+    return word
+
+
+def tag_words(tag):
+    """Returns list of case-folded, stemmed words of tag, without diacritics"""
+    tag = unicodedata.normalize("NFKD", tag)
+    tag = "".join(char for char in tag if not unicodedata.combining(char)).casefold()
+    return [stem(word) for word in WORD_RE.findall(tag)]
+
+
+def tag_key(tag):
+    """Returns normalized form of tag
+
+    Tag is case-folded, stripped of diacritics, split into words that are
+    stemmed, and joined back without separators, so "Unit Tests",
+    "unit-test" and "unittest" have the same key.
+    """
+    return "".join(tag_words(tag))
+
+
+def _ngrams(key):
+    padded = "^{}$".format(key)
+    return {padded[i:i + NGRAM_SIZE] for i in range(len(padded) - NGRAM_SIZE + 1)}
+
+
+def _jaccard(first, second):
+    common = len(first & second)
+    return common / (len(first) + len(second) - common)
+
+
+class _MinHasher:
+    """Computes MinHash signatures of n-gram sets
+
+    Permuted hashes of every n-gram are computed once, so signature of tag
+    is element-wise minimum of few precomputed tuples.
+    """
+
+    def __init__(self, permutations=PERMUTATIONS, seed=0):
+        rng = random.Random(seed)
+        self._coefficients = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(permutations)
+        ]
+        self._cache = {}
+
+    def _hashes(self, ngram):
+        value = zlib.crc32(ngram.encode("utf-8"))
+        return tuple((a * value + b) % _MERSENNE_PRIME for a, b in self._coefficients)
+
+    def signatures(self, ngram_sets):
+        """Returns list of signatures of n-gram sets"""
+        cache = self._cache
+        for ngrams in ngram_sets:
+            for ngram in ngrams:
+                if ngram not in cache:
+                    cache[ngram] = self._hashes(ngram)
+        return [tuple(map(min, zip(*map(cache.__getitem__, ngrams)))) for ngrams in ngram_sets]
+
+
+def _candidate_pairs(signatures, lengths, band_size):
+    """Yields pairs of indexes of signatures sharing at least one band
+
+    Pairs of keys whose lengths differ too much (see ``MIN_LENGTH_RATIO``)
+    are skipped. Pair may be yielded more than once.
+    """
+    # most bands are unique, so list of indexes is created only for band
+    # seen again
+    first_index = {}
+    buckets = {}
+    for index, signature in enumerate(signatures):
+        # numbered tuples of band_size consecutive values
+        for band in enumerate(zip(*[iter(signature)] * band_size)):
+            first = first_index.setdefault(band, index)
+            if first != index:
+                buckets.setdefault(band, [first]).append(index)
+
+    for bucket in buckets.values():
+        if len(bucket) > MAX_BUCKET_SIZE:
+            continue
+        bucket.sort(key=lengths.__getitem__)
+        for i, first in enumerate(bucket):
+            max_length = lengths[first] / MIN_LENGTH_RATIO
+            for second in bucket[i + 1:]:
+                if lengths[second] > max_length:
+                    break
+                yield first, second
+
+
+class _KeyComparator:
+    """Decides if two normalized forms of tags are variants of each other"""
+
+    def __init__(self, keys, words, threshold):
+        self.keys = keys
+        self.words = words
+        self.threshold = threshold
+        self.ngrams = [_ngrams(key) for key in keys]
+        self._word_ngrams = {}
+
+    def similarity(self, first, second):
+        """Returns n-gram similarity of keys, or 0 if their words differ"""
+        if len(self.keys[first]) < len(self.keys[second]) * MIN_LENGTH_RATIO:
+            return 0
+        if len(self.keys[second]) < len(self.keys[first]) * MIN_LENGTH_RATIO:
+            return 0
+        similarity = _jaccard(self.ngrams[first], self.ngrams[second])
+        if similarity < self.threshold or not self._similar_words(first, second):
+            return 0
+        return similarity
+
+    def _similar_words(self, first, second):
+        """True unless tags have the same number of words and some of them differ"""
+        first_words = self.words[first]
+        second_words = self.words[second]
+        if len(first_words) != len(second_words):
+            return True
+        for first_word, second_word in zip(first_words, second_words):
+            if first_word == second_word:
+                continue
+            if _jaccard(self._ngrams(first_word), self._ngrams(second_word)) < self.threshold:
+                return False
+        return True
+
+    def _ngrams(self, word):
+        ngrams = self._word_ngrams.get(word)
+        if ngrams is None:
+            ngrams = self._word_ngrams[word] = _ngrams(word)
+        return ngrams
+
+
+def cluster_tags(tags, threshold=DEFAULT_THRESHOLD, aliases=DEFAULT_ALIASES):
+    """Groups tags that are probably written differently but mean the same
+
+    Tags with the same normalized form (see ``tag_key``) are always grouped.
+    Normalized forms are then compared by Jaccard similarity of their
+    character n-grams. To avoid comparing every pair, only forms with
+    similar MinHash signatures (sharing band of signature) are compared.
+    Forms are grouped only if they have similar length and, when they have
+    the same number of words, every word is similar, so adding word to tag
+    doesn't make its variant.
+    Groups are merged only if all their forms are similar to each other
+    (complete linkage), most similar pairs first, so groups don't grow by
+    chains of similar pairs.
+
+    Forms shorter than ``MIN_SIMILARITY_LENGTH`` are grouped with a longer
+    form only if they are its alias or initials of its words ("ml" and
+    "machine learning"), and only one group matches.
+
+    Parameters
+    ----------
+    tags
+        Iterable of tags.
+    threshold
+        Minimum n-gram similarity of normalized forms of grouped tags.
+    aliases
+        Dictionary mapping short tag to tag it stands for.
+
+    Returns
+    -------
+    List of clusters (lists of tags), only those with more than one tag.
+    """
+    keys = {}
+    key_words = {}
+    for tag in tags:
+        words = tag_words(tag)
+        key = "".join(words) or tag
+        keys.setdefault(key, []).append(tag)
+        key_words.setdefault(key, words)
+
+    key_list = [key for key in keys if len(key) >= MIN_SIMILARITY_LENGTH]
+    comparator = _KeyComparator(key_list, [key_words[key] for key in key_list], threshold)
+    signatures = _MinHasher().signatures(comparator.ngrams)
+    lengths = [len(key) for key in key_list]
+
+    similarities = {}
+    for pair in _candidate_pairs(signatures, lengths, BAND_SIZE):
+        if pair not in similarities:
+            similarities[pair] = comparator.similarity(*pair)
+
+    members = {index: [index] for index in range(len(key_list))}
+    parents = list(range(len(key_list)))
+    ranked = sorted((similarity, pair) for pair, similarity in similarities.items() if similarity)
+    for _, (first, second) in reversed(ranked):
+        first_root, second_root = parents[first], parents[second]
+        if first_root == second_root:
+            continue
+        linked = all(
+            comparator.similarity(first_member, second_member)
+            for first_member in members[first_root]
+            for second_member in members[second_root]
+        )
+        if linked:
+            for index in members[second_root]:
+                parents[index] = first_root
+            members[first_root].extend(members.pop(second_root))
+
+    clusters = {
+        root: [tag for index in indexes for tag in keys.pop(key_list[index])]
+        for root, indexes in members.items()
+    }
+    _add_short_forms(keys, key_words, key_list, parents, clusters, aliases)
+    result = list(clusters.values())
+    result.extend(keys.values())
+    return [cluster for cluster in result if len(cluster) > 1]
+
+
+def _add_short_forms(keys, key_words, key_list, parents, clusters, aliases):
+    """Moves tags with short normalized forms from ``keys`` to clusters they stand for"""
+    short_keys = [key for key in keys if len(key) < MIN_SIMILARITY_LENGTH]
+    if not short_keys:
+        return
+
+    roots = {}
+    for index, key in enumerate(key_list):
+        words = key_words[key]
+        roots.setdefault(key, set()).add(parents[index])
+        if len(words) > 1:
+            initials = "".join(word[0] for word in words)
+            roots.setdefault(initials, set()).add(parents[index])
+
+    alias_keys = {tag_key(alias): tag_key(tag) for alias, tag in aliases.items()}
+    for key in short_keys:
+        if key in alias_keys:
+            candidates = roots.get(alias_keys[key], set())
+        else:
+            candidates = roots.get(key, set())
+        if len(candidates) == 1:
+            clusters[next(iter(candidates))].extend(keys.pop(key))
+
+
+def tag_usage(database):
+    """Returns dictionary mapping tags known to MetadataDatabase to paths of posts using them"""
+    usage = {tag: [] for tag in database.tags}
+    for record in database.posts.values():
+        for symbol_id in record.tags:
+            usage.setdefault(database.symbols.lookup(symbol_id), []).append(record.path)
+    return usage
+
+
+def report(usage, threshold=DEFAULT_THRESHOLD, examples=3):
+    """Returns clusters of similar tags as human-readable text
+
+    Parameters
+    ----------
+    usage
+        Dictionary mapping tag to list of paths of posts using it.
+    threshold
+        Minimum similarity of grouped tags (see ``cluster_tags``).
+    examples
+        Maximum number of files listed for every tag.
+    """
+    clusters = cluster_tags(usage, threshold)
+    clusters.sort(key=lambda cluster: (-sum(len(usage[tag]) for tag in cluster), min(cluster)))
+
+    lines = []
+    for cluster in clusters:
+        cluster.sort(key=lambda tag: (-len(usage[tag]), tag))
+        lines.append(", ".join(cluster))
+        for tag in cluster:
+            paths = sorted(usage[tag])
+            lines.append("    {}: {} post(s)".format(tag, len(paths)))
+            lines.extend("        {}".format(path) for path in paths[:examples])
+            if len(paths) > examples:
+                lines.append("        ...")
+    return "\n".join(lines)
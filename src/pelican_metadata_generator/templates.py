@@ -0,0 +1,79 @@
+import string
+
+
+class FilenameTemplate:
+    """Output file name template, validated and compiled once
+
+    Parameters
+    ----------
+    template
+        Template in ``str.format`` syntax. Supported fields are listed
+        in ``FIELDS``.
+
+    Attributes
+    ----------
+    fields
+        Set of names of fields used by template
+    smallest_date_field
+        Name of the most precise date field used by template ("day" for
+        "{year}/{month}/{day}"), or None if template doesn't use date
+
+    Raises
+    ------
+    ValueError
+        If template is malformed or uses unsupported fields.
+    """
+
+    FIELDS = ("year", "month", "day", "hour", "minute", "second", "category", "slug", "ext")
+    DATE_FIELDS = ("year", "month", "day", "hour", "minute", "second")
+
+    def __init__(self, template):
+        self.template = template
+        fields = set()
+        try:
+            for _, field_name, _, _ in string.Formatter().parse(template):
+                if field_name is None:
+                    continue
+                name = field_name.split(".")[0].split("[")[0]
+                if name not in self.FIELDS:
+                    raise ValueError("unsupported field {{{}}}".format(field_name))
+                fields.add(name)
+        except ValueError as e:
+            raise ValueError("Invalid filename template {!r}: {}".format(template, e))
+
+        self.fields = frozenset(fields)
+        self._format = template.format_map
+        date_fields = [field for field in self.DATE_FIELDS if field in fields]
+        self.smallest_date_field = date_fields[-1] if date_fields else None
+        self._uses_date = bool(date_fields)
+
+        try:
+            self.format("2000-01-01 00:00:00", "category", "slug", "ext")
+        except (ValueError, TypeError, AttributeError, IndexError, KeyError) as e:
+            raise ValueError("Invalid filename template {!r}: {}".format(template, e))
+
+    def format(self, date, category, slug, ext):
+        """Returns file name
+
+        Parameters
+        ----------
+        date
+            Created date, in "YYYY-MM-DD hh:mm:ss" format.
+        category
+            Post category.
+        slug
+            Post slug.
+        ext
+            File extension.
+        """
+        values = {"category": category, "slug": slug, "ext": ext}
+        if self._uses_date:
+            if len(date) != 19:
+                raise ValueError("Date {!r} is not in YYYY-MM-DD hh:mm:ss format".format(date))
+            values["year"] = int(date[0:4])
+            values["month"] = int(date[5:7])
+            values["day"] = int(date[8:10])
+            values["hour"] = int(date[11:13])
+            values["minute"] = int(date[14:16])
+            values["second"] = int(date[17:19])
+        return self._format(values)
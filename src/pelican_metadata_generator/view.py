@@ -1,3 +1,5 @@
+import os
+
 from PyQt5 import QtCore, QtWidgets
 
 
@@ -6,6 +8,7 @@ class MainWindow(QtWidgets.QMainWindow):
 
     prependHeaders = QtCore.pyqtSignal()
     overwriteHeaders = QtCore.pyqtSignal()
+    directorySelected = QtCore.pyqtSignal(str)
 
     def __init__(self, parent=None):
         super(MainWindow, self).__init__(parent)
@@ -18,8 +21,9 @@ class MainWindow(QtWidgets.QMainWindow):
         # to retain compatibility with current Controller code
         self.setupTab = self.app.setupTab
         self.generatedTab = self.app.generatedTab
+        self.postsTab = self.app.postsTab
         self.saveAsFileButton = self.app.saveAsFileButton
-        self.saveFileDialog = self.app.saveFileDialog
+        self.saveFileSelected = self.app.saveFileSelected
 
         self.read_metadata_act = QtWidgets.QAction(
             "Read Pelican metadata from directory",
@@ -41,9 +45,21 @@ class MainWindow(QtWidgets.QMainWindow):
             self.choose_file_format_menu.addAction(file_format)
         self.fileMenu.addAction(self.quit_act)
 
-        self.readMetadataDialog = QtWidgets.QFileDialog()
-        self.readMetadataDialog.setFileMode(QtWidgets.QFileDialog.Directory)
-        self.readMetadataDialog.setOption(QtWidgets.QFileDialog.ShowDirsOnly, True)
+        # file dialogs are slow to create and rarely used
+        self._readMetadataDialog = None
+
+    @property
+    def readMetadataDialog(self):
+        """Dialog used to choose directory to read metadata from, created on first use"""
+        if self._readMetadataDialog is None:
+            self._readMetadataDialog = QtWidgets.QFileDialog(self)
+            self._readMetadataDialog.setFileMode(QtWidgets.QFileDialog.Directory)
+            self._readMetadataDialog.setOption(QtWidgets.QFileDialog.ShowDirsOnly, True)
+            self._readMetadataDialog.fileSelected.connect(self.directorySelected)
+        return self._readMetadataDialog
+
+    def showDebugStatus(self, message):
+        self.statusBar().showMessage(message)
 
     def show_file_exists_dialog(self):
         message = """
@@ -64,18 +80,45 @@ class MainWindow(QtWidgets.QMainWindow):
         elif reply == QtWidgets.QMessageBox.No:
             self.prependHeaders.emit()
 
+    def show_file_changed_dialog(self, path):
+        message = """
+            <p>File {path} was changed by another program after it was read.
+            <p>It will be read again, so these changes are not lost.</p>
+            """
+        QtWidgets.QMessageBox.warning(self, "File was changed", message.format(path=path))
+
+    def show_filename_exists_dialog(self, filename, suggestion):
+        message = """
+            <p>File {filename} already exists.
+            <p>Do you want to save as {suggestion} instead?</p>
+            """
+        reply = QtWidgets.QMessageBox.question(
+            self,
+            "File already exists",
+            message.format(filename=filename, suggestion=suggestion),
+            QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No,
+            QtWidgets.QMessageBox.Yes,
+        )
+        if reply == QtWidgets.QMessageBox.Yes:
+            return suggestion
+        return filename
+
 
 # FIXME: remove that class entirely
 class Window(QtWidgets.QWidget):
+    saveFileSelected = QtCore.pyqtSignal(str)
+
     def __init__(self, parent=None):
         super(Window, self).__init__(parent)
 
         self.setupTab = SetupTab()
         self.generatedTab = GeneratedTab()
+        self.postsTab = PostsTab()
 
         tabWidget = QtWidgets.QTabWidget()
         tabWidget.addTab(self.setupTab, "Metadata form")
         tabWidget.addTab(self.generatedTab, "Generated metadata")
+        tabWidget.addTab(self.postsTab, "All posts")
 
         self.saveAsFileButton = QtWidgets.QPushButton("Save as file")
         self.saveAsFileButton.setShortcut("Ctrl+S")
@@ -88,9 +131,24 @@ class Window(QtWidgets.QWidget):
         self.setWindowTitle("Pelican Metadata Generator")
 
         self.saveAsFileButton.setAutoDefault(False)
-        self.saveFileDialog = QtWidgets.QFileDialog()
-        self.saveFileDialog.setAcceptMode(QtWidgets.QFileDialog.AcceptSave)
-        self.saveFileDialog.setOption(QtWidgets.QFileDialog.DontConfirmOverwrite, True)
+        self._saveFileDialog = None
+        self._saveDirectory = ""
+
+    @property
+    def saveFileDialog(self):
+        """Dialog used to choose file that metadata is saved to, created on first use"""
+        if self._saveFileDialog is None:
+            self._saveFileDialog = QtWidgets.QFileDialog(self)
+            self._saveFileDialog.setAcceptMode(QtWidgets.QFileDialog.AcceptSave)
+            self._saveFileDialog.setOption(QtWidgets.QFileDialog.DontConfirmOverwrite, True)
+            self._saveFileDialog.setDirectory(self._saveDirectory)
+            self._saveFileDialog.fileSelected.connect(self.saveFileSelected)
+        return self._saveFileDialog
+
+    def setSaveDirectory(self, path):
+        self._saveDirectory = path
+        if self._saveFileDialog is not None:
+            self._saveFileDialog.setDirectory(path)
 
     def showSaveDialog(self, filename):
         self.saveFileDialog.selectFile(filename)
@@ -113,9 +171,21 @@ class SetupTab(QtWidgets.QWidget):
         self.slugActive.setToolTip("Generate automatically")
         self.slugActive.stateChanged.connect(self.slugField.setReadOnly)
         self.slugActive.setChecked(True)
+        self.slugWarning = QtWidgets.QLabel()
+        self.slugWarning.setWordWrap(True)
+        self.slugWarning.hide()
+        self.slugBox = QtWidgets.QVBoxLayout()
+        self.slugBox.addLayout(self.slugLine)
+        self.slugBox.addWidget(self.slugWarning)
 
         self.dateField = QtWidgets.QDateTimeEdit()
         self.dateField.setCalendarPopup(True)
+        self.dateInfo = QtWidgets.QLabel()
+        self.dateInfo.setWordWrap(True)
+        self.dateInfo.hide()
+        self.dateBox = QtWidgets.QVBoxLayout()
+        self.dateBox.addWidget(self.dateField)
+        self.dateBox.addWidget(self.dateInfo)
 
         self.modifiedActive = QtWidgets.QCheckBox("")
         self.modifiedField = QtWidgets.QDateTimeEdit()
@@ -166,8 +236,8 @@ class SetupTab(QtWidgets.QWidget):
 
         mainLayout = QtWidgets.QFormLayout()
         mainLayout.addRow("Title:", self.titleField)
-        mainLayout.addRow("Slug:", self.slugLine)
-        mainLayout.addRow("Date created:", self.dateField)
+        mainLayout.addRow("Slug:", self.slugBox)
+        mainLayout.addRow("Date created:", self.dateBox)
         mainLayout.addRow("Date modified:", self.modifiedLine)
         mainLayout.addRow("Category:", self.categoryLine)
         mainLayout.addRow("Tags:", self.tagLine)
@@ -179,6 +249,79 @@ class SetupTab(QtWidgets.QWidget):
     def _setModifiedAllowed(self, value):
         self.modifiedField.setReadOnly(not value)
 
+    def setSlugCollision(self, existing_path, suggestion):
+        if not existing_path:
+            self.slugField.setStyleSheet("")
+            self.slugWarning.hide()
+            return
+
+        message = "Slug is already used by {path}. First free variant: {suggestion}"
+        self.slugField.setStyleSheet("QLineEdit { color: red; }")
+        self.slugWarning.setText(message.format(path=existing_path, suggestion=suggestion))
+        self.slugWarning.show()
+
+    def setDateInfo(self, same_day, previous, category, collisions):
+        """Shows how created date relates to dates of known posts
+
+        Parameters
+        ----------
+        same_day
+            Paths of posts created on the same day.
+        previous
+            (seconds, path) of latest earlier post in category, or None.
+        category
+            Category of new post.
+        collisions
+            Paths of posts whose output file name would be the same.
+        """
+        lines = []
+        if same_day:
+            names = [os.path.basename(path) for path in same_day[:3]]
+            if len(same_day) > 3:
+                names.append("...")
+            lines.append("Posts created on the same day: {}".format(", ".join(names)))
+        if previous:
+            days = previous[0] / (24 * 60 * 60)
+            message = "{days:.1f} days since previous post"
+            if category:
+                message += " in {category}"
+            lines.append(message.format(days=days, category=category))
+        if collisions:
+            lines.append("File name is already used by {}".format(collisions[0]))
+
+        self.dateField.setStyleSheet("QDateTimeEdit { color: red; }" if collisions else "")
+        self.dateInfo.setText("\n".join(lines))
+        self.dateInfo.setVisible(bool(lines))
+
+    def setKnownValuesModels(self, models):
+        """Makes lists and fields offer values from models shared with other views
+
+        Parameters
+        ----------
+        models
+            Dictionary mapping metadata key to model with known values.
+        """
+        for valuesList, field, key in [
+            (self.categoryList, self.categoryField, "category"),
+            (self.seriesList, self.seriesField, "series"),
+            (self.authorList, self.authorField, "authors"),
+        ]:
+            valuesList.setModel(models[key])
+            valuesList.setPlaceholderText("Pick value")
+            valuesList.setCurrentIndex(-1)
+            field.setCompleter(self._createCompleter(models[key]))
+            # clearing field is the way to remove value picked from list
+            field.setClearButtonEnabled(True)
+            field.textChanged.connect(
+                lambda text, valuesList=valuesList: text or valuesList.setCurrentIndex(-1)
+            )
+        self.tagField.setCompleter(self._createCompleter(models["tags"], TagCompleter))
+
+    def _createCompleter(self, model, completer_class=QtWidgets.QCompleter):
+        completer = completer_class(model, self)
+        completer.setCaseSensitivity(QtCore.Qt.CaseInsensitive)
+        return completer
+
     def setTagButtons(self, available_tags, checked_tags):
         while True:
             item = self.tagButtonsLayout.itemAt(0)
@@ -199,6 +342,25 @@ class SetupTab(QtWidgets.QWidget):
             self.tagButtonsLayout.addWidget(button, int(i / inRow), int(i % inRow))
 
 
+class TagCompleter(QtWidgets.QCompleter):
+    """Completes last tag of comma (or semicolon) separated list"""
+
+    @staticmethod
+    def _separator(text):
+        return ";" if ";" in text else ","
+
+    def splitPath(self, path):
+        return [path.rsplit(self._separator(path), 1)[-1].strip()]
+
+    def pathFromIndex(self, index):
+        completion = super(TagCompleter, self).pathFromIndex(index)
+        text = self.widget().text() if self.widget() else ""
+        separator = self._separator(text)
+        if separator not in text:
+            return completion
+        return "{} {}".format(text.rsplit(separator, 1)[0] + separator, completion)
+
+
 class GeneratedTab(QtWidgets.QWidget):
     """Builds preview headers tab"""
 
@@ -213,3 +375,54 @@ class GeneratedTab(QtWidgets.QWidget):
 
     def set_content(self, text):
         self.generatedField.setPlainText(text)
+
+
+class PostsTab(QtWidgets.QWidget):
+    """Builds tab with editable table of metadata of all known posts"""
+
+    def __init__(self, parent=None):
+        super(PostsTab, self).__init__(parent)
+
+        self.table = QtWidgets.QTableView()
+        # rows of the same height don't have to be measured, which matters
+        # when there are tens of thousands of them
+        self.table.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Fixed)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.setWordWrap(False)
+
+        self.dirtyLabel = QtWidgets.QLabel()
+        self.saveButton = QtWidgets.QPushButton("Save changed posts")
+        self.saveButton.setAutoDefault(False)
+        self.setDirtyCount(0)
+        self.saveLine = QtWidgets.QHBoxLayout()
+        self.saveLine.addWidget(self.dirtyLabel)
+        self.saveLine.addStretch()
+        self.saveLine.addWidget(self.saveButton)
+
+        mainLayout = QtWidgets.QVBoxLayout()
+        mainLayout.addWidget(self.table)
+        mainLayout.addLayout(self.saveLine)
+        self.setLayout(mainLayout)
+
+    def setModel(self, model):
+        self.table.setModel(model)
+
+    def setDirtyCount(self, count):
+        self.dirtyLabel.setText("Changed posts: {}".format(count))
+        self.saveButton.setEnabled(bool(count))
+
+    def showSaveErrors(self, errors):
+        """Shows files that could not be saved
+
+        Parameters
+        ----------
+        errors
+            Dictionary mapping path to error message.
+        """
+        lines = ["<li>{}: {}</li>".format(path, error) for path, error in sorted(errors.items())]
+        if len(lines) > 10:
+            lines = lines[:10] + ["<li>...</li>"]
+        message = "<p>{count} file(s) could not be saved:</p><ul>{lines}</ul>".format(
+            count=len(errors), lines="".join(lines)
+        )
+        QtWidgets.QMessageBox.warning(self, "Some files were not saved", message)
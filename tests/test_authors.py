@@ -0,0 +1,91 @@
+import unittest
+
+import os
+
+from pelican_metadata_generator import authors
+from pelican_metadata_generator import model
+
+
+CUR_DIR = os.path.dirname(__file__)
+CONTENT_PATH = os.path.join(CUR_DIR, "posts")
+
+
+class TestNameTokens(unittest.TestCase):
+    def test_normalization(self):
+        for name, expected in [
+            ("John Doe", ("john", "doe")),
+            ("Doe, John", ("john", "doe")),
+            ("  JOHN   doe ", ("john", "doe")),
+            ("J. R. Doe", ("j", "r", "doe")),
+            ("Mirosław Zalewski", ("miroslaw", "zalewski")),
+            ("Jean-Paul Sartre", ("jean", "paul", "sartre")),
+            ("Zoë Ångström", ("zoe", "angstrom")),
+        ]:
+            with self.subTest(name=name):
+                self.assertEqual(authors.name_tokens(name), expected)
+
+
+class TestAuthorIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = authors.AuthorIndex()
+
+    def test_variants_are_grouped(self):
+        self.index.add("John Doe", "a.md")
+        self.index.add("John Doe", "b.md")
+        self.index.add("Doe, John", "c.md")
+        self.index.add("john doe", "d.md")
+        self.index.add("J. Doe", "e.md")
+        self.index.add("Jane Roe", "f.md")
+
+        self.assertEqual(self.index.canonical_names(), ["John Doe", "Jane Roe"])
+        self.assertEqual(self.index.canonical("J. Doe"), "John Doe")
+        self.assertEqual(
+            self.index.variants(),
+            {
+                "John Doe": {
+                    "John Doe": ["a.md", "b.md"],
+                    "Doe, John": ["c.md"],
+                    "john doe": ["d.md"],
+                    "J. Doe": ["e.md"],
+                }
+            },
+        )
+
+    def test_ambiguous_initials_are_not_merged(self):
+        self.index.add("John Doe")
+        self.index.add("Jane Doe")
+        self.index.add("J. Doe")
+
+        self.assertEqual(self.index.canonical_names(), ["John Doe", "Jane Doe", "J. Doe"])
+        self.assertEqual(self.index.variants(), {})
+
+    def test_name_with_diacritics_is_preferred(self):
+        self.index.add("Miroslaw Zalewski", "a.md")
+        self.index.add("Mirosław Zalewski", "b.md")
+
+        self.assertEqual(self.index.canonical("Miroslaw Zalewski"), "Mirosław Zalewski")
+
+    def test_unknown_name(self):
+        self.assertEqual(self.index.canonical("Nobody"), "Nobody")
+
+    def test_report(self):
+        self.index.add("John Doe", "a.md")
+        self.index.add("Doe, John", "b.md")
+
+        self.assertEqual(
+            self.index.report(),
+            "John Doe\n"
+            "    John Doe: 1 file(s)\n"
+            "        a.md\n"
+            "    Doe, John: 1 file(s)\n"
+            "        b.md",
+        )
+
+    def test_metadata_database_index(self):
+        database = model.MetadataDatabase(CONTENT_PATH)
+
+        self.assertEqual(
+            sorted(database.author_index.canonical_names()), sorted(database.authors)
+        )
+        self.assertIn("John Doe", database.author_index.files)
+        self.assertTrue(database.author_index.files["John Doe"])
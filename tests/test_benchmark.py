@@ -0,0 +1,60 @@
+import unittest
+
+import os
+import json
+import tempfile
+import contextlib
+import io
+
+from pelican_metadata_generator import benchmark
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_write_posts(self):
+        with tempfile.TemporaryDirectory() as path:
+            benchmark.write_posts(path, posts=3, tags=5, categories=2)
+
+            self.assertEqual(len(os.listdir(path)), 3)
+
+    def test_records_take_less_memory_than_header_dictionaries(self):
+        records, dictionaries = benchmark.measure_record_memory(2000)
+
+        self.assertLess(records, dictionaries)
+
+    def test_small_benchmark(self):
+        with tempfile.TemporaryDirectory() as path:
+            json_path = os.path.join(path, "latency.json")
+            argv = [
+                "--posts", "20", "--tags", "8", "--title-length", "5", "--tag-toggles", "3",
+                "--new-tags", "2", "--json", json_path, "--max-p99-ms", "60000",
+            ]
+            with contextlib.redirect_stdout(io.StringIO()) as output:
+                exit_code = benchmark.main(argv)
+
+            with open(json_path) as fh:
+                summary = json.load(fh)
+
+        self.assertEqual(exit_code, 0)
+        self.assertIn("Total wall time", output.getvalue())
+        self.assertEqual(summary["title keystroke"]["count"], 5)
+        self.assertEqual(summary["tag toggle"]["count"], 3)
+        self.assertEqual(summary["tag entry"]["count"], 2)
+        self.assertEqual(summary["load directory"]["count"], 1)
+
+    def test_slow_events_fail_benchmark(self):
+        argv = ["--posts", "5", "--title-length", "1", "--tag-toggles", "0", "--new-tags", "0"]
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            exit_code = benchmark.main(argv + ["--max-p99-ms", "0"])
+
+        self.assertEqual(exit_code, 1)
+        self.assertIn("p99 latency over", output.getvalue())
+        self.assertNotIn("load directory", output.getvalue().split("p99 latency over")[1])
+
+    def test_slow_load_fails_benchmark(self):
+        argv = ["--posts", "5", "--title-length", "1", "--tag-toggles", "0", "--new-tags", "0"]
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            exit_code = benchmark.main(argv + ["--max-p99-ms", "60000", "--max-load-ms", "0"])
+
+        self.assertEqual(exit_code, 1)
+        self.assertIn("Reading directory took over", output.getvalue())
+        self.assertNotIn("p99 latency over", output.getvalue())
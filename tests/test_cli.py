@@ -0,0 +1,141 @@
+import unittest
+
+import io
+import sys
+import os
+import tempfile
+import contextlib
+import subprocess
+
+from pelican_metadata_generator import cli
+
+
+class TestArguments(unittest.TestCase):
+    def _parse_error(self, argv):
+        with contextlib.redirect_stderr(io.StringIO()) as stderr:
+            with self.assertRaises(SystemExit):
+                cli.process_args(argv)
+        return stderr.getvalue()
+
+    def test_write_metadata_db_requires_directory(self):
+        error = self._parse_error(["--write-metadata-db", "metadata.db"])
+
+        self.assertIn("--write-metadata-db requires --directory", error)
+
+    def test_write_metadata_db_with_directory(self):
+        args, _ = cli.process_args(["--write-metadata-db", "metadata.db", "-d", "content"])
+
+        self.assertEqual(args.directory, ["content"])
+
+    def test_git_is_used_only_when_requested(self):
+        args, _ = cli.process_args(["--write-metadata-db", "metadata.db", "-d", "content"])
+        self.assertFalse(cli.create_metadata_database(args).use_git)
+
+        args, _ = cli.process_args(["--git", "--write-metadata-db", "metadata.db", "-d", "content"])
+        self.assertTrue(cli.create_metadata_database(args).use_git)
+
+    def test_unreadable_pelicanconf_is_reported(self):
+        argv = ["--pelicanconf", "/nonexistent/pelicanconf.py"]
+        args, _ = cli.process_args(argv + ["--write-metadata-db", "metadata.db", "-d", "content"])
+
+        with self.assertLogs(level="ERROR") as logs:
+            database = cli.create_metadata_database(args)
+
+        self.assertIn("Can't read slug settings", logs.output[0])
+        self.assertEqual(database.slug_engine.slugify("Zażółć"), "zazolc")
+
+    def test_failing_pelicanconf_is_reported(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "pelicanconf.py")
+            with open(path, "w") as fh:
+                fh.write("import module_that_does_not_exist\n")
+            argv = ["--pelicanconf", path, "--write-metadata-db", "metadata.db", "-d", "content"]
+            args, _ = cli.process_args(argv)
+
+            with self.assertLogs(level="ERROR") as logs:
+                database = cli.create_metadata_database(args)
+
+        self.assertIn("module_that_does_not_exist", logs.output[0])
+        self.assertEqual(database.slug_engine.slugify("Zażółć"), "zazolc")
+
+    def test_unknown_option_is_rejected_in_filter_mode(self):
+        error = self._parse_error(["--filter", "--sett", "title=Title"])
+
+        self.assertIn("unrecognized arguments: --sett", error)
+
+    def test_scan_concurrency_must_be_positive(self):
+        for value in ["0", "-2", "many"]:
+            error = self._parse_error(["--scan-concurrency", value])
+
+            self.assertIn("Expected positive integer, got {!r}".format(value), error)
+        args, _ = cli.process_args(["--scan-concurrency", "4"])
+        self.assertEqual(args.scan_concurrency, 4)
+
+    def test_unknown_options_are_passed_to_qt(self):
+        _, unparsed_args = cli.process_args(["-style", "fusion"])
+
+        self.assertEqual(unparsed_args, ["-style", "fusion"])
+
+    def test_invalid_filename_template_is_rejected(self):
+        error = self._parse_error(["--filter", "-t", "{title}.{ext}"])
+
+        self.assertIn("unsupported field {title}", error)
+
+    def test_filename_template_is_validated_without_qt(self):
+        code = (
+            "import sys\n"
+            "from pelican_metadata_generator import cli\n"
+            "cli.process_args(['--filter', '-t', '{year}/{slug}.{ext}'])\n"
+            "print('PyQt5' in sys.modules)\n"
+        )
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+
+        output = subprocess.run(
+            [sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True
+        ).stdout
+
+        self.assertEqual(output.strip(), "False")
+
+
+class TestGui(unittest.TestCase):
+    def setUp(self):
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PyQt5 import QtWidgets
+
+        self.app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+        content_path = os.path.join(os.path.dirname(__file__), "posts")
+        self.args, _ = cli.process_args(["-d", content_path])
+
+    def _wait_for_posts(self, database):
+        for _ in range(100):
+            self.app.processEvents()
+            if database.posts:
+                break
+
+    def test_window_is_shown_before_directory_is_read(self):
+        controller = cli.show_main_window(self.args)
+        self.addCleanup(controller.view.close)
+        database = controller.known_metadata_model
+
+        self.assertTrue(controller.view.isVisible())
+        self.assertEqual(database.posts, {})
+
+        self._wait_for_posts(database)
+        self.assertTrue(database.posts)
+
+    def test_events_are_processed_while_directory_is_read(self):
+        from PyQt5 import QtCore
+
+        controller = cli.show_main_window(self.args)
+        self.addCleanup(controller.view.close)
+        database = controller.known_metadata_model
+        database.read_progress_interval = 1
+        posts_read = []
+        QtCore.QTimer.singleShot(0, lambda: posts_read.append(len(database.posts)))
+
+        self._wait_for_posts(database)
+
+        self.assertEqual(len(posts_read), 1)
+        self.assertLess(posts_read[0], len(database.posts))
+        self.assertIsNone(database.read_progress)
+        self.assertTrue(controller.view.read_metadata_act.isEnabled())
@@ -3,8 +3,12 @@ import unittest
 import os
 import io
 import logging
+import tempfile
 
 from pelican_metadata_generator import file_handler
+from pelican_metadata_generator import front_matter
+from pelican_metadata_generator import html_handler
+from pelican_metadata_generator import sources
 
 
 CUR_DIR = os.path.dirname(__file__)
@@ -900,3 +904,607 @@ class TestRestructuredtextHandler(unittest.TestCase):
         test_stream.seek(0)
 
         self.assertEqual(test_stream.read(), expected)
+
+
+class TestReadLimits(unittest.TestCase):
+    def setUp(self):
+        self.path = os.path.join(CONTENT_PATH, "file_that_doesnt_exist.md")
+
+    def test_headers_only_stops_after_metadata(self):
+        stream = io.StringIO("Title: Headers only\n\nFirst paragraph\n\nSecond paragraph\n")
+        md = file_handler.MarkdownHandler(self.path, headers_only=True)
+
+        md.read_stream(stream)
+
+        self.assertEqual(md.headers, {"title": "Headers only"})
+        self.assertTrue(md.headers_complete)
+        self.assertEqual(stream.readline(), "First paragraph\n")
+
+    def test_headers_only_restructuredtext(self):
+        stream = io.StringIO("Title\n#####\n\n:tags: One, Two\n:category: Test\n\nText\nMore\n")
+        rst = file_handler.RestructuredtextHandler(
+            os.path.join(CONTENT_PATH, "file_that_doesnt_exist.rst"), headers_only=True
+        )
+
+        rst.read_stream(stream)
+
+        self.assertEqual(rst.headers, {"title": "Title", "tags": "One, Two", "category": "Test"})
+        self.assertEqual(rst.truncated, "")
+
+    def test_too_many_metadata_lines(self):
+        stream = io.StringIO("".join("Key{}: value\n".format(i) for i in range(10)))
+        md = file_handler.MarkdownHandler(self.path, max_header_lines=5)
+
+        md.read_stream(stream)
+
+        self.assertEqual(len(md.headers), 5)
+        self.assertIn("5 lines", md.truncated)
+
+    def test_huge_line_is_not_read_fully(self):
+        stream = io.StringIO("Title: " + "x" * 10000)
+        md = file_handler.MarkdownHandler(self.path, max_header_size=100)
+
+        md.read_stream(stream)
+
+        self.assertEqual(md.headers, {})
+        self.assertIn("100 characters", md.truncated)
+        self.assertEqual(stream.tell(), 101)
+
+    def test_binary_file(self):
+        stream = io.StringIO("Title: binary\x00\x01\x02\n")
+        md = file_handler.MarkdownHandler(self.path, headers_only=True)
+
+        md.read_stream(stream)
+
+        self.assertEqual(md.headers, {})
+        self.assertIn("binary", md.truncated)
+
+
+class TestFrontMatterHandler(unittest.TestCase):
+    def test_extension_md_with_front_matter_is_front_matter(self):
+        post = file_handler.Factory(
+            os.path.join(CONTENT_PATH, "file_with_YAML_headers.md")
+        ).generate()
+
+        self.assertIsInstance(post, front_matter.FrontMatterHandler)
+
+    def test_forced_markdown_format_ignores_front_matter(self):
+        post = file_handler.Factory(
+            os.path.join(CONTENT_PATH, "file_with_YAML_headers.md"), "markdown"
+        ).generate()
+
+        self.assertIsInstance(post, file_handler.MarkdownHandler)
+
+    def test_front_matter_is_detected_while_file_is_read_once(self):
+        class CountingSource(sources.MemorySource):
+            opened = 0
+
+            def open(self, path):
+                self.opened += 1
+                return super(CountingSource, self).open(path)
+
+        source = CountingSource({"post.md": "---  \ntitle: Spaces\n---\n\nContent\n"})
+
+        post = file_handler.Factory("/memory/post.md", source=source).generate()
+
+        self.assertIsInstance(post, front_matter.FrontMatterHandler)
+        self.assertEqual(post.headers, {"title": "Spaces"})
+        self.assertEqual(post.post_content, "Content\n")
+        self.assertEqual(source.opened, 1)
+
+    def test_front_matter_is_detected_in_fed_chunks(self):
+        post = file_handler.MarkdownHandler("", detect_front_matter=True)
+
+        for chunk in ["--", "-\nti", "tle: Fed\n---\nContent\n"]:
+            post.feed(chunk)
+        post.close()
+
+        self.assertIsInstance(post, front_matter.FrontMatterHandler)
+        self.assertEqual(post.headers, {"title": "Fed"})
+        self.assertEqual(post.post_content, "Content\n")
+
+        post.read_stream(io.StringIO("Title: Plain\n\nContent\n"))
+
+        self.assertIsInstance(post, file_handler.MarkdownHandler)
+        self.assertEqual(post.headers, {"title": "Plain"})
+
+    def test_unknown_format_is_not_supported(self):
+        with self.assertRaises(NotImplementedError):
+            file_handler.Factory(os.path.join(CONTENT_PATH, "file.txt")).generate()
+
+    def test_read_file_with_YAML_headers(self):
+        expected_headers = {
+            "title": "File with YAML headers",
+            "slug": "file-with-yaml-headers",
+            "category": "Markdown",
+        }
+        expected_content = "This file has YAML-style headers\n"
+        post = front_matter.FrontMatterHandler(
+            os.path.join(CONTENT_PATH, "file_with_YAML_headers.md")
+        )
+
+        self.assertEqual(post.headers, expected_headers)
+        self.assertEqual(post.post_content, expected_content)
+
+    def test_read_file_with_YAML_lists(self):
+        expected_headers = {
+            "title": "File with YAML lists: quoted",
+            "category": "Markdown",
+            "tags": "Python; Lists, nested; YAML",
+            "authors": "John Doe, Jane Roe",
+            "summary": "Summary written in folded style",
+        }
+        expected_content = "This file has YAML lists\n"
+        post = front_matter.FrontMatterHandler(
+            os.path.join(CONTENT_PATH, "file_with_YAML_lists.md")
+        )
+
+        self.assertEqual(post.headers, expected_headers)
+        self.assertEqual(post.post_content, expected_content)
+
+    def test_headers_only_stops_at_closing_delimiter(self):
+        stream = io.StringIO("---\ntitle: Front matter\n---\n\nContent\n")
+        post = front_matter.FrontMatterHandler(
+            os.path.join(CONTENT_PATH, "file_that_doesnt_exist.md"), headers_only=True
+        )
+
+        post.read_stream(stream)
+
+        self.assertEqual(post.headers, {"title": "Front matter"})
+        self.assertEqual(stream.readline(), "\n")
+
+    def test_generate_headers(self):
+        expected = (
+            "---\n"
+            'title: "Colon: in title"\n'
+            "date: 2017-02-01 12:00\n"
+            'tags: [Headers, "One, Two"]\n'
+            "authors: [Mirosław Zalewski]\n"
+            "---"
+        )
+        post = front_matter.FrontMatterHandler(
+            os.path.join(CONTENT_PATH, "file_that_doesnt_exist.md")
+        )
+        post.headers = {
+            "authors": "Mirosław Zalewski",
+            "tags": "Headers; One, Two",
+            "date": "2017-02-01 12:00",
+            "title": "Colon: in title",
+        }
+
+        self.assertEqual(post.formatted_headers, expected)
+
+    def test_generated_headers_can_be_read(self):
+        headers = {
+            "title": "Colon: in title",
+            "tags": "Headers; One, Two",
+            "summary": "#hashtag",
+        }
+        post = front_matter.FrontMatterHandler(
+            os.path.join(CONTENT_PATH, "file_that_doesnt_exist.md")
+        )
+        post.headers = headers
+        test_stream = io.StringIO()
+        post.overwrite_headers_stream(test_stream)
+        test_stream.seek(0)
+
+        post = front_matter.FrontMatterHandler(
+            os.path.join(CONTENT_PATH, "file_that_doesnt_exist.md")
+        )
+        post.read_stream(test_stream)
+
+        self.assertEqual(post.headers, headers)
+
+    def test_multiline_values_can_be_read_after_writing(self):
+        path = os.path.join(CONTENT_PATH, "file_that_doesnt_exist.md")
+        content = "---\ntitle: Title\nsummary: |\n  line one\n  line two\n---\n"
+        post = front_matter.FrontMatterHandler(path)
+        post.read_stream(io.StringIO(content))
+        self.assertEqual(post.headers["summary"], "line one\nline two")
+        test_stream = io.StringIO()
+        post.overwrite_headers_stream(test_stream)
+        test_stream.seek(0)
+
+        post = front_matter.FrontMatterHandler(path)
+        post.read_stream(test_stream)
+
+        self.assertEqual(post.headers, {"title": "Title", "summary": "line one\nline two"})
+
+
+class TestHTMLHandler(unittest.TestCase):
+    def test_extension_html_is_html(self):
+        post = file_handler.Factory(
+            os.path.join(CONTENT_PATH, "file_that_doesnt_exist.html")
+        ).generate()
+
+        self.assertIsInstance(post, html_handler.HTMLHandler)
+
+    def test_read_file_with_metadata(self):
+        expected_headers = {
+            "title": "File with & headers",
+            "tags": "File, Tag, Testing",
+            "category": "HTML",
+            "date": "2017-02-01 12:00",
+        }
+        expected_content = (
+            "\n"
+            "    <body>\n"
+            "        File with headers\n"
+            "    </body>\n"
+            "</html>\n"
+        )
+        post = html_handler.HTMLHandler(os.path.join(CONTENT_PATH, "file_with_headers.html"))
+
+        self.assertTrue(post.exists)
+        self.assertEqual(post.headers, expected_headers)
+        self.assertEqual(post.post_content, expected_content)
+
+    def test_headers_only_stops_at_end_of_head(self):
+        stream = io.StringIO(
+            "<html><head><title>Title</title></head><body>\n<p>Content</p>\n</body></html>\n"
+        )
+        post = html_handler.HTMLHandler(
+            os.path.join(CONTENT_PATH, "file_that_doesnt_exist.html"), headers_only=True
+        )
+
+        post.read_stream(stream)
+
+        self.assertEqual(post.headers, {"title": "Title"})
+        self.assertEqual(post.post_content, "<body>\n")
+        self.assertEqual(stream.readline(), "<p>Content</p>\n")
+
+    def test_keywords_are_tags(self):
+        stream = io.StringIO('<head><meta name="keywords" content="One, Two"></head>\n')
+        post = html_handler.HTMLHandler(os.path.join(CONTENT_PATH, "file_that_doesnt_exist.html"))
+
+        post.read_stream(stream)
+
+        self.assertEqual(post.headers, {"tags": "One, Two"})
+
+    def test_overwrite_headers_file_with_headers(self):
+        expected = (
+            "<html>\n"
+            "    <head>\n"
+            "        <title>Sample &quot;title&quot;</title>\n"
+            '        <meta name="tags" content="Another, Tag" />\n'
+            '        <meta name="date" content="2017-02-01 12:00" />\n'
+            '        <meta name="slug" content="sample" />\n'
+            "    </head>\n"
+            "    <body>\n"
+            "        File with headers\n"
+            "    </body>\n"
+            "</html>\n"
+        )
+        test_stream = io.StringIO()
+        post = html_handler.HTMLHandler(os.path.join(CONTENT_PATH, "file_with_headers.html"))
+        post.headers = {
+            "title": 'Sample "title"',
+            "date": "2017-02-01 12:00",
+            "tags": "Another, Tag",
+            "slug": "sample",
+        }
+
+        post.overwrite_headers_stream(test_stream)
+
+        self.assertEqual(test_stream.getvalue(), expected)
+
+    def test_unchanged_document_is_written_as_it_was_read(self):
+        document = (
+            "<!DOCTYPE html>\n"
+            '<html lang="en">\n'
+            "<head>\n"
+            '  <meta charset="utf-8">\n'
+            '  <link rel="stylesheet" href="style.css">\n'
+            "  <title>\n"
+            "    Long\n"
+            "    title\n"
+            "  </title>\n"
+            "  <META NAME='keywords' CONTENT='One, Two'>\n"
+            "</head>\n"
+            "<body><p>Content</p></body>\n"
+            "</html>\n"
+        )
+        post = html_handler.HTMLHandler(os.path.join(CONTENT_PATH, "file_that_doesnt_exist.html"))
+        post.read_stream(io.StringIO(document))
+        self.assertEqual(post.headers, {"title": "Long title", "tags": "One, Two"})
+
+        test_stream = io.StringIO()
+        post.overwrite_headers_stream(test_stream)
+        self.assertEqual(test_stream.getvalue(), document)
+
+        post.headers = {"title": "Long title", "tags": "Three"}
+        test_stream = io.StringIO()
+        post.overwrite_headers_stream(test_stream)
+        self.assertEqual(
+            test_stream.getvalue(),
+            document.replace("CONTENT='One, Two'", 'CONTENT="Three"'),
+        )
+
+    def test_headers_are_added_to_head_section(self):
+        document = "<html><head><title>Title</title></head><body>Content</body></html>\n"
+        post = html_handler.HTMLHandler(os.path.join(CONTENT_PATH, "file_that_doesnt_exist.html"))
+        post.read_stream(io.StringIO(document))
+        post.headers = {"date": "2017-02-01"}
+        test_stream = io.StringIO()
+
+        post.overwrite_headers_stream(test_stream)
+
+        self.assertEqual(
+            test_stream.getvalue(),
+            '<html><head><meta name="date" content="2017-02-01" /></head>'
+            "<body>Content</body></html>\n",
+        )
+
+    def test_head_section_is_created_if_file_has_none(self):
+        document = "<html>\n<body>\nContent\n</body>\n</html>\n"
+        post = html_handler.HTMLHandler(os.path.join(CONTENT_PATH, "file_that_doesnt_exist.html"))
+        post.read_stream(io.StringIO(document))
+        post.headers = {"title": "Title"}
+        test_stream = io.StringIO()
+
+        post.prepend_headers_stream(test_stream)
+
+        self.assertEqual(
+            test_stream.getvalue(),
+            "<html>\n<head>\n<title>Title</title>\n</head>\n<body>\nContent\n</body>\n</html>\n",
+        )
+
+
+class TestEditHeaders(unittest.TestCase):
+    def _edit(self, filename, content, changes):
+        post = file_handler.Factory(os.path.join(CONTENT_PATH, filename)).generate()
+        post.read_stream(io.StringIO(content))
+        output = io.StringIO()
+        post.edit_headers_stream(output, changes)
+        return output.getvalue()
+
+    def test_markdown(self):
+        content = (
+            "Title: Old title\n"
+            "date:   2020-01-02\n"
+            "Summary: First line\n"
+            "    second line\n"
+            "Category: Blog\n"
+            "\n"
+            "Content\n"
+        )
+        expected = (
+            "Title: New title\n"
+            "date:   2020-01-02\n"
+            "Summary: First line\n"
+            "    second line\n"
+            "Tags: One, Two\n"
+            "\n"
+            "Content\n"
+        )
+
+        output = self._edit(
+            "post.md", content, {"title": "New title", "category": "", "tags": "One, Two"}
+        )
+
+        self.assertEqual(output, expected)
+
+    def test_markdown_without_headers(self):
+        output = self._edit("post.md", "Content\n", {"title": "Title"})
+
+        self.assertEqual(output, "Title: Title\n\nContent\n")
+
+    def test_unchanged_file_is_written_as_it_was_read(self):
+        for filename in sorted(os.listdir(CONTENT_PATH)):
+            path = os.path.join(CONTENT_PATH, filename)
+            with open(path, encoding="utf-8") as fh:
+                content = fh.read()
+
+            with self.subTest(filename=filename):
+                self.assertEqual(self._edit(filename, content, {}), content)
+
+    def test_restructuredtext(self):
+        content = (
+            "Old title\n"
+            "=========\n"
+            "\n"
+            ":date: 2020-01-02\n"
+            ":tags: One,\n"
+            "    Two\n"
+            ":category: Blog\n"
+            "\n"
+            "Content\n"
+        )
+        expected = (
+            "New title\n"
+            "#########\n"
+            "\n"
+            ":date: 2020-01-02\n"
+            ":tags: One,\n"
+            "    Two\n"
+            ":category: News\n"
+            ":series: Series\n"
+            "\n"
+            "Content\n"
+        )
+
+        output = self._edit(
+            "post.rst", content, {"title": "New title", "category": "News", "series": "Series"}
+        )
+
+        self.assertEqual(output, expected)
+
+    def test_front_matter(self):
+        content = (
+            "---\n"
+            "title: Old title\n"
+            "summary: >\n"
+            "  Folded\n"
+            "  summary\n"
+            "tags:\n"
+            "  - One\n"
+            "  - Two\n"
+            "---\n"
+            "\n"
+            "Content\n"
+        )
+        expected = (
+            "---\n"
+            "title: Old title\n"
+            "summary: >\n"
+            "  Folded\n"
+            "  summary\n"
+            "tags: [Three]\n"
+            "category: Blog\n"
+            "---\n"
+            "\n"
+            "Content\n"
+        )
+
+        output = self._edit("post.md", content, {"tags": "Three", "category": "Blog"})
+
+        self.assertEqual(output, expected)
+
+    def test_html(self):
+        content = "<html>\n<head>\n  <title>Old</title>\n</head>\n<body>Content</body>\n</html>\n"
+
+        output = self._edit("post.html", content, {"title": "New"})
+
+        self.assertEqual(output, content.replace("Old", "New"))
+
+
+class TestIncrementalParser(unittest.TestCase):
+    def test_chunks_give_the_same_result_as_reading_file(self):
+        for filename in sorted(os.listdir(CONTENT_PATH)):
+            path = os.path.join(CONTENT_PATH, filename)
+            with open(path, encoding="utf-8") as fh:
+                content = fh.read()
+            expected = file_handler.Factory(path).generate()
+
+            for chunk_size in [1, 3, 7, 64]:
+                with self.subTest(filename=filename, chunk_size=chunk_size):
+                    post = file_handler.Factory(path).generate()
+                    post.reset()
+                    for i in range(0, len(content), chunk_size):
+                        post.feed(content[i:i + chunk_size])
+                    post.close()
+
+                    self.assertEqual(post.headers, expected.headers)
+                    self.assertEqual(post.post_content, expected.post_content)
+                    self.assertEqual(post.raw_content, expected.raw_content)
+
+    def test_read_stream_forgets_previous_content(self):
+        md = file_handler.MarkdownHandler(os.path.join(CONTENT_PATH, "file_that_doesnt_exist.md"))
+        md.read_stream(io.StringIO("Title: First\nTags: One\n\nFirst content\n"))
+
+        md.read_stream(io.StringIO("Title: Second\n\nSecond content\n"))
+
+        self.assertEqual(md.headers, {"title": "Second"})
+        self.assertEqual(md.post_content, "Second content\n")
+        self.assertEqual(md.raw_content, "Title: Second\n\nSecond content\n")
+
+    def test_multiline_value_split_between_chunks(self):
+        md = file_handler.MarkdownHandler(os.path.join(CONTENT_PATH, "file_that_doesnt_exist.md"))
+
+        md.feed("Title: Multiline\nTags: One\n  ")
+        md.feed("  Two\n\nContent")
+        headers = md.close()
+
+        self.assertEqual(headers, {"title": "Multiline", "tags": "One; Two"})
+        self.assertEqual(md.post_content, "Content")
+
+    def test_feed_reports_complete_headers(self):
+        rst = file_handler.RestructuredtextHandler(
+            os.path.join(CONTENT_PATH, "file_that_doesnt_exist.rst"), headers_only=True
+        )
+
+        self.assertFalse(rst.feed("Title\n#####\n\n:tags: One,\n"))
+        self.assertFalse(rst.feed("    Two\n:category: Test"))
+        self.assertTrue(rst.feed("\n\nContent\n"))
+        rst.close()
+
+        self.assertEqual(rst.headers, {"title": "Title", "tags": "One, Two", "category": "Test"})
+
+    def test_feed_after_complete_headers_without_newline(self):
+        md = file_handler.MarkdownHandler(
+            os.path.join(CONTENT_PATH, "file_that_doesnt_exist.md"), headers_only=True
+        )
+
+        self.assertTrue(md.feed("Title: Post\n\nContent\n"))
+        self.assertTrue(md.feed("More content without newline"))
+        md.close()
+
+        self.assertEqual(md.headers, {"title": "Post"})
+
+    def test_feed_stops_at_size_limit_without_newline(self):
+        md = file_handler.MarkdownHandler(
+            os.path.join(CONTENT_PATH, "file_that_doesnt_exist.md"), max_header_size=10
+        )
+
+        self.assertFalse(md.feed("Title: "))
+        self.assertTrue(md.feed("x" * 10))
+        self.assertIn("10 characters", md.truncated)
+
+
+class TestFileChanges(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.path = os.path.join(self.tmp_dir.name, "post.md")
+        with open(self.path, "w") as fh:
+            fh.write("Title: Old\n\nContent\n")
+
+    def _modify(self, content):
+        with open(self.path, "w") as fh:
+            fh.write(content)
+
+    def test_unchanged_file_is_written(self):
+        md = file_handler.MarkdownHandler(self.path)
+        md.headers = {"title": "New"}
+
+        md.overwrite_headers()
+
+        with open(self.path) as fh:
+            self.assertEqual(fh.read(), "Title: New\n\nContent\n")
+
+    def test_file_changed_after_reading_is_not_written(self):
+        md = file_handler.MarkdownHandler(self.path)
+        md.headers = {"title": "New"}
+        self._modify("Title: Old\n\nEdited\n")
+
+        with self.assertRaises(file_handler.FileChangedError):
+            md.overwrite_headers()
+        with open(self.path) as fh:
+            self.assertEqual(fh.read(), "Title: Old\n\nEdited\n")
+
+    def test_change_of_same_size_and_time_is_detected(self):
+        md = file_handler.MarkdownHandler(self.path)
+        stat = os.stat(self.path)
+        self._modify("Title: Old\n\nContenT\n")
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        with self.assertRaises(file_handler.FileChangedError):
+            md.prepend_headers()
+
+    def test_touched_file_is_written(self):
+        md = file_handler.MarkdownHandler(self.path)
+        os.utime(self.path, ns=(0, 0))
+        md.headers = {"title": "New"}
+
+        md.overwrite_headers()
+
+    def test_file_created_after_reading_is_not_written(self):
+        path = os.path.join(self.tmp_dir.name, "new.md")
+        md = file_handler.MarkdownHandler(path)
+        with open(path, "w") as fh:
+            fh.write("Content\n")
+
+        with self.assertRaises(file_handler.FileChangedError):
+            md.prepend_headers()
+
+    def test_file_can_be_written_again_by_the_same_handler(self):
+        md = file_handler.MarkdownHandler(self.path)
+        md.headers = {"title": "New"}
+
+        md.overwrite_headers()
+        md.overwrite_headers()
+
+    def test_headers_only_read_is_not_fingerprinted(self):
+        md = file_handler.MarkdownHandler(self.path, headers_only=True)
+
+        self.assertIsNone(md.fingerprint)
@@ -0,0 +1,93 @@
+import unittest
+
+import os
+import shutil
+import tempfile
+import subprocess
+from unittest import mock
+
+from pelican_metadata_generator import gitscan
+from pelican_metadata_generator import model
+
+
+def git(path, *args):
+    subprocess.run(
+        ["git", "-C", path, "-c", "user.name=Test", "-c", "user.email=test@example.com"]
+        + list(args),
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+@unittest.skipUnless(shutil.which("git"), "git is not installed")
+class TestGitScan(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.root = os.path.realpath(self.tmp_dir.name)
+        self.content = os.path.join(self.root, "content")
+        os.makedirs(self.content)
+        git(self.root, "init", "-q")
+        for i in range(5):
+            content = "Title: Post {}\nTags: Tag{}\n\nContent\n".format(i, i)
+            self._write("post{}.md".format(i), content)
+        self._write("draft.md", "Title: Ignored\n\nContent\n")
+        with open(os.path.join(self.root, ".gitignore"), "w") as fh:
+            fh.write("draft.md\n")
+        git(self.root, "add", ".")
+        git(self.root, "commit", "-q", "-m", "Initial")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _write(self, name, content):
+        path = os.path.join(self.content, name)
+        with open(path, "w") as fh:
+            fh.write(content)
+        return path
+
+    def test_list_files_skips_ignored_files(self):
+        self._write("untracked.md", "Title: Untracked\n\nContent\n")
+
+        files = gitscan.list_files(self.content)
+
+        self.assertEqual(
+            sorted(os.path.basename(path) for path in files),
+            ["post0.md", "post1.md", "post2.md", "post3.md", "post4.md", "untracked.md"],
+        )
+
+    def test_not_a_work_tree(self):
+        with tempfile.TemporaryDirectory() as path:
+            self.assertFalse(gitscan.is_work_tree(path))
+            self.assertIsNone(gitscan.list_files(path))
+
+    def test_rescan_reads_only_changed_files(self):
+        database = model.MetadataDatabase()
+        database.use_git = True
+        database.read_directory(self.content)
+        self.assertEqual(len(database.posts), 5)
+        self.assertIn(self.content, database.git_scans)
+
+        changed = self._write("post1.md", "Title: Changed\nTags: New tag\n\nContent\n")
+        git(self.root, "commit", "-q", "-a", "-m", "Change")
+        os.remove(os.path.join(self.content, "post2.md"))
+        untracked = self._write("untracked.md", "Title: Untracked\n\nContent\n")
+
+        with mock.patch.object(database, "_parseFile", wraps=database._parseFile) as parse:
+            database.read_directory(self.content)
+
+        parsed = sorted(call.args[0] for call in parse.call_args_list)
+        self.assertEqual(parsed, [changed, untracked])
+        self.assertEqual(database.posts[changed].title, "Changed")
+        self.assertIn("New tag", database.tags)
+        self.assertNotIn(os.path.join(self.content, "post2.md"), database.posts)
+        self.assertEqual(len(database.posts), 5)
+        self.assertEqual(len(database.columns), 5)
+
+    def test_git_is_not_used_by_default(self):
+        database = model.MetadataDatabase()
+
+        database.read_directory(self.content)
+
+        self.assertEqual(len(database.posts), 6)
+        self.assertEqual(database.git_scans, {})
@@ -0,0 +1,84 @@
+import unittest
+
+import os
+import json
+import tempfile
+
+from pelican_metadata_generator import latency
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_percentiles(self):
+        histogram = latency.LatencyHistogram()
+        for ms in range(1, 101):
+            histogram.add(ms * 10**6)
+
+        self.assertEqual(histogram.count, 100)
+        self.assertAlmostEqual(histogram.percentile(50) / 10**6, 50, delta=5)
+        self.assertAlmostEqual(histogram.percentile(95) / 10**6, 95, delta=9.5)
+        self.assertEqual(histogram.percentile(100), 100 * 10**6)
+
+    def test_empty_histogram(self):
+        self.assertEqual(latency.LatencyHistogram().percentile(99), 0)
+
+    def test_very_short_and_long_samples(self):
+        histogram = latency.LatencyHistogram()
+        histogram.add(0)
+        histogram.add(10**15)
+
+        self.assertEqual(histogram.percentile(50), latency.MIN_LATENCY_NS)
+        self.assertEqual(histogram.percentile(99), 10**15)
+
+
+class TestLatencyRecorder(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.recorder = latency.LatencyRecorder(clock=self.clock)
+
+    def _interaction(self, name, duration_ns):
+        with self.recorder.measure(name):
+            self.clock.now += duration_ns
+
+    def test_measure(self):
+        self._interaction("title", 2 * 10**6)
+        self._interaction("title", 4 * 10**6)
+
+        summary = self.recorder.summary()
+
+        self.assertEqual(summary["title"]["count"], 2)
+        self.assertEqual(summary["title"]["mean_ms"], 3)
+        self.assertEqual(summary["title"]["max_ms"], 4)
+        self.assertAlmostEqual(summary["title"]["p50_ms"], 2, delta=0.2)
+
+    def test_failed_interaction_is_measured(self):
+        with self.assertRaises(ValueError):
+            with self.recorder.measure("title"):
+                self.clock.now += 10**6
+                raise ValueError()
+
+        self.assertEqual(self.recorder.histograms["title"].count, 1)
+
+    def test_status(self):
+        self._interaction("tag toggle", 10**6)
+
+        self.assertEqual(
+            self.recorder.status("tag toggle"),
+            "tag toggle: p50 1.0, p95 1.0, p99 1.0 ms (1 events)",
+        )
+
+    def test_dump(self):
+        self._interaction("title", 10**6)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "latency.json")
+            self.recorder.dump(path)
+            with open(path) as fh:
+                self.assertEqual(json.load(fh), self.recorder.summary())
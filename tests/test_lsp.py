@@ -0,0 +1,252 @@
+import unittest
+
+import io
+import os
+import calendar
+import time
+import tempfile
+from unittest import mock
+
+from pelican_metadata_generator import lsp
+from pelican_metadata_generator import model
+
+
+CUR_DIR = os.path.dirname(__file__)
+CONTENT_PATH = os.path.join(CUR_DIR, "posts")
+
+
+class TestValueIndex(unittest.TestCase):
+    def test_complete_ignores_case(self):
+        index = lsp.ValueIndex(["Python", "pytest", "PyQt", "Rust"])
+
+        matches, incomplete = index.complete("py")
+
+        self.assertEqual(matches, ["PyQt", "pytest", "Python"])
+        self.assertFalse(incomplete)
+
+    def test_complete_is_limited(self):
+        index = lsp.ValueIndex(["Tag {}".format(i) for i in range(10)])
+
+        matches, incomplete = index.complete("tag", limit=3)
+
+        self.assertEqual(len(matches), 3)
+        self.assertTrue(incomplete)
+
+    def test_added_values_keep_order(self):
+        index = lsp.ValueIndex(["b", "d"])
+
+        index.add("C")
+        index.update(["a{}".format(i) for i in range(20)] + ["E"])
+
+        self.assertEqual(index.complete("")[0][:3], ["a0", "a1", "a10"])
+        self.assertEqual(index.complete("c")[0], ["C"])
+        self.assertEqual(index.complete("e")[0], ["E"])
+        self.assertEqual(len(index), 24)
+
+    def test_find_similar(self):
+        index = lsp.ValueIndex(["Python"])
+
+        self.assertEqual(index.find_similar("python"), "Python")
+        self.assertIsNone(index.find_similar("pytho"))
+
+    def test_completion_time_does_not_depend_on_number_of_values(self):
+        index = lsp.ValueIndex("value {:06d}".format(i) for i in range(100000))
+
+        start = time.perf_counter()
+        for i in range(100):
+            index.complete("value {:03d}".format(i))
+        elapsed = (time.perf_counter() - start) / 100
+
+        self.assertLess(elapsed, 0.01)
+
+
+class TestLanguageServer(unittest.TestCase):
+    def setUp(self):
+        self.database = model.MetadataDatabase(CONTENT_PATH)
+        self.output = io.BytesIO()
+        self.server = lsp.LanguageServer(self.database, io.BytesIO(), self.output)
+        self.server.handle_message({"jsonrpc": "2.0", "id": 0, "method": "initialize"})
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "post.md")
+        self.uri = lsp.path_to_uri(self.path)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _messages(self):
+        stream = io.BytesIO(self.output.getvalue())
+        self.output.seek(0)
+        self.output.truncate()
+        messages = []
+        while True:
+            message = lsp.read_message(stream)
+            if message is None:
+                return messages
+            messages.append(message)
+
+    def _open(self, text):
+        params = {"textDocument": {"uri": self.uri, "text": text}}
+        self.server.handle_message({"method": "textDocument/didOpen", "params": params})
+        return self._messages()[-1]["params"]["diagnostics"]
+
+    def _complete(self, line, character):
+        params = {
+            "textDocument": {"uri": self.uri},
+            "position": {"line": line, "character": character},
+        }
+        self.server.handle_message({"id": 1, "method": "textDocument/completion", "params": params})
+        return self._messages()[-1]["result"]["items"]
+
+    def test_initialize(self):
+        response = self._messages()[0]
+
+        self.assertIn("completionProvider", response["result"]["capabilities"])
+
+    def test_request_before_initialize(self):
+        server = lsp.LanguageServer(self.database, io.BytesIO(), self.output)
+        self._messages()
+
+        server.handle_message({"id": 1, "method": "shutdown"})
+
+        self.assertEqual(self._messages()[0]["error"]["code"], lsp.SERVER_NOT_INITIALIZED)
+
+    def test_tag_completion(self):
+        self._open("Title: Post\nTags: Python, T\n\nContent\n")
+
+        items = self._complete(1, 15)
+
+        self.assertEqual([item["label"] for item in items], ["Tag", "Testing"])
+        edit_range = items[0]["textEdit"]["range"]
+        self.assertEqual(edit_range["start"], {"line": 1, "character": 14})
+        self.assertEqual(edit_range["end"], {"line": 1, "character": 15})
+
+    def test_completion_skips_used_values(self):
+        self._open("Title: Post\nTags: Tag, \n\nContent\n")
+
+        items = self._complete(1, 11)
+
+        self.assertNotIn("Tag", [item["label"] for item in items])
+        self.assertIn("Python", [item["label"] for item in items])
+
+    def test_category_completion_in_restructuredtext(self):
+        self.path = os.path.join(self.tmp_dir.name, "post.rst")
+        self.uri = lsp.path_to_uri(self.path)
+        self._open("Post\n####\n\n:category: Mar\n:tags: One\n\nContent\n")
+
+        items = self._complete(3, 14)
+
+        self.assertEqual([item["label"] for item in items], ["Markdown"])
+
+    def test_author_completion_in_yaml_list(self):
+        self._open("---\ntitle: Post\nauthors:\n  - Jo\n---\n\nContent\n")
+
+        items = self._complete(3, 6)
+
+        self.assertEqual([item["label"] for item in items], ["John Doe"])
+
+    def test_no_completion_outside_metadata(self):
+        self._open("Title: Post\n\nTags: Pyt\n")
+
+        self.assertEqual(self._complete(2, 9), [])
+
+    def test_diagnostics(self):
+        diagnostics = self._open("Title: Post\nCategory: markdown\nTags: Python, New, Python\n\n")
+
+        messages = [diagnostic["message"] for diagnostic in diagnostics]
+        self.assertEqual(
+            messages,
+            [
+                "Unknown category 'markdown', did you mean 'Markdown'?",
+                "Unknown tag 'New'",
+                "Duplicate tag 'Python'",
+            ],
+        )
+        self.assertEqual(
+            diagnostics[1]["range"],
+            {"start": {"line": 2, "character": 14}, "end": {"line": 2, "character": 17}},
+        )
+
+    def test_save_adds_new_values(self):
+        text = "Title: Post\nTags: Brand new tag\n\nContent\n"
+        with open(self.path, "w") as fh:
+            fh.write(text)
+        self._open(text)
+
+        params = {"textDocument": {"uri": self.uri}}
+        self.server.handle_message({"method": "textDocument/didSave", "params": params})
+
+        self.assertEqual(self._messages()[-1]["params"]["diagnostics"], [])
+        self.assertIn(self.path, self.database.posts)
+        self.assertEqual(self.server.indexes["tags"].complete("bra")[0], ["Brand new tag"])
+
+    def test_save_updates_indexes_of_saved_post_only(self):
+        with open(self.path, "w") as fh:
+            fh.write("Title: Post\nSlug: old-slug\nDate: 2020-01-01\n\nContent\n")
+        self.database.read_file(self.path)
+        columns = self.database.columns
+        rows = len(columns)
+        old_day = calendar.timegm((2020, 1, 1, 0, 0, 0))
+        new_day = calendar.timegm((2021, 6, 1, 0, 0, 0))
+        self.assertEqual(columns.rows_between(old_day, old_day + 86400), [rows - 1])
+        text = "Title: Post\nSlug: new-slug\nDate: 2021-06-01\n\nContent\n"
+        with open(self.path, "w") as fh:
+            fh.write(text)
+        self._open(text)
+
+        params = {"textDocument": {"uri": self.uri}}
+        with mock.patch.object(self.database, "rebuild_indexes") as rebuild_indexes:
+            with mock.patch.object(model.PostColumns, "from_records") as from_records:
+                self.server.handle_message({"method": "textDocument/didSave", "params": params})
+
+        rebuild_indexes.assert_not_called()
+        from_records.assert_not_called()
+        self.assertIs(self.database.columns, columns)
+        self.assertEqual(len(columns), rows)
+        self.assertNotIn("old-slug", self.database.slugs)
+        self.assertEqual(self.database.slugs["new-slug"], self.path)
+        self.assertEqual(columns.rows_between(old_day, old_day + 86400), [])
+        self.assertEqual(columns.rows_between(new_day, new_day + 86400), [rows - 1])
+
+    def test_failed_request_gets_error_response(self):
+        self._open("Title: Post\nTags: T\n\nContent\n")
+        params = {"textDocument": {"uri": self.uri}}
+
+        with self.assertLogs(level="ERROR"):
+            self.server.handle_message(
+                {"id": 1, "method": "textDocument/completion", "params": params}
+            )
+
+        self.assertEqual(self._messages()[-1]["error"]["code"], lsp.INTERNAL_ERROR)
+
+    def test_failed_notification_is_logged(self):
+        self._messages()
+        params = {"textDocument": {"uri": self.uri}}
+
+        with self.assertLogs(level="ERROR") as logs:
+            self.server.handle_message({"method": "textDocument/didOpen", "params": params})
+
+        self.assertIn("textDocument/didOpen", logs.output[0])
+        self.assertEqual(self._messages(), [])
+
+    def test_replaced_values_are_indexed_again(self):
+        self.database.tags = ["Replaced"]
+
+        self.server.update_indexes()
+
+        self.assertEqual(self.server.indexes["tags"].complete("")[0], ["Replaced"])
+
+    def test_serve_until_exit(self):
+        stream = io.BytesIO()
+        for message in [
+            {"jsonrpc": "2.0", "id": 0, "method": "initialize", "params": {}},
+            {"jsonrpc": "2.0", "id": 1, "method": "shutdown"},
+            {"jsonrpc": "2.0", "method": "exit"},
+        ]:
+            lsp.write_message(stream, message)
+        stream.seek(0)
+        server = lsp.LanguageServer(self.database, stream, self.output)
+
+        exit_code = server.serve()
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual([message["id"] for message in self._messages()[1:]], [0, 1])
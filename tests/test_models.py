@@ -3,8 +3,12 @@ import unittest
 import os
 import io
 import logging
+import tempfile
+
+from PyQt5 import QtCore
 
 from pelican_metadata_generator import model
+from pelican_metadata_generator import sources
 
 
 CUR_DIR = os.path.dirname(__file__)
@@ -41,6 +45,45 @@ class TestPostMetadata(unittest.TestCase):
 
         self.assertNotIn("authors", headers)
 
+    def test_file_changed_before_saving_is_read_again(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "post.md")
+            with open(path, "w") as fh:
+                fh.write("Title: Old\n\nContent\n")
+            changed = []
+            asked = []
+            self.post_metadata.fileChanged.connect(changed.append)
+            self.post_metadata.fileHasHeaders.connect(lambda: asked.append(True))
+            self.post_metadata.title = "New"
+            self.post_metadata.file_format = "markdown"
+            self.post_metadata.to_file(path)
+            with open(path, "w") as fh:
+                fh.write("Title: Old\n\nEdited elsewhere\n")
+
+            self.post_metadata.to_file_overwrite_headers()
+
+            self.assertEqual(changed, [os.path.realpath(path)])
+            self.assertEqual(len(asked), 2)
+            self.assertEqual(self.post_metadata.file.post_content, "Edited elsewhere\n")
+            self.post_metadata.to_file_overwrite_headers()
+            with open(path) as fh:
+                self.assertEqual(fh.read(), "Title: New\n\nEdited elsewhere\n")
+
+    def test_file_is_read_with_fallback_encoding(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "latin.md")
+            with open(path, "wb") as fh:
+                fh.write("Title: Zażółć\n\nContent\n".encode("iso-8859-2"))
+            asked = []
+            self.post_metadata.fileHasHeaders.connect(lambda: asked.append(True))
+            self.post_metadata.file_format = "markdown"
+            self.post_metadata.fallback_encoding = "iso-8859-2"
+
+            self.post_metadata.to_file(path)
+
+            self.assertEqual(asked, [True])
+            self.assertEqual(self.post_metadata.file.headers["title"], "Zażółć")
+
 
 class TestMetadataDatabase(unittest.TestCase):
     def setUp(self):
@@ -97,3 +140,576 @@ class TestMetadataDatabase(unittest.TestCase):
         self.db._parseFile(os.path.join(CONTENT_PATH, "authors_field.md"))
 
         self.assertEqual(self.db.authors, expected)
+
+
+class TestPostRecord(unittest.TestCase):
+    def setUp(self):
+        self.symbols = model.SymbolTable()
+
+    def test_shared_values_are_stored_once(self):
+        first = model.PostRecord.from_headers(
+            "first.md", {"category": "Blog", "tags": "One, Two"}, self.symbols
+        )
+        second = model.PostRecord.from_headers(
+            "second.md", {"category": "Blog", "tags": "Two; Three"}, self.symbols
+        )
+
+        self.assertEqual(first.category, second.category)
+        self.assertEqual(first.tags[1], second.tags[0])
+        self.assertEqual(len(self.symbols), 4)
+
+    def test_author_field_is_stored_as_authors(self):
+        record = model.PostRecord.from_headers(
+            "post.md", {"author": "Mirosław Zalewski"}, self.symbols
+        )
+
+        self.assertEqual(record.authors, (self.symbols.get("Mirosław Zalewski"),))
+        self.assertEqual(record.extra, ())
+
+    def test_headers_round_trip(self):
+        headers = {
+            "title": "Title",
+            "date": "2017-02-01 12:00",
+            "category": "Blog",
+            "tags": "One, Two",
+            "authors": "Doe, John; Roe, Jane",
+            "status": "draft",
+        }
+        record = model.PostRecord.from_headers("post.md", headers, self.symbols)
+
+        self.assertEqual(record.to_headers(self.symbols), headers)
+
+    def test_database_keeps_record_for_every_file(self):
+        db = model.MetadataDatabase()
+        path = os.path.join(CONTENT_PATH, "file_with_headers.md")
+
+        db._parseFile(path)
+
+        record = db.posts[path]
+        self.assertEqual(record.title, "File with headers")
+        self.assertEqual(db.symbols.lookup(record.category), "Markdown")
+
+
+class TestPostColumns(unittest.TestCase):
+    def setUp(self):
+        self.symbols = model.SymbolTable()
+        headers = [
+            {"date": "2017-02-01 12:00", "category": "Blog", "tags": "One, Two"},
+            {"date": "2017-02-15", "category": "News", "tags": "Two"},
+            {"date": "2017-03-01T10:00:00+02:00", "category": "Blog"},
+            {"category": "Blog", "tags": "One"},
+        ]
+        records = [
+            model.PostRecord.from_headers("{}.md".format(i), h, self.symbols)
+            for i, h in enumerate(headers)
+        ]
+        self.columns = model.PostColumns.from_records(records)
+
+    def test_dates_are_stored_as_timestamps(self):
+        self.assertEqual(self.columns.date[0], 1485950400)
+        self.assertEqual(self.columns.date[2], 1488355200)
+        self.assertEqual(self.columns.date[3], model.NO_DATE)
+
+    def test_posts_per_month(self):
+        expected = {(2017, 2): 2, (2017, 3): 1}
+
+        self.assertEqual(self.columns.posts_per_month(), expected)
+
+    def test_posts_per_month_in_category(self):
+        expected = {(2017, 2): 1, (2017, 3): 1}
+
+        counts = self.columns.posts_per_month(category=self.symbols.get("Blog"))
+
+        self.assertEqual(counts, expected)
+
+    def test_tag_usage_per_month(self):
+        expected = {(2017, 2): 2}
+
+        self.assertEqual(self.columns.tag_usage_per_month(self.symbols.get("Two")), expected)
+
+    def test_replace_updates_tags_and_date_index(self):
+        before = self.columns.rows_between(0, 2 ** 40)
+        record = model.PostRecord.from_headers(
+            "0.md", {"date": "2017-03-20", "tags": "One, Two, Three"}, self.symbols
+        )
+
+        self.columns.replace(0, record)
+
+        self.assertEqual(before, [0, 1, 2])
+        self.assertEqual(self.columns.rows_between(0, 2 ** 40), [1, 2, 0])
+        two = self.symbols.get("Two")
+        self.assertEqual(self.columns.tag_usage_per_month(two), {(2017, 2): 1, (2017, 3): 1})
+        tags = self.columns.tag_ids[self.columns.tag_offsets[1]:]
+        self.assertEqual(list(tags), [two, self.symbols.get("One")])
+
+    def test_columns_are_filled_when_directory_is_read(self):
+        db = model.MetadataDatabase(CONTENT_PATH)
+
+        self.assertEqual(len(db.columns), len(db.posts))
+
+
+class TestDateParsing(unittest.TestCase):
+    def test_formats_accepted_by_pelican(self):
+        expected = 1349864400
+        for value in [
+            "2012-10-10 10:20",
+            "2012-10-10T10:20:00",
+            "2012/10/10 10:20",
+            "2012-10-10 10:20:00.123",
+            "2012-10-10T10:20:00Z",
+            "2012-10-10 12:20+02:00",
+            "2012-10-10 12:20 +0200",
+        ]:
+            self.assertEqual(model.date_to_timestamp(value), expected, value)
+
+    def test_dates_without_time(self):
+        expected = 1349827200
+        for value in ["2012-10-10", "2012-10-10T00:00", "2012/10/10", "10 October 2012"]:
+            self.assertEqual(model.date_to_timestamp(value), expected, value)
+        self.assertEqual(model.date_to_timestamp("Oct 10, 2012"), expected)
+        self.assertEqual(model.date_to_timestamp("2012-1-5"), 1325721600)
+
+    def test_invalid_dates(self):
+        for value in ["", "tomorrow", "2012-02-30", "2012-13-01", "2012-10-10 25:00"]:
+            self.assertIsNone(model.date_to_timestamp(value), value)
+
+    def test_wall_clock_time(self):
+        expected = 1349871600
+        for value in ["2012-10-10 12:20+02:00", "2012-10-10 12:20 +0200", "2012-10-10 12:20"]:
+            self.assertEqual(model.date_to_timestamp(value, wall_clock=True), expected, value)
+
+    def test_timestamp_to_date(self):
+        self.assertEqual(model.timestamp_to_date(1349864400), "2012-10-10 10:20:00")
+
+
+class TestDateIndex(unittest.TestCase):
+    def setUp(self):
+        self.db = model.MetadataDatabase()
+        files = {
+            "a.md": "Title: A\nDate: 2020-01-02 10:00\nCategory: Blog\n\nText",
+            "b.md": "Title: B\nDate: 2020-01-02 18:30\nCategory: News\n\nText",
+            "c.md": "Title: C\nDate: 2019-12-20\nCategory: Blog\n\nText",
+            "d.md": "Title: D\nCategory: Blog\n\nText",
+        }
+        self.db.read_source(sources.MemorySource(files))
+
+    def test_posts_on_day(self):
+        paths = self.db.posts_on_day("2020-01-02 23:59")
+
+        self.assertEqual(paths, ["/memory/a.md", "/memory/b.md"])
+        self.assertEqual(self.db.posts_on_day("2020-01-03"), [])
+        self.assertEqual(self.db.posts_on_day("not a date"), [])
+
+    def test_days_are_compared_as_written(self):
+        files = {
+            "e.md": "Title: E\nDate: 2020-01-03 01:00+02:00\n\nText",
+            "f.md": "Title: F\nDate: 2020-01-02 23:00-05:00\n\nText",
+        }
+        self.db.read_source(sources.MemorySource(files, path="/zones"))
+
+        self.assertEqual(self.db.posts_on_day("2020-01-03 12:00"), ["/zones/e.md"])
+        self.assertEqual(
+            self.db.posts_on_day("2020-01-02T08:00+09:00"),
+            ["/memory/a.md", "/memory/b.md", "/zones/f.md"],
+        )
+
+    def test_previous_post(self):
+        self.assertEqual(self.db.previous_post("2020-01-03"), (5.5 * 3600, "/memory/b.md"))
+        self.assertEqual(self.db.previous_post("2020-01-03", "Blog"), (14 * 3600, "/memory/a.md"))
+        self.assertIsNone(self.db.previous_post("2019-12-20", "Blog"))
+        self.assertIsNone(self.db.previous_post("2020-01-03", "Unknown"))
+
+    def test_index_is_updated_when_file_is_read(self):
+        self.assertEqual(self.db.previous_post("2020-02-01", "News")[1], "/memory/b.md")
+        headers = {"title": "E", "date": "2020-01-20", "category": "News"}
+        record = model.PostRecord.from_headers("/memory/e.md", headers, self.db.symbols)
+        self.db.posts[record.path] = record
+        self.db.columns.append(record)
+
+        self.assertEqual(self.db.previous_post("2020-02-01", "News")[1], "/memory/e.md")
+        self.assertEqual(self.db.previous_post("2020-02-01")[1], "/memory/e.md")
+
+    def test_template_collisions(self):
+        template = model.FilenameTemplate("{year}/{month:02}/{day:02}/{slug}.{ext}")
+
+        collisions = self.db.template_collisions(template, "2020-01-02 12:00", "Blog", "b")
+
+        self.assertEqual(collisions, ["/memory/b.md"])
+        self.assertEqual(self.db.template_collisions(template, "2020-01-03", "Blog", "b"), [])
+
+    def test_template_collisions_use_dates_as_written(self):
+        files = {"e.md": "Title: E\nDate: 2020-01-03 01:00+02:00\nSlug: e\n\nText"}
+        self.db.read_source(sources.MemorySource(files, path="/zones"))
+        template = model.FilenameTemplate("{year}/{month:02}/{day:02}/{slug}.{ext}")
+
+        collisions = self.db.template_collisions(template, "2020-01-03", "", "e")
+
+        self.assertEqual(collisions, ["/zones/e.md"])
+        self.assertEqual(self.db.template_collisions(template, "2020-01-02", "", "e"), [])
+
+    def test_template_collisions_by_month(self):
+        template = model.FilenameTemplate("{category}/{year}-{month:02}.{ext}")
+
+        collisions = self.db.template_collisions(template, "2019-12-31", "Blog", "x")
+
+        self.assertEqual(collisions, ["/memory/c.md"])
+        self.assertEqual(self.db.template_collisions(template, "2019-12-31", "News", "x"), [])
+
+    def test_templates_without_date_are_not_checked(self):
+        template = model.FilenameTemplate("{slug}.{ext}")
+
+        self.assertEqual(self.db.template_collisions(template, "2020-01-02", "Blog", "a"), [])
+
+
+class TestSlugIndex(unittest.TestCase):
+    def setUp(self):
+        self.db = model.MetadataDatabase()
+
+    def test_explicit_slug_is_indexed(self):
+        path = os.path.join(CONTENT_PATH, "file_with_headers.md")
+
+        self.db._parseFile(path)
+
+        self.assertEqual(self.db.slugs["file-with-headers"], path)
+
+    def test_slug_is_derived_from_title(self):
+        path = os.path.join(CONTENT_PATH, "url_in_first_line.md")
+
+        self.db._parseFile(path)
+
+        self.assertEqual(self.db.slugs["url-below-headers"], path)
+
+    def test_free_slug(self):
+        self.db._parseFile(os.path.join(CONTENT_PATH, "file_with_headers.md"))
+        self.db.slugs["file-with-headers-2"] = "other.md"
+
+        self.assertEqual(self.db.free_slug("new-post"), "new-post")
+        self.assertEqual(self.db.free_slug("file-with-headers"), "file-with-headers-3")
+
+    def test_shadowed_slug_is_indexed_when_first_post_changes(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            first, second = [os.path.join(tmp_dir, name) for name in ["a.md", "b.md"]]
+            for path in [first, second]:
+                with open(path, "w") as fh:
+                    fh.write("Title: Post\nSlug: same\n\nContent\n")
+            self.db.read_files([first, second])
+            with open(first, "w") as fh:
+                fh.write("Title: Post\nSlug: other\n\nContent\n")
+
+            self.db.read_file(first)
+
+        self.assertEqual(self.db.slugs, {"same": second, "other": first})
+
+
+class TestFilenameTemplate(unittest.TestCase):
+    def test_format(self):
+        template = model.FilenameTemplate("{year}/{month:02d}/{category}-{slug}.{ext}")
+
+        filename = template.format("2017-02-01 12:00:00", "Blog", "title", "md")
+
+        self.assertEqual(filename, "2017/02/Blog-title.md")
+
+    def test_template_without_date_fields_ignores_date(self):
+        template = model.FilenameTemplate("{slug}.{ext}")
+
+        self.assertEqual(template.format("", "", "title", "md"), "title.md")
+
+    def test_smallest_date_field(self):
+        self.assertEqual(model.FilenameTemplate("{day}-{year}.{ext}").smallest_date_field, "day")
+        self.assertIsNone(model.FilenameTemplate("{slug}.{ext}").smallest_date_field)
+
+    def test_unknown_field_is_rejected(self):
+        with self.assertRaises(ValueError):
+            model.FilenameTemplate("{title}.{ext}")
+
+    def test_malformed_template_is_rejected(self):
+        with self.assertRaises(ValueError):
+            model.FilenameTemplate("{slug.{ext}")
+
+    def test_invalid_format_spec_is_rejected(self):
+        with self.assertRaises(ValueError):
+            model.FilenameTemplate("{slug:d}.{ext}")
+
+    def test_post_metadata_filename(self):
+        post_metadata = model.NewPostMetadata(filename_template="{year}-{slug}.{ext}")
+        post_metadata.file_format = "markdown"
+        post_metadata.date = "2017-02-01 12:00:00"
+        post_metadata.slug = "title"
+
+        self.assertEqual(post_metadata.filename, "2017-title.md")
+
+
+class TestPathIndex(unittest.TestCase):
+    def setUp(self):
+        self.db = model.MetadataDatabase(CONTENT_PATH)
+
+    def test_path_exists(self):
+        self.assertTrue(self.db.path_exists("file_with_headers.md"))
+        self.assertFalse(self.db.path_exists("file_that_doesnt_exist.md"))
+
+    def test_free_path(self):
+        self.assertEqual(self.db.free_path("file_with_headers.md"), "file_with_headers-2.md")
+        self.assertEqual(self.db.free_path("new/post.md"), "new/post.md")
+
+    def test_removed_and_renamed_files_are_forgotten_when_directory_is_read_again(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for name, slug in [("removed.md", "removed"), ("renamed.md", "renamed")]:
+                with open(os.path.join(tmp_dir, name), "w") as fh:
+                    fh.write("Title: Post\nSlug: {}\n\nContent\n".format(slug))
+            db = model.MetadataDatabase(tmp_dir)
+            os.remove(os.path.join(tmp_dir, "removed.md"))
+            new_path = os.path.join(tmp_dir, "new-name.md")
+            os.rename(os.path.join(tmp_dir, "renamed.md"), new_path)
+
+            db.read_directory(tmp_dir)
+
+        self.assertEqual(list(db.posts), [new_path])
+        self.assertEqual(db.files, {new_path})
+        self.assertEqual(db.slugs, {"renamed": new_path})
+        self.assertEqual(db.free_path("removed.md"), "removed.md")
+        self.assertEqual(len(db.columns), 1)
+
+
+class TestReadLimits(unittest.TestCase):
+    def test_truncated_file_is_recorded(self):
+        db = model.MetadataDatabase()
+        db.max_header_lines = 2
+        path = os.path.join(CONTENT_PATH, "file_with_headers.md")
+
+        db._parseFile(path)
+
+        self.assertIn(path, db.truncated)
+        self.assertEqual(db.posts[path].title, "File with headers")
+
+
+class TestScanErrors(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        with open(os.path.join(self.tmp_dir.name, "good.md"), "w", encoding="utf-8") as fh:
+            fh.write("Title: Good\nTags: Good\n\nContent\n")
+        with open(os.path.join(self.tmp_dir.name, "latin.md"), "wb") as fh:
+            fh.write("Title: Zażółć\nTags: Latin\n\nContent\n".encode("iso-8859-2"))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_file_with_invalid_encoding_is_skipped(self):
+        db = model.MetadataDatabase(self.tmp_dir.name)
+
+        self.assertEqual(db.tags, ["Good"])
+        self.assertEqual(db.skipped_summary(), {"UnicodeDecodeError": 1})
+        self.assertEqual(
+            db.skipped["UnicodeDecodeError"][0][0], os.path.join(self.tmp_dir.name, "latin.md")
+        )
+
+    def test_fallback_encoding(self):
+        db = model.MetadataDatabase()
+        db.fallback_encoding = "iso-8859-2"
+
+        db.read_directory(self.tmp_dir.name)
+
+        self.assertEqual(sorted(db.tags), ["Good", "Latin"])
+        self.assertEqual(db.skipped, {})
+
+    def test_fixed_files_are_not_reported_after_reading_again(self):
+        db = model.MetadataDatabase()
+        db.max_header_lines = 1
+        db.read_directory(self.tmp_dir.name)
+        self.assertEqual(len(db.truncated), 1)
+        self.assertEqual(db.skipped_summary(), {"UnicodeDecodeError": 1})
+        latin = os.path.join(self.tmp_dir.name, "latin.md")
+        with open(latin, "w", encoding="utf-8") as fh:
+            fh.write("Title: Zażółć\n")
+        db.max_header_lines = 1000
+
+        db.read_file(latin)
+        self.assertEqual(db.skipped, {})
+        self.assertEqual(len(db.truncated), 1)
+
+        db.read_directory(self.tmp_dir.name)
+        self.assertEqual(db.truncated, {})
+
+    def test_concurrent_scan_skips_file_with_invalid_encoding(self):
+        db = model.MetadataDatabase()
+        db.scan_concurrency = 2
+
+        db.read_directory(self.tmp_dir.name)
+
+        self.assertEqual(db.tags, ["Good"])
+        self.assertEqual(db.skipped_summary(), {"UnicodeDecodeError": 1})
+
+
+class TestKnownValuesModel(unittest.TestCase):
+    def setUp(self):
+        self.model = model.KnownValuesModel(["beta", "Delta"])
+        self.inserted = []
+        self.model.rowsInserted.connect(lambda parent, first, last: self.inserted.append(first))
+
+    def _values(self):
+        return [self.model.index(row).data() for row in range(self.model.rowCount())]
+
+    def test_values_are_sorted_ignoring_case(self):
+        self.assertEqual(self._values(), ["beta", "Delta"])
+
+    def test_value_is_inserted_at_sorted_position(self):
+        self.model.add("Charlie")
+        self.model.add("alpha")
+        self.model.add("echo")
+
+        self.assertEqual(self._values(), ["alpha", "beta", "Charlie", "Delta", "echo"])
+        self.assertEqual(self.inserted, [1, 0, 4])
+
+    def test_known_value_is_not_inserted(self):
+        self.model.add("beta")
+
+        self.assertEqual(self.inserted, [])
+        self.assertEqual(len(self.model), 2)
+
+    def test_update(self):
+        removed = []
+        self.model.rowsRemoved.connect(lambda parent, first, last: removed.append(first))
+
+        self.model.update(["Delta", "alpha"])
+
+        self.assertEqual(self._values(), ["alpha", "Delta"])
+        self.assertEqual(removed, [0])
+        self.assertEqual(self.inserted, [0])
+
+    def test_database_models(self):
+        database = model.MetadataDatabase(CONTENT_PATH)
+        models = database.value_models
+
+        self.assertEqual(models["category"].values(), sorted(database.category, key=str.lower))
+        self.assertEqual(len(models["authors"]), len(database.author_index.canonical_names()))
+
+        database.add_known_value("tags", "A new tag")
+
+        self.assertIn("A new tag", database.tags)
+        self.assertIn("A new tag", models["tags"])
+
+    def test_known_value_is_added_once(self):
+        database = model.MetadataDatabase()
+
+        database.add_known_value("tags", "Tag")
+        database.add_known_value("tags", "Tag")
+        self.assertEqual(database.tags, ["Tag"])
+
+        database.tags = ["Other"]
+        database.add_known_value("tags", "Tag")
+        database.add_known_value("tags", "Other")
+        self.assertEqual(database.tags, ["Other", "Tag"])
+
+
+class TestPostTableModel(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        for i in range(3):
+            path = os.path.join(self.tmp_dir.name, "post-{}.md".format(i))
+            with open(path, "w") as fh:
+                content = "Title: Post {i}\nCategory: Blog\nTags: One, Two\n\nBody {i}\n"
+                fh.write(content.format(i=i))
+        self.db = model.MetadataDatabase()
+        self.db.use_git = False
+        self.db.read_directory(self.tmp_dir.name)
+        self.table = model.PostTableModel(self.db)
+        self.path = os.path.join(self.tmp_dir.name, "post-1.md")
+
+    def _index(self, row, key):
+        return self.table.index(row, model.PostTableModel.COLUMNS.index(key))
+
+    def test_rows_are_fetched_in_batches(self):
+        self.assertEqual(self.table.rowCount(), 3)
+        self.table.FETCH_SIZE = 2
+        self.table.reload()
+
+        self.assertEqual(self.table.rowCount(), 2)
+        self.assertTrue(self.table.canFetchMore(QtCore.QModelIndex()))
+        self.table.fetchMore(QtCore.QModelIndex())
+        self.assertEqual(self.table.rowCount(), 3)
+        self.assertFalse(self.table.canFetchMore(QtCore.QModelIndex()))
+
+    def test_data(self):
+        self.assertEqual(self.table.data(self._index(1, "title")), "Post 1")
+        self.assertEqual(self.table.data(self._index(1, "tags")), "One, Two")
+        self.assertEqual(self.table.data(self._index(1, "series")), "")
+        self.assertEqual(self.table.path(1), self.path)
+
+    def test_edits_are_kept_until_saved(self):
+        self.table.setData(self._index(1, "title"), "Changed")
+
+        self.assertEqual(self.table.data(self._index(1, "title")), "Changed")
+        self.assertEqual(self.table.dirty, {self.path: {"title": "Changed"}})
+        self.table.setData(self._index(1, "title"), "Post 1")
+        self.assertEqual(self.table.dirty, {})
+
+    def test_save(self):
+        self.table.setData(self._index(1, "title"), "Changed")
+        self.table.setData(self._index(1, "category"), "")
+
+        errors = self.table.save()
+
+        self.assertEqual(errors, {})
+        self.assertEqual(self.table.dirty, {})
+        with open(self.path) as fh:
+            self.assertEqual(fh.read(), "Title: Changed\nTags: One, Two\n\nBody 1\n")
+        self.assertEqual(self.db.posts[self.path].title, "Changed")
+        self.assertEqual(self.table.data(self._index(1, "title")), "Changed")
+
+    def test_save_keeps_other_metadata_as_written(self):
+        content = "Title: Post 1\nSummary: First line\n    second line\nTags: One\n\nBody\n"
+        with open(self.path, "w") as fh:
+            fh.write(content)
+        self.db.read_file(self.path)
+        self.table.setData(self._index(1, "tags"), "One, Two")
+
+        self.table.save()
+
+        with open(self.path) as fh:
+            self.assertEqual(fh.read(), content.replace("Tags: One", "Tags: One, Two"))
+
+    def test_save_updates_only_saved_rows(self):
+        self.table.setData(self._index(1, "title"), "Changed")
+        resets = []
+        changed_rows = []
+        self.table.modelReset.connect(lambda: resets.append(True))
+        self.table.dataChanged.connect(
+            lambda first, last: changed_rows.append((first.row(), last.row()))
+        )
+
+        self.table.save()
+
+        self.assertEqual(resets, [])
+        self.assertEqual(changed_rows, [(1, 1)])
+        self.assertEqual(self.table.data(self._index(1, "title")), "Changed")
+
+    def test_posts_without_local_file_are_read_only(self):
+        self.db.read_source(sources.MemorySource({"post.md": "Title: In memory\n\nText"}))
+        paths = [self.table.path(row) for row in range(self.table.rowCount())]
+        index = self._index(paths.index("/memory/post.md"), "title")
+        local_index = self._index(paths.index(self.path), "title")
+
+        self.assertFalse(self.table.flags(index) & QtCore.Qt.ItemIsEditable)
+        self.assertTrue(self.table.flags(local_index) & QtCore.Qt.ItemIsEditable)
+        self.assertFalse(self.table.setData(index, "Changed"))
+        self.assertEqual(self.table.dirty, {})
+
+    def test_removed_file_is_not_created_again(self):
+        self.table.setData(self._index(1, "title"), "Resurrected")
+        os.remove(self.path)
+
+        errors = self.table.save()
+
+        self.assertIn(self.path, errors)
+        self.assertIn(self.path, self.table.dirty)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_files_that_can_not_be_saved_stay_dirty(self):
+        self.table.setData(self._index(1, "title"), "Changed")
+        os.remove(self.path)
+        os.mkdir(self.path)
+
+        errors = self.table.save()
+
+        self.assertIn(self.path, errors)
+        self.assertIn(self.path, self.table.dirty)
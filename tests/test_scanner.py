@@ -0,0 +1,126 @@
+import unittest
+
+import os
+import time
+import asyncio
+import tempfile
+import threading
+
+from pelican_metadata_generator import model
+from pelican_metadata_generator import scanner
+
+
+CUR_DIR = os.path.dirname(__file__)
+CONTENT_PATH = os.path.join(CUR_DIR, "posts")
+
+LATENCY = 0.05
+
+
+class InFlightCounter:
+    """Wraps filesystem functions, counting calls that are in progress at the same time"""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def slow(self, function):
+        def slow_function(path):
+            with self._lock:
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            try:
+                time.sleep(LATENCY)
+                return function(path)
+            finally:
+                with self._lock:
+                    self.in_flight -= 1
+
+        return slow_function
+
+
+class TestScanner(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        for i in range(20):
+            dirpath = os.path.join(self.tmp_dir.name, "dir{}".format(i % 4))
+            os.makedirs(dirpath, exist_ok=True)
+            with open(os.path.join(dirpath, "post{}.md".format(i)), "w") as fh:
+                fh.write("Title: Post {}\nTags: Tag{}\n\nContent\n".format(i, i))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_reads_all_files(self):
+        results = {}
+
+        asyncio.run(
+            scanner.scan_directory(
+                self.tmp_dir.name, lambda path, post: results.update({path: post})
+            )
+        )
+
+        self.assertEqual(len(results), 20)
+        self.assertTrue(all(post.headers["title"] for post in results.values()))
+
+    def test_unsupported_file_is_reported_as_none(self):
+        open(os.path.join(self.tmp_dir.name, "image.png"), "w").close()
+        results = {}
+
+        asyncio.run(
+            scanner.scan_directory(
+                self.tmp_dir.name, lambda path, post: results.update({path: post})
+            )
+        )
+
+        self.assertIsNone(results[os.path.join(self.tmp_dir.name, "image.png")])
+
+    def test_reads_overlap_on_slow_filesystem(self):
+        results = []
+        counter = InFlightCounter()
+
+        asyncio.run(
+            scanner.scan_directory(
+                self.tmp_dir.name,
+                lambda path, post: results.append(path),
+                concurrency=10,
+                read_file=counter.slow(scanner.read_file),
+                list_directory=counter.slow(scanner.list_directory),
+            )
+        )
+
+        self.assertGreater(counter.max_in_flight, 1)
+        self.assertLessEqual(counter.max_in_flight, 10)
+        self.assertEqual(len(results), 20)
+
+    def test_symlinks_to_directories_are_not_followed(self):
+        os.symlink(self.tmp_dir.name, os.path.join(self.tmp_dir.name, "dir0", "loop"))
+        results = []
+
+        asyncio.run(
+            scanner.scan_directory(self.tmp_dir.name, lambda path, post: results.append(path))
+        )
+
+        self.assertEqual(len(results), 20)
+
+    def test_error_in_reader_is_raised(self):
+        def failing_read_file(path):
+            raise OSError("Network is unreachable")
+
+        with self.assertRaises(OSError):
+            asyncio.run(
+                scanner.scan_directory(
+                    self.tmp_dir.name, lambda path, post: None, read_file=failing_read_file
+                )
+            )
+
+    def test_database_with_concurrent_scan(self):
+        serial_db = model.MetadataDatabase(CONTENT_PATH)
+        concurrent_db = model.MetadataDatabase()
+        concurrent_db.scan_concurrency = 4
+
+        concurrent_db.read_directory(CONTENT_PATH)
+
+        self.assertEqual(set(concurrent_db.posts), set(serial_db.posts))
+        self.assertEqual(concurrent_db.files, serial_db.files)
+        self.assertEqual(sorted(concurrent_db.tags), sorted(serial_db.tags))
@@ -0,0 +1,71 @@
+import unittest
+
+import os
+import sys
+import tempfile
+
+from pelican_metadata_generator import slugs
+
+
+class TestSlugEngine(unittest.TestCase):
+    def setUp(self):
+        self.engine = slugs.SlugEngine()
+
+    def test_default_rules_match_pelican(self):
+        cases = {
+            "Hello World": "hello-world",
+            "  Leading and trailing  ": "leading-and-trailing",
+            "Don't panic!": "dont-panic",
+            "C++ & Python -- tips": "c-python-tips",
+            "Zażółć gęślą jaźń": "zazolc-gesla-jazn",
+            "Ｆｕｌｌｗｉｄｔｈ": "fullwidth",
+            "snake_case stays": "snake_case-stays",
+        }
+        for title, expected in cases.items():
+            self.assertEqual(self.engine.slugify(title), expected, title)
+
+    def test_tags_and_entities_are_stripped(self):
+        self.assertEqual(self.engine.slugify("<em>Bold</em> &amp; <!-- x -->brave"), "bold-brave")
+
+    def test_preserve_case(self):
+        engine = slugs.SlugEngine(preserve_case=True)
+
+        self.assertEqual(engine.slugify("Hello World"), "Hello-World")
+
+    def test_use_unicode(self):
+        engine = slugs.SlugEngine(use_unicode=True)
+
+        self.assertEqual(engine.slugify("Zażółć gęślą"), "zażółć-gęślą")
+
+    def test_results_are_cached(self):
+        self.engine.slugify("Hello World")
+        self.engine.slugify("Hello World")
+
+        self.assertEqual(self.engine.slugify.cache_info().hits, 1)
+
+    def test_settings_are_read_from_pelicanconf(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "pelicanconf.py")
+            with open(path, "w") as fh:
+                fh.write("SITENAME = 'Test'\n")
+                fh.write("SLUG_REGEX_SUBSTITUTIONS = [(r'c\\+\\+', 'cpp'), (r'[^\\w\\s-]', ''),\n")
+                fh.write("    (r'(?u)\\A\\s*', ''), (r'(?u)\\s*\\Z', ''), (r'[-\\s]+', '-')]\n")
+
+            engine = slugs.SlugEngine.from_pelicanconf(path)
+
+        self.assertEqual(engine.slugify("Learning C++"), "learning-cpp")
+        self.assertFalse(engine.preserve_case)
+
+    def test_pelicanconf_can_import_modules_next_to_it(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with open(os.path.join(tmp_dir, "slugconf_for_test.py"), "w") as fh:
+                fh.write("PRESERVE_CASE = True\n")
+            path = os.path.join(tmp_dir, "pelicanconf.py")
+            with open(path, "w") as fh:
+                fh.write("from slugconf_for_test import PRESERVE_CASE\n")
+                fh.write("SLUGIFY_PRESERVE_CASE = PRESERVE_CASE\n")
+
+            engine = slugs.SlugEngine.from_pelicanconf(path)
+
+        self.assertTrue(engine.preserve_case)
+        self.assertNotIn(tmp_dir, sys.path)
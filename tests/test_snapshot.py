@@ -0,0 +1,82 @@
+import unittest
+
+import os
+import sqlite3
+import tempfile
+
+from pelican_metadata_generator import model
+from pelican_metadata_generator import snapshot
+
+
+CUR_DIR = os.path.dirname(__file__)
+CONTENT_PATH = os.path.join(CUR_DIR, "posts")
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.snapshot_path = os.path.join(self.tmp_dir.name, "metadata.db")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_snapshot_round_trip(self):
+        db = model.MetadataDatabase(CONTENT_PATH)
+        snapshot.write_snapshot(db, self.snapshot_path)
+
+        restored = model.MetadataDatabase()
+        header = snapshot.read_snapshot(restored, self.snapshot_path)
+
+        self.assertEqual(header["content_root"], db.path)
+        self.assertEqual(restored.path, db.path)
+        self.assertEqual(restored.tags, db.tags)
+        self.assertEqual(restored.category, db.category)
+        self.assertEqual(restored.authors, db.authors)
+        self.assertEqual(list(restored.posts), list(db.posts))
+        for path, record in db.posts.items():
+            self.assertEqual(
+                restored.posts[path].to_headers(restored.symbols),
+                record.to_headers(db.symbols),
+            )
+        self.assertEqual(len(restored.columns), len(db.columns))
+        self.assertEqual(restored.files, db.files)
+        self.assertTrue(restored.path_exists("file_with_headers.md"))
+
+    def test_snapshot_with_other_schema_version_is_rejected(self):
+        db = model.MetadataDatabase(CONTENT_PATH)
+        snapshot.write_snapshot(db, self.snapshot_path)
+        connection = sqlite3.connect(self.snapshot_path)
+        with connection:
+            connection.execute("UPDATE header SET value = '0' WHERE key = 'schema_version'")
+        connection.close()
+
+        with self.assertRaises(snapshot.SnapshotError):
+            snapshot.read_snapshot(model.MetadataDatabase(), self.snapshot_path)
+
+    def test_file_that_is_not_snapshot_is_rejected(self):
+        with open(self.snapshot_path, "w") as fh:
+            fh.write("Not a database")
+
+        with self.assertRaises(snapshot.SnapshotError):
+            snapshot.read_snapshot(model.MetadataDatabase(), self.snapshot_path)
+
+    def test_all_content_roots_are_recorded(self):
+        db = model.MetadataDatabase(CONTENT_PATH)
+        db.read_directory(CUR_DIR)
+        snapshot.write_snapshot(db, self.snapshot_path)
+
+        restored = model.MetadataDatabase()
+        header = snapshot.read_snapshot(restored, self.snapshot_path)
+
+        self.assertEqual(header["content_roots"], [CONTENT_PATH, CUR_DIR])
+        self.assertEqual(restored.directories, [CONTENT_PATH, CUR_DIR])
+
+    def test_path_with_uri_special_characters(self):
+        path = os.path.join(self.tmp_dir.name, "what?#100%.db")
+        db = model.MetadataDatabase(CONTENT_PATH)
+        snapshot.write_snapshot(db, path)
+
+        restored = model.MetadataDatabase()
+        snapshot.read_snapshot(restored, path)
+
+        self.assertEqual(list(restored.posts), list(db.posts))
@@ -0,0 +1,162 @@
+import unittest
+
+import io
+import os
+import tarfile
+import zipfile
+import tempfile
+from unittest import mock
+
+from pelican_metadata_generator import model
+from pelican_metadata_generator import sources
+
+
+CUR_DIR = os.path.dirname(__file__)
+CONTENT_PATH = os.path.join(CUR_DIR, "posts")
+
+
+class TestMemorySource(unittest.TestCase):
+    def setUp(self):
+        self.source = sources.MemorySource(
+            {
+                "first.md": "Title: First\nCategory: Blog\nTags: One, Two\n\nContent\n",
+                "nested/second.rst": "Second\n######\n\n:tags: Two; Three\n\nContent\n",
+                "front_matter.md": "---\ntitle: Third\ntags: [Four]\n---\n\nContent\n",
+                "latin2.md": "Title: Zażółć\n\nContent\n".encode("iso-8859-2"),
+                "image.png": b"\x89PNG",
+            }
+        )
+        self.database = model.MetadataDatabase()
+        self.database.fallback_encoding = "iso-8859-2"
+
+    def test_all_formats_are_read(self):
+        self.database.read_source(self.source)
+
+        self.assertEqual(self.database.tags, ["One", "Two", "Four", "Three"])
+        self.assertEqual(self.database.category, ["Blog"])
+        self.assertEqual(len(self.database.posts), 4)
+        self.assertEqual(len(self.database.files), 5)
+        self.assertEqual(self.database.path, "/memory")
+
+    def test_fallback_encoding(self):
+        self.database.read_source(self.source)
+
+        self.assertEqual(self.database.posts["/memory/latin2.md"].title, "Zażółć")
+
+    def test_file_handler_reads_from_source(self):
+        post = model.pelican_metadata_generator.file_handler.Factory(
+            "/memory/front_matter.md", source=self.source
+        ).generate()
+
+        self.assertEqual(post.headers, {"title": "Third", "tags": "Four"})
+        self.assertEqual(post.post_content, "Content\n")
+
+
+class TestArchiveSource(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.expected = model.MetadataDatabase(CONTENT_PATH)
+        self.names = sorted(os.listdir(CONTENT_PATH))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _assertSameMetadata(self, database, archive_path):
+        self.assertEqual(database.path, archive_path)
+        self.assertEqual(sorted(database.tags), sorted(self.expected.tags))
+        self.assertEqual(sorted(database.category), sorted(self.expected.category))
+        self.assertEqual(
+            sorted(os.path.basename(path) for path in database.posts),
+            sorted(os.path.basename(path) for path in self.expected.posts),
+        )
+
+    def test_zip(self):
+        archive_path = os.path.join(self.tmp_dir.name, "content.zip")
+        with zipfile.ZipFile(archive_path, "w") as archive:
+            for name in self.names:
+                archive.write(os.path.join(CONTENT_PATH, name), "content/{}".format(name))
+
+        database = model.MetadataDatabase(archive_path)
+
+        self._assertSameMetadata(database, archive_path)
+        self.assertIn(os.path.join(archive_path, "content", self.names[0]), database.files)
+
+    def test_tar(self):
+        archive_path = os.path.join(self.tmp_dir.name, "content.tar.gz")
+        with tarfile.open(archive_path, "w:gz") as archive:
+            for name in self.names:
+                archive.add(os.path.join(CONTENT_PATH, name), "./content/{}".format(name))
+
+        database = model.MetadataDatabase(archive_path)
+
+        self._assertSameMetadata(database, archive_path)
+        self.assertIn(os.path.join(archive_path, "content", self.names[0]), database.files)
+
+    def test_tar_members_are_read_once(self):
+        archive_path = os.path.join(self.tmp_dir.name, "content.tar.gz")
+        with tarfile.open(archive_path, "w:gz") as archive:
+            for name in self.names:
+                archive.add(os.path.join(CONTENT_PATH, name), name)
+
+        source = sources.TarSource(archive_path)
+        self.addCleanup(source.close)
+        extractfile = mock.patch.object(
+            source._archive, "extractfile", wraps=source._archive.extractfile
+        )
+        with extractfile as extract:
+            contents = {}
+            for path in source.walk():
+                with source.open(path) as fh:
+                    contents[os.path.basename(path)] = fh.read()
+
+        self.assertEqual(extract.call_count, len(self.names))
+        with open(os.path.join(CONTENT_PATH, self.names[0]), "rb") as fh:
+            self.assertEqual(contents[self.names[0]], fh.read())
+
+    def test_unsupported_members_are_not_read(self):
+        archive_path = os.path.join(self.tmp_dir.name, "content.tar.gz")
+        with tarfile.open(archive_path, "w:gz") as archive:
+            for name, content in [("image.png", b"\x89PNG" * 10000), ("post.md", b"Title: A\n")]:
+                info = tarfile.TarInfo(name)
+                info.size = len(content)
+                archive.addfile(info, io.BytesIO(content))
+
+        source = sources.TarSource(archive_path)
+        self.addCleanup(source.close)
+        database = model.MetadataDatabase()
+        with mock.patch.object(
+            source._archive, "extractfile", wraps=source._archive.extractfile
+        ) as extract:
+            database.read_source(source)
+
+        self.assertEqual([call.args[0].name for call in extract.call_args_list], ["post.md"])
+        self.assertIn(os.path.join(archive_path, "image.png"), database.files)
+        self.assertEqual(database.posts[os.path.join(archive_path, "post.md")].title, "A")
+
+    def test_members_outside_archive_are_skipped(self):
+        content = b"Title: Post\n\nContent\n"
+        zip_path = os.path.join(self.tmp_dir.name, "content.zip")
+        with zipfile.ZipFile(zip_path, "w") as archive:
+            for name in ["post.md", "../outside.md", "/absolute.md"]:
+                archive.writestr(zipfile.ZipInfo(name), content)
+        tar_path = os.path.join(self.tmp_dir.name, "content.tar")
+        with tarfile.open(tar_path, "w") as archive:
+            for name in ["post.md", "content/../../outside.md", "/absolute.md"]:
+                info = tarfile.TarInfo(name)
+                info.size = len(content)
+                archive.addfile(info, io.BytesIO(content))
+
+        for archive_path in [zip_path, tar_path]:
+            with self.subTest(archive=os.path.basename(archive_path)):
+                database = model.MetadataDatabase(archive_path)
+
+                self.assertEqual(list(database.posts), [os.path.join(archive_path, "post.md")])
+                self.assertEqual(len(database.skipped["OSError"]), 2)
+
+    def test_other_files_are_ignored(self):
+        path = os.path.join(self.tmp_dir.name, "notes.txt")
+        with open(path, "w") as fh:
+            fh.write("Not an archive\n")
+
+        self.assertIsNone(sources.open_source(path))
+        self.assertEqual(model.MetadataDatabase(path).posts, {})
@@ -0,0 +1,81 @@
+import unittest
+
+import io
+import os
+import sys
+import subprocess
+
+from pelican_metadata_generator import stdio_filter
+
+
+CUR_DIR = os.path.dirname(__file__)
+SRC_PATH = os.path.join(CUR_DIR, os.pardir, "src")
+
+
+class TestFilter(unittest.TestCase):
+    def _apply(self, content, file_format="markdown", values=None, tags=None):
+        output = io.StringIO()
+        stdio_filter.apply_headers(
+            file_format, values or {}, tags or [], io.StringIO(content), output
+        )
+        return output.getvalue()
+
+    def test_metadata_is_merged_into_existing_metadata(self):
+        content = "Title: Old\nTags: One\nStatus: draft\n\nFirst paragraph\n\nSecond paragraph\n"
+        expected = (
+            "Title: New\n"
+            "Category: Blog\n"
+            "Tags: One, Two\n"
+            "Status: draft\n"
+            "\n"
+            "First paragraph\n"
+            "\n"
+            "Second paragraph\n"
+        )
+
+        output = self._apply(content, values={"title": "New", "category": "Blog"}, tags=["Two"])
+
+        self.assertEqual(output, expected)
+
+    def test_metadata_is_prepended_to_post_without_metadata(self):
+        content = "Post without metadata\n\nSecond paragraph\n"
+        expected = (
+            "Title: New\n"
+            "Tags: One\n"
+            "\n"
+            "Post without metadata\n"
+            "\n"
+            "Second paragraph\n"
+        )
+
+        output = self._apply(content, values={"title": "New"}, tags=["One"])
+
+        self.assertEqual(output, expected)
+
+    def test_empty_value_removes_key(self):
+        content = "Title: Title\nModified: 2017-02-01 12:00\n\nContent\n"
+
+        output = self._apply(content, values={"modified": ""})
+
+        self.assertEqual(output, "Title: Title\n\nContent\n")
+
+    def test_tag_with_comma(self):
+        content = ":tags: One, Two\n\nContent\n"
+
+        output = self._apply(content, file_format="restructuredtext", tags=["Three, Four"])
+
+        self.assertEqual(output, ":tags: One; Two; Three, Four\n\nContent\n")
+
+    def test_filter_mode_does_not_load_qt(self):
+        code = (
+            "import sys\n"
+            "import pelican_metadata_generator.cli\n"
+            "print(any(name.startswith('PyQt5') for name in sys.modules))\n"
+        )
+        env = dict(os.environ, PYTHONPATH=os.path.abspath(SRC_PATH))
+
+        result = subprocess.run(
+            [sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True
+        )
+
+        self.assertEqual(result.stdout.strip(), "False")
@@ -0,0 +1,122 @@
+import unittest
+
+import os
+import time
+import random
+import string
+
+from pelican_metadata_generator import model
+from pelican_metadata_generator import tag_clusters
+
+
+CUR_DIR = os.path.dirname(__file__)
+CONTENT_PATH = os.path.join(CUR_DIR, "posts")
+
+
+class TestTagKey(unittest.TestCase):
+    def test_normalization(self):
+        for tag, expected in [
+            ("Python", "python"),
+            ("python3", "python"),
+            ("Unit Tests", "unittest"),
+            ("unit-testing", "unittest"),
+            ("Libraries", "library"),
+            ("classes", "class"),
+            ("status", "status"),
+            ("Zażółć", "zazołc"),
+            ("2020", "2020"),
+        ]:
+            with self.subTest(tag=tag):
+                self.assertEqual(tag_clusters.tag_key(tag), expected)
+
+
+class TestClusterTags(unittest.TestCase):
+    def _clusters(self, tags):
+        return sorted(sorted(cluster) for cluster in tag_clusters.cluster_tags(tags))
+
+    def test_same_normalized_form(self):
+        clusters = self._clusters(["python", "Python", "python3", "Rust", "library", "libs"])
+
+        self.assertEqual(clusters, [["Python", "python", "python3"]])
+
+    def test_short_aliases(self):
+        clusters = self._clusters(
+            ["python", "py", "Machine Learning", "ML", "Markup", "CI", "pyramid", "pytest"]
+        )
+
+        self.assertEqual(clusters, [["ML", "Machine Learning"], ["py", "python"]])
+
+    def test_ambiguous_initials_are_not_grouped(self):
+        clusters = self._clusters(["ml", "machine learning", "markup language"])
+
+        self.assertEqual(clusters, [])
+
+    def test_more_specific_tags_are_not_grouped(self):
+        clusters = self._clusters(["python", "python tips", "python web", "python3 tips"])
+
+        self.assertEqual(clusters, [["python tips", "python3 tips"]])
+
+    def test_similar_pairs_are_not_chained(self):
+        # every tag is similar to its neighbours, but not to all others
+        clusters = self._clusters(["abcdefghijkl", "abcdefghijxy", "abcdefghuvxy", "abcdefstuvxy"])
+
+        self.assertEqual(
+            clusters, [["abcdefghijkl", "abcdefghijxy"], ["abcdefghuvxy", "abcdefstuvxy"]]
+        )
+
+    def test_similar_spelling(self):
+        clusters = self._clusters(["javascript", "javscript", "kubernetes", "kubernets", "django"])
+
+        self.assertEqual(clusters, [["javascript", "javscript"], ["kubernetes", "kubernets"]])
+
+    def test_different_tags_are_not_grouped(self):
+        self.assertEqual(self._clusters(["python", "pyramid", "java", "javascript"]), [])
+
+    def test_large_taxonomy(self):
+        rng = random.Random(0)
+        tags = {
+            "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 12)))
+            for _ in range(20000)
+        }
+        tags.update(["machine learning", "Machine-Learning", "kubernetes", "kubernets"])
+
+        start = time.perf_counter()
+        clusters = tag_clusters.cluster_tags(tags)
+        elapsed = time.perf_counter() - start
+
+        clusters = [sorted(c) for c in clusters]
+        self.assertIn(["Machine-Learning", "machine learning"], clusters)
+        self.assertIn(["kubernetes", "kubernets"], clusters)
+        self.assertTrue(all(len(cluster) <= 3 for cluster in clusters))
+        self.assertLess(elapsed, 10)
+
+
+class TestReport(unittest.TestCase):
+    def test_report(self):
+        usage = {
+            "Python": ["a.md", "b.md", "c.md", "d.md"],
+            "python": ["e.md"],
+            "Rust": ["f.md"],
+        }
+
+        report = tag_clusters.report(usage, examples=3)
+
+        self.assertEqual(
+            report,
+            "Python, python\n"
+            "    Python: 4 post(s)\n"
+            "        a.md\n"
+            "        b.md\n"
+            "        c.md\n"
+            "        ...\n"
+            "    python: 1 post(s)\n"
+            "        e.md",
+        )
+
+    def test_tag_usage(self):
+        database = model.MetadataDatabase(CONTENT_PATH)
+
+        usage = tag_clusters.tag_usage(database)
+
+        self.assertEqual(set(usage), set(database.tags))
+        self.assertTrue(all(usage[tag] for tag in usage))
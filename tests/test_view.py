@@ -0,0 +1,49 @@
+import unittest
+
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5 import QtWidgets  # noqa: E402
+
+from pelican_metadata_generator import model, view  # noqa: E402
+
+
+class TestSetupTab(unittest.TestCase):
+    def setUp(self):
+        self.app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+        self.database = model.MetadataDatabase()
+        for tag in ["Python", "Qt", "Pelican"]:
+            self.database.add_known_value("tags", tag)
+        self.database.add_known_value("category", "Blog")
+        self.tab = view.SetupTab()
+        self.tab.setKnownValuesModels(self.database.value_models)
+
+    def test_tag_completer_completes_last_tag(self):
+        completer = self.tab.tagField.completer()
+        self.tab.tagField.setText("Python, p")
+
+        self.assertEqual(completer.splitPath("Python, p"), ["p"])
+        completer.setCompletionPrefix("p")
+        self.assertEqual(completer.currentCompletion(), "Python, Pelican")
+
+    def test_tag_completer_with_semicolons(self):
+        completer = self.tab.tagField.completer()
+        self.tab.tagField.setText("Python, 3; q")
+
+        self.assertEqual(completer.splitPath("Python, 3; q"), ["q"])
+        completer.setCompletionPrefix("q")
+        self.assertEqual(completer.currentCompletion(), "Python, 3; Qt")
+
+    def test_clearing_field_clears_picked_value(self):
+        self.tab.categoryList.setCurrentIndex(0)
+        self.tab.categoryField.setText("Blog")
+
+        self.tab.categoryField.clear()
+
+        self.assertEqual(self.tab.categoryList.currentIndex(), -1)
+        self.assertTrue(self.tab.categoryField.isClearButtonEnabled())
+
+
+if __name__ == "__main__":
+    unittest.main()